@@ -17,6 +17,9 @@ from .classes.user import User
 from .classes.resume import ResumeHandle
 from .classes.optimize import ResumeOptimizer
 
+import hmac
+import os
+from functools import wraps
 from io import BytesIO
 
 # Import your resume-related modules
@@ -25,6 +28,11 @@ from backend.src.resume_objects.latex_templates import LTemplate
 from backend.src.resume_objects.implementations.scoring_functions import (
     simple_sum_function,
 )
+from backend.src.embed_helper import encoder
+from backend.src.embed_helper import thread_governor
+from backend.src.embed_helper import global_vecs
+from backend.src.db_helper.dbconn import DBConn
+from backend.src.general_helper import llm_cache
 
 
 app = Flask(__name__)
@@ -54,6 +62,70 @@ api.add_resource(ResumeOptimizer, "/resume/optimize")
 # api.add_resource(UserInfo, "/user/info")
 # api.add_resource(Activity, "/activity")
 
+# Load the scoring model once per worker at boot, instead of on every generate call
+# (only pings the sidecar when EMBED_SIDECAR_SOCKET is set)
+# Set OPT_MODEL_WARMUP=0 to skip (e.g. for quick local runs)
+# Thread counts are set first (no-op if gunicorn's post_fork already did it)
+thread_governor.apply()
+if os.environ.get("OPT_MODEL_WARMUP", "1") != "0":
+    encoder.warm_up()
+
+
+def internal_only(view):
+    """
+    /internal/* routes answer only with X-Internal-Token = INTERNAL_STATS_TOKEN,
+    and do not exist (404) while INTERNAL_STATS_TOKEN is unset
+    """
+
+    @wraps(view)
+    def guarded(*args, **kwargs):
+        expected = os.environ.get("INTERNAL_STATS_TOKEN")
+        if not expected:
+            return jsonify({"error": "Not found"}), 404
+        given = request.headers.get("X-Internal-Token", "")
+        if not hmac.compare_digest(given.encode("utf-8"), expected.encode("utf-8")):
+            return jsonify({"error": "Unauthorized"}), 401
+        return view(*args, **kwargs)
+
+    return guarded
+
+
+@app.route("/internal/encode-stats", methods=["GET"])
+@internal_only
+def get_encode_stats():
+    """
+    Encoder metrics of this worker: queue depth, batch size histograms, thread
+    settings, sidecar fallbacks
+    """
+    return jsonify(encoder.encode_stats()), 200
+
+
+@app.route("/internal/global-vec-stats", methods=["GET"])
+@internal_only
+def get_global_vec_stats():
+    """
+    Global vector store: this worker's hit rate, store size and dedup ratio
+    (store numbers are reused for global_vecs.STORE_STATS_TTL_S)
+    """
+    database = DBConn()
+    try:
+        stats = {
+            "worker": global_vecs.worker_stats(),
+            "store": global_vecs.store_stats(database),
+        }
+    finally:
+        database.close()
+    return jsonify(stats), 200
+
+
+@app.route("/internal/llm-cache-stats", methods=["GET"])
+@internal_only
+def get_llm_cache_stats():
+    """
+    AIBot response cache of this worker: hits per tier, misses, bypasses
+    """
+    return jsonify(llm_cache.stats()), 200
+
 
 @app.route("/api/generate-resume", methods=["POST"])
 def generate_resume():
@@ -82,8 +154,6 @@ def generate_resume():
 
 
 if __name__ == "__main__":
-    import os
-
     port = int(os.environ.get("PORT", 5001))
     debug = os.environ.get("FLASK_ENV") == "development"
     app.run(debug=debug, host="0.0.0.0", port=port)
@@ -9,13 +9,14 @@ dbconn rule:
 """
 
 from io import BytesIO
-from flask import send_file
+from flask import send_file, request
 
 # pylint: disable=import-error
 from flask_restful import Resource
 from backend.src.db_helper.dbconn import DBConn
 from backend.src.classes_req import resume_req
 from backend.src.class_helper import resume_handle
+from backend.src.general_helper.async_bot import disconnect_probe
 
 
 class ResumeOptimizer(Resource):
@@ -33,14 +34,27 @@ class ResumeOptimizer(Resource):
         print("DEBUG: Resume Get reached here")
         database = DBConn()
         resume_handle_obj = resume_handle.ResumeHandle(database, args)
+        # Stop waiting on the AI once the client is gone (AI_CLIENT=async)
+        resume_handle_obj.should_cancel = disconnect_probe(request.environ)
         success, resume_pdf_bytes = resume_handle_obj.get_resume(args)
         database.close()
         if not success:
             print("DEBUG: Failed to generate resume using resume_handle")
             return {"status": False, "message": "Failed to generate resume"}, 400
-        return send_file(
+        response = send_file(
             BytesIO(resume_pdf_bytes),
             mimetype="application/pdf",
             as_attachment=True,
             download_name="resume.pdf",
         )
+        if resume_handle_obj.cache_stats is not None:
+            # Line vector cache effectiveness for this request
+            response.headers["X-Vec-Cache-Hits"] = str(resume_handle_obj.cache_stats.hits)
+            response.headers["X-Vec-Cache-Misses"] = str(
+                resume_handle_obj.cache_stats.misses + resume_handle_obj.cache_stats.stale
+            )
+        if resume_handle_obj.req_timing:
+            # Requirement extraction path (ai / ai-cached / bank) and its latency
+            response.headers["X-Req-Mode"] = resume_handle_obj.req_timing["mode"]
+            response.headers["X-Req-Ms"] = f"{resume_handle_obj.req_timing['ms']:.1f}"
+        return response
@@ -38,12 +38,19 @@ class ResumeHandle(Resource):
         if not success:
             print("DEBUG: Failed to generate resume using resume_handle")
             return {"status": False, "message": "Failed to generate resume"}, 400
-        return send_file(
+        response = send_file(
             BytesIO(resume_pdf_bytes),
             mimetype="application/pdf",
             as_attachment=True,
             download_name="resume.pdf",
         )
+        if resume_handle_obj.cache_stats is not None:
+            # Line vector cache effectiveness for this request
+            response.headers["X-Vec-Cache-Hits"] = str(resume_handle_obj.cache_stats.hits)
+            response.headers["X-Vec-Cache-Misses"] = str(
+                resume_handle_obj.cache_stats.misses + resume_handle_obj.cache_stats.stale
+            )
+        return response
 
     def post(self) -> tuple[dict, int]:
         """
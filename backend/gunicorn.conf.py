@@ -0,0 +1,72 @@
+"""
+gunicorn settings for the API
+
+Usage (from repo root):
+gunicorn -c backend/gunicorn.conf.py backend.api.api_1:app
+
+Every worker gets its share of the cores for encoding (see
+backend/src/embed_helper/thread_governor.py), applied right after fork.
+
+EMBED_PRELOAD=1 imports the app, and so loads + warms the model, once in the
+master. The model is then frozen (model_registry.freeze_for_fork) before the
+workers fork, and every worker shares the weight pages copy-on-write instead
+of loading its own copy. Measure with backend/src/segment_tests/uss_bench.py.
+The master loads and warms the model with a single torch/BLAS thread: a
+parallel op before fork can leave the forked workers hung on the parent's
+thread pool. Workers apply their own limit in post_fork.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+preload_app = os.environ.get("EMBED_PRELOAD", "0") == "1"
+
+if preload_app:
+    # This file is read before gunicorn preloads the app (no hook runs that
+    # early), so pin the master here, the app's own apply() then keeps it
+    from backend.src.embed_helper import thread_governor
+
+    thread_governor.apply(threads=1)
+
+
+def when_ready(server):  # pylint: disable=unused-argument
+    """
+    Master is set up (app preloaded if enabled), workers fork next
+    """
+    if not preload_app:
+        return
+    # pylint: disable=import-outside-toplevel
+    from backend.src.embed_helper.model_registry import model_registry
+
+    model_registry.freeze_for_fork()
+
+
+def pre_fork(server, worker):
+    """
+    Give the new worker the smallest index no live worker holds, so a
+    respawned worker (timeout, max_requests, crash) takes over the cores of
+    the one it replaces instead of doubling up on a live worker's
+    Runs in the master, the index stays on the worker object in server.WORKERS
+    """
+    taken = {getattr(live, "embed_index", None) for live in server.WORKERS.values()}
+    index = 0
+    while index in taken:
+        index += 1
+    worker.embed_index = index
+
+
+def post_fork(server, worker):
+    """
+    Apply the thread governor with this worker's index (see pre_fork)
+    force: with preloading the master already applied 1 thread for itself
+    """
+    # pylint: disable=import-outside-toplevel
+    from backend.src.embed_helper import thread_governor
+
+    thread_governor.apply(
+        workers=server.cfg.workers,
+        worker_index=worker.embed_index,
+        force=True,
+    )
@@ -15,6 +15,14 @@ from .user_auth import UserAuth
 from ..db_helper import dbconn
 from ..resume_objects.latex_templates import LTemplate
 from ..resume_objects.resume import Resume
+from ..embed_helper import vec_store
+from ..embed_helper import vec_fill
+from ..embed_helper import vec_cache
+from ..embed_helper.req_cache import ReqCache
+from ..embed_helper.global_vecs import GlobalVecStore
+from ..embed_helper import encoder
+from ..general_helper.vec_rip import vec_rip
+from ..general_helper import async_bot
 
 
 class ResumeHandle:
@@ -31,23 +39,9 @@ class ResumeHandle:
         """
         self.database = database
         self.args = args
-
-    def __convert_ndarray(self, obj):
-        """
-        get the resume info object ready for json serialization
-        """
-        try:
-            import numpy as np
-        except ImportError:
-            np = None
-        if np and isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {k: self.__convert_ndarray(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self.__convert_ndarray(v) for v in obj]
-        else:
-            return obj
+        self.cache_stats = None  # line vector cache stats of the last get_resume
+        self.req_timing = {}  # requirement mode / latency of the last get_resume
+        self.should_cancel = None  # optional callable, see async_bot.run_sync
 
     def get_resume(self, args: dict) -> tuple[bool, bytes]:
         """
@@ -57,7 +51,7 @@ class ResumeHandle:
         handles updating the db with cached vectors
         """
         user_auth_obj = UserAuth(self.database, args)
-        user_auth_json, login_status = user_auth_obj.login_jwt()
+        user_auth_json, login_status = user_auth_obj.login_jwt(warm_up=False)
         if (
             login_status == -1 or not user_auth_json["status"]
         ):  # Login_status SHOULD be defined if this is reached
@@ -76,19 +70,44 @@ class ResumeHandle:
         if not resume_dict:
             print("ERROR: no resume info found for user")
             return False, None
-        # Convert the original resume_dict for proper comparison
-        converted_resume_dict = self.__convert_ndarray(resume_dict)
+        # Vectors are stripped, not encoded: they live in line_vecs
+        converted_resume_dict = vec_rip(resume_dict)
         # Here you would generate the resume PDF from resume_dict
         templ = LTemplate()
         my_resume = Resume(templ, resume_dict)
-        if not my_resume.make(args["job_description"], no_cache=args["no_cache"]):
+        if async_bot.async_enabled():
+            # Timeouts, concurrency limit and cancel on client disconnect
+            my_resume.bot = async_bot.SyncAIBot(self.should_cancel)
+        # All of the user's line vectors in one query, see vec_store
+        model_id = encoder.model_id()
+        all_lines = my_resume.all_lines()
+        known_hashes = vec_store.load_user_vecs(
+            self.database, args["uid"], all_lines, model_id
+        )
+        if not my_resume.make(
+            args["job_description"],
+            no_cache=args["no_cache"],
+            req_cache=ReqCache(self.database),
+            # no_cache means every line is really encoded again
+            global_store=None if args["no_cache"] else GlobalVecStore(self.database),
+            req_mode=args.get("req_mode"),
+        ):
             print("ERROR: failed to make resume")
             return False, None
+        self.cache_stats = my_resume.cache_stats
+        self.req_timing = my_resume.req_timing
+        vec_store.save_user_vecs(
+            self.database,
+            args["uid"],
+            all_lines,
+            model_id,
+            () if args["no_cache"] else known_hashes,
+        )
         my_resume.optimize()
         resume_pdf_bytes = my_resume.build()
-        new_resume_dict = my_resume.to_dict()
-        new_resume_dict = self.__convert_ndarray(new_resume_dict)
-        
+        # Vectors are stored in line_vecs, never in resumeinfo
+        new_resume_dict = vec_rip(my_resume.to_dict())
+
         try:
             if json.dumps(converted_resume_dict, sort_keys=True) != json.dumps(
                 new_resume_dict, sort_keys=True
@@ -104,7 +123,7 @@ class ResumeHandle:
                 f"WARNING: Could not compare resume dictionaries, updating anyway: {e}"
             )
             query = "UPDATE data SET resumeinfo = %s WHERE uid = %s"
-            values = (json.dumps(new_resume_dict), user_auth_json["uid"])
+            values = (json.dumps(new_resume_dict), args["uid"])
             self.database.run_sql(query, values)
 
         return True, resume_pdf_bytes
@@ -115,7 +134,7 @@ class ResumeHandle:
         bool is for success, str is for message(mainly error message)
         """
         user_auth_obj = UserAuth(self.database, args)
-        user_auth_json, login_status = user_auth_obj.login_jwt()
+        user_auth_json, login_status = user_auth_obj.login_jwt(warm_up=False)
         if (
             login_status == -1 or not user_auth_json["status"]
         ):  # Login_status SHOULD be defined if this is reached
@@ -143,23 +162,34 @@ class ResumeHandle:
             print("ERROR: resume has no items")
             return False, "Empty resume - no items found"
 
-        # # load it into object: if there are error, catch it here
-        # templ = LTemplate()
-        # try:
-        #     my_resume = Resume(templ, new_resume_dict)
-        #     if not my_resume.make(
-        #         "This is a backend software engineer role, where the candidate will be instrumental in developing, hosting, and maintaining the robust server-side infrastructure and APIs on the cloud (AWS) that power our diverse applications. The candidate should have strong experience in backend development, especially with languages like Python (e.g., Django, Flask), Java (e.g., Spring Boot), or Node.js (e.g., Express). They should also be deeply familiar with designing and managing various databases (both relational like PostgreSQL or MySQL, and NoSQL like MongoDB or Redis) and possess a solid understanding of scalable architecture, API security, and distributed systems.",
-        #         no_cache=True,
-        #     ):
-        #         print("ERROR: failed to make resume")
-        #         return False, "Failed to make resume"
-        # except (TypeError, ValueError) as e:
-        #     print(f"ERROR: failed to load resume dict: {e}")
-        #     return False, f"Failed to load resume dict: {str(e)}"
         processed_resume_dict = new_resume_dict
         query = "UPDATE data SET resumeinfo = %s WHERE uid = %s"
         print("DEBUG: resume to_dict: type of " + str(type(processed_resume_dict)))
-        processed_resume_dict = self.__convert_ndarray(processed_resume_dict)
+        processed_resume_dict = vec_rip(processed_resume_dict)
         values = (json.dumps(processed_resume_dict), args["uid"])
         self.database.run_sql(query, values)
+        self.__embed_changed_lines(args["uid"], processed_resume_dict)
         return True, "Resume updated successfully"
+
+    def __embed_changed_lines(self, uid: str, resume_dict: dict) -> None:
+        """
+        Embed the lines of the saved resume that have no stored vector yet
+        (new or edited content_str), so generation finds every vector present
+        Runs within SAVE_EMBED_BUDGET_MS, the rest continues in the background
+        Failures here never fail the save, generation encodes what is missing
+        """
+        try:
+            if not vec_store.table_ready(self.database):
+                return
+            texts = vec_fill.resume_line_texts(resume_dict)
+            # Vectors of deleted/edited lines are not needed anymore
+            self.database.delete_line_vecs_except(
+                uid, [vec_cache.content_hash(text) for text in texts]
+            )
+            report = vec_fill.fill_missing_vecs(
+                self.database, uid, texts, budget_s=vec_fill.save_budget_s()
+            )
+            if report["remaining"]:
+                vec_fill.schedule_fill(uid, report["remaining"])
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: embedding at save time failed, deferred to generation: {e}")
@@ -19,6 +19,7 @@ from dotenv import load_dotenv
 import psycopg  # type: ignore
 
 from ..db_helper import dbconn
+from ..embed_helper import vec_fill
 from ..general_helper.vec_rip import vec_rip
 from ..general_helper.parse_user_info import parse_user_info
 
@@ -79,10 +80,12 @@ class UserAuth:
         """
         self.args = args
 
-    def login_jwt(self, quick: bool = False) -> tuple[dict, int]:
+    def login_jwt(self, quick: bool = False, warm_up: bool = True) -> tuple[dict, int]:
         """
         logs in the user with a jwt token
         Requires uid, reauth_jwt
+        warm_up: schedule the login vector warm-up (see vec_fill), callers
+        that generate right away pass False
         """
         if not self.args["uid"] or not self.args["reauth_jwt"]:
             print("ERROR: uid or reauth_jwt not provided")
@@ -108,6 +111,8 @@ class UserAuth:
         table_1 = self.database.run_sql(sql_query)
         if not table_1:
             return {"status": False, "detail": {"status": "reauth failed, result bad"}}, 400
+        if warm_up:
+            vec_fill.schedule_login_warm_up(self.args["uid"], table_1[0].get("resumeinfo"))
         if datetime.datetime.utcnow() > datetime.datetime.fromtimestamp(
             payload["exp"]
         ) - datetime.timedelta(minutes=15):
@@ -153,6 +158,7 @@ class UserAuth:
             print("ERROR: auth type mismatch")
             return {"status": False, "detail": {"status": "auth type mismatch"}}, 401
         if table_1[0]["pwd"] == self.args["pwd"]:
+            vec_fill.schedule_login_warm_up(self.args["uid"], table_1[0].get("resumeinfo"))
             reduced_table = vec_rip(table_1[0])
             parsed_info = parse_user_info(reduced_table)
             print("Parsed info:", parsed_info)
@@ -267,6 +273,7 @@ class UserAuth:
                 return {}, -1
         if table_1[0]["auth_type"] != "go":
             return {"status": False, "message": "auth type mismatch"}, 401
+        vec_fill.schedule_login_warm_up(table_1[0]["uid"], table_1[0].get("resumeinfo"))
         reduced_table = vec_rip(table_1[0])
         parsed_info = parse_user_info(reduced_table)
         print("Parsed info:", parsed_info)
@@ -36,6 +36,13 @@ resume_get.add_argument(
     help="Job description used to generate resume",
     required=True,
 )
+resume_get.add_argument(
+    "req_mode",
+    type=str,
+    choices=("ai", "bank"),
+    help="requirement extraction: ai (LLM) or bank (local skill bank, faster), default REQ_MODE",
+    default=None,
+)
 
 resume_post = reqparse.RequestParser()
 resume_post.add_argument(
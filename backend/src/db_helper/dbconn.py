@@ -10,6 +10,7 @@ Functions must remain the same
 """
 
 import os
+import time
 import psycopg
 from psycopg_pool import ConnectionPool
 from dotenv import load_dotenv
@@ -55,8 +56,222 @@ class DBConn:
             results = []
         return results
 
+    def stream_sql(self, sql_query: str, params=None, itersize: int = 500):
+        """
+        Yields result rows (dicts) of a query through a server-side cursor
+        Only itersize rows are held in memory at a time, for jobs that walk
+        whole tables. The pool connection is held until the generator is
+        exhausted or closed, so close it (or use it in a for loop) promptly.
+        """
+        with self.conn_pool.connection() as conn:
+            with conn.cursor(
+                name="stream_sql", row_factory=psycopg.rows.dict_row
+            ) as cur:
+                cur.itersize = itersize
+                cur.execute(sql_query, params)
+                yield from cur
+            conn.commit()
+
+    def upsert_line_vecs(
+        self, uid: str, model_id: str, vecs: dict, encoding: str
+    ) -> bool:
+        """
+        Bulk insert/update line vectors of one user in a single transaction
+        vecs is a dict of line_hash -> bytes (see vec_codec.to_bytes)
+        Table: line_vecs, keyed by (uid, line_hash, model_id)
+        """
+        if not vecs:
+            return True
+        sql_query = """
+            INSERT INTO line_vecs (uid, line_hash, model_id, encoding, vec)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (uid, line_hash, model_id)
+            DO UPDATE SET encoding = EXCLUDED.encoding, vec = EXCLUDED.vec,
+                updated_at = now()
+        """
+        params = [
+            (uid, line_hash, model_id, encoding, vec)
+            for line_hash, vec in vecs.items()
+        ]
+        try:
+            with self.conn_pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.executemany(sql_query, params)
+                conn.commit()
+        except (QueryCanceled, OperationalError) as e:
+            print(f"Database error: {e}")
+            return False
+        return True
+
+    def upsert_line_vecs_many(self, model_id: str, vecs_by_uid: dict, encoding: str) -> bool:
+        """
+        upsert_line_vecs for many users in a single transaction
+        vecs_by_uid is a dict of uid -> {line_hash: bytes}
+        Rows are written in (uid, line_hash) order so concurrent writers cannot deadlock
+        """
+        params = [
+            (uid, line_hash, model_id, encoding, vecs_by_uid[uid][line_hash])
+            for uid in sorted(vecs_by_uid)
+            for line_hash in sorted(vecs_by_uid[uid])
+        ]
+        if not params:
+            return True
+        sql_query = """
+            INSERT INTO line_vecs (uid, line_hash, model_id, encoding, vec)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (uid, line_hash, model_id)
+            DO UPDATE SET encoding = EXCLUDED.encoding, vec = EXCLUDED.vec,
+                updated_at = now()
+        """
+        try:
+            with self.conn_pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.executemany(sql_query, params)
+                conn.commit()
+        except (QueryCanceled, OperationalError) as e:
+            print(f"Database error: {e}")
+            return False
+        return True
+
+    def fetch_line_vec_hashes_many(self, uids: list, model_id: str) -> dict:
+        """
+        fetch_line_vec_hashes for many users in one query
+        Returns a dict of uid -> set of line hashes (users without vectors are left out)
+        """
+        rows = self.run_sql(
+            "SELECT uid, line_hash FROM line_vecs WHERE model_id = %s AND uid = ANY(%s);",
+            (model_id, list(uids)),
+        )
+        hashes = {}
+        for row in rows:
+            hashes.setdefault(row["uid"], set()).add(row["line_hash"])
+        return hashes
+
+    def fetch_line_vecs(self, uid: str, model_id: str) -> dict:
+        """
+        All stored line vectors of one user for one model, in one query
+        Returns a dict of line_hash -> (encoding, bytes)
+        """
+        rows = self.run_sql(
+            "SELECT line_hash, encoding, vec FROM line_vecs WHERE uid = %s AND model_id = %s;",
+            (uid, model_id),
+        )
+        return {row["line_hash"]: (row["encoding"], bytes(row["vec"])) for row in rows}
+
+    def fetch_line_vec_hashes(self, uid: str, model_id: str) -> set:
+        """
+        Hashes of the lines that already have a vector, without the vector bytes
+        """
+        rows = self.run_sql(
+            "SELECT line_hash FROM line_vecs WHERE uid = %s AND model_id = %s;",
+            (uid, model_id),
+        )
+        return {row["line_hash"] for row in rows}
+
+    def delete_line_vecs_except(self, uid: str, keep_hashes: list) -> None:
+        """
+        Drop the user's vectors of lines that are no longer in the resume
+        """
+        self.run_sql(
+            "DELETE FROM line_vecs WHERE uid = %s AND NOT (line_hash = ANY(%s));",
+            (uid, list(keep_hashes)),
+        )
+
+    def insert_global_vecs(self, model_id: str, vecs: dict, encoding: str) -> bool:
+        """
+        Add vectors to the shared global_vecs store, existing ones are kept
+        vecs is a dict of content_hash -> bytes (see vec_codec.to_bytes)
+        Rows are inserted in hash order so concurrent writers cannot deadlock
+        """
+        if not vecs:
+            return True
+        sql_query = """
+            INSERT INTO global_vecs (content_hash, model_id, encoding, vec)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (content_hash, model_id) DO NOTHING
+        """
+        params = [
+            (content_hash, model_id, encoding, vecs[content_hash])
+            for content_hash in sorted(vecs)
+        ]
+        try:
+            with self.conn_pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.executemany(sql_query, params)
+                conn.commit()
+        except (QueryCanceled, OperationalError) as e:
+            print(f"Database error: {e}")
+            return False
+        return True
+
+    def fetch_global_vecs(self, model_id: str, content_hashes: list) -> dict:
+        """
+        Shared vectors for the given content hashes, in one query
+        Returns a dict of content_hash -> (encoding, bytes), missing hashes are left out
+        """
+        if not content_hashes:
+            return {}
+        rows = self.run_sql(
+            """
+            SELECT content_hash, encoding, vec FROM global_vecs
+            WHERE model_id = %s AND content_hash = ANY(%s);
+            """,
+            (model_id, list(content_hashes)),
+        )
+        return {
+            row["content_hash"]: (row["encoding"], bytes(row["vec"])) for row in rows
+        }
+
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Whether the table exists (False too if the database is unreachable)
+        """
+        rows = self.run_sql("SELECT to_regclass(%s) IS NOT NULL AS present;", (table_name,))
+        return bool(rows) and bool(rows[0]["present"])
+
     def close(self) -> None:
         """
         Close all connections in the pool
         """
         self.conn_pool.close()
+
+
+class TableCheck:
+    """
+    Whether an optional table exists, for features that fall back without it
+    The answer is kept per process; a missing table is logged once and asked
+    again after recheck_s, so running the migration takes effect without a
+    restart. Sample usage:
+    line_vecs_table = TableCheck("line_vecs")
+    if line_vecs_table.ready(database): ...
+    """
+
+    MIGRATION = "python -m backend.src.embed_helper.vec_migrate tables"
+
+    def __init__(self, table_name: str, recheck_s: float = 300.0) -> None:
+        self.table_name = table_name
+        self.recheck_s = recheck_s
+        self.present = None
+        self.checked_at = 0.0
+
+    def ready(self, database: DBConn) -> bool:
+        """
+        Whether the table exists, asks the database at most once per recheck_s
+        while it is missing (never again once it was found)
+        """
+        now = time.monotonic()
+        if self.present is None or (
+            not self.present and now - self.checked_at >= self.recheck_s
+        ):
+            try:
+                present = database.table_exists(self.table_name)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"WARNING: could not check for the {self.table_name} table: {e}")
+                present = False
+            if not present:
+                print(
+                    f"WARNING: {self.table_name} table missing, running without it "
+                    f"({self.MIGRATION})"
+                )
+            self.present, self.checked_at = present, now
+        return self.present
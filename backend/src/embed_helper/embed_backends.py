@@ -0,0 +1,292 @@
+"""
+Pluggable inference backends for line scoring
+
+Every backend turns a list of texts into L2-normalized embeddings of shape (N, D).
+Picked with EMBED_BACKEND:
+- torch (default): SentenceTransformer.encode through the model registry
+  (OPT_MODEL_QUANTIZE=int8 for dynamic int8 linear layers on CPU)
+- onnx: ONNX Runtime on CPU, with the mean pooling + normalization of the
+  sentence transformer done in numpy. Needs onnxruntime and tokenizers, and a
+  model.onnx exported next to the model (see onnx_export.py). Never imports torch.
+- hash: scikit-learn HashingVectorizer, deterministic and model free (own model_id),
+  for running the pipeline offline in tests and load tests
+
+Backends that reproduce the torch vectors (within tolerance) report the same
+model_id, so vectors cached by one are reused by the other.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from . import thread_governor
+from .model_registry import model_registry
+
+
+class EmbedBackend:
+    """
+    Interface: encode, model_id, warm_up
+    token_lengths + encode_batch are used by length bucketing (length_buckets.py)
+    """
+
+    name = "base"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Normalized embeddings, shape (N, D)
+        """
+        raise NotImplementedError
+
+    def model_id(self) -> str:
+        """
+        Identifier stored with every vector, see model_registry.model_id
+        """
+        return model_registry.model_id()
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        """
+        Token count of each text after truncation, used for length bucketing
+        """
+        raise NotImplementedError
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode texts as exactly one batch (the caller picked the batch)
+        """
+        return self.encode(texts)
+
+    def warm_up(self) -> bool:
+        """
+        Load whatever is needed and run a dummy encode
+        """
+        try:
+            self.encode(["warm up the embedding backend"])
+            return True
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"ERROR: failed to warm up {self.name} backend: {e}")
+            return False
+
+
+class TorchBackend(EmbedBackend):
+    """
+    SentenceTransformer.encode on the shared model
+    """
+
+    name = "torch"
+
+    def model_id(self) -> str:
+        """
+        Quantized vectors differ slightly from fp32 ones, keep them apart
+        """
+        quantization = model_registry.quantization()
+        if quantization:
+            return f"{model_registry.model_id()}+{quantization}"
+        return model_registry.model_id()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        model = model_registry.get_model()
+        return model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        model = model_registry.get_model()
+        encoded = model.tokenizer(
+            texts, truncation=True, max_length=model.max_seq_length
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        model = model_registry.get_model()
+        return model.encode(
+            texts,
+            batch_size=max(len(texts), 1),
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def warm_up(self) -> bool:
+        return model_registry.warm_up()
+
+
+class OnnxBackend(EmbedBackend):
+    """
+    ONNX Runtime CPU inference of the transformer, pooling done here
+    - model_path: sentence transformer folder (OPT_MODEL_PATH), for the tokenizer
+      and max_seq_length
+    - onnx_path: exported graph, defaults to <model_path>/onnx/model.onnx
+      (OPT_ONNX_PATH overrides)
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str = None, onnx_path: str = None) -> None:
+        load_dotenv()
+        self.model_path = model_path or model_registry.default_model_path()
+        self.onnx_path = (
+            onnx_path
+            or os.getenv("OPT_ONNX_PATH")
+            or os.path.join(self.model_path, "onnx", "model.onnx")
+        )
+        self.batch_size = int(os.getenv("ONNX_BATCH_SIZE", "32"))
+        self.session = None
+        self.tokenizer = None
+        self.input_names = []
+        self.dim = None
+        self.lock = threading.Lock()
+
+    def _max_seq_length(self) -> int:
+        if model_registry.max_seq_length():
+            return model_registry.max_seq_length()
+        # sentence_bert_config first, then the tokenizer's own limit (newer
+        # sentence transformer exports only have the latter)
+        for file_name, key in (
+            ("sentence_bert_config.json", "max_seq_length"),
+            ("tokenizer_config.json", "model_max_length"),
+        ):
+            config_path = os.path.join(self.model_path, file_name)
+            if not os.path.exists(config_path):
+                continue
+            with open(config_path, encoding="utf-8") as f:
+                value = json.load(f).get(key)
+            # transformers writes a huge sentinel when there is no real limit
+            if value and int(value) < 100000:
+                return int(value)
+        return 512
+
+    def _load(self) -> None:
+        if self.session is not None:
+            return
+        with self.lock:
+            if self.session is not None:
+                return
+            # pylint: disable=import-outside-toplevel
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(
+                os.path.join(self.model_path, "tokenizer.json")
+            )
+            tokenizer.enable_truncation(max_length=self._max_seq_length())
+            tokenizer.enable_padding()
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = thread_governor.current_threads()
+            options.inter_op_num_threads = 1
+            session = ort.InferenceSession(
+                self.onnx_path, options, providers=["CPUExecutionProvider"]
+            )
+            self.input_names = [inp.name for inp in session.get_inputs()]
+            # Symbolic when the export left it dynamic, then taken from a real batch
+            out_dim = session.get_outputs()[0].shape[-1]
+            self.dim = out_dim if isinstance(out_dim, int) else None
+            self.tokenizer = tokenizer
+            self.session = session
+            print(f"DEBUG: ONNX model loaded from {self.onnx_path}")
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([enc.ids for enc in encodings], dtype=np.int64)
+        attention_mask = np.array(
+            [enc.attention_mask for enc in encodings], dtype=np.int64
+        )
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]  # (B, T, D)
+        # Mean pooling over real tokens, then L2 normalize (same as the
+        # Pooling + Normalize modules of the sentence transformer)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+        norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return (pooled / norms).astype(np.float32)
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        self._load()
+        # Padding is on, the attention mask tells the real length
+        return [sum(enc.attention_mask) for enc in self.tokenizer.encode_batch(texts)]
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        self._load()
+        return self._encode_batch(texts)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        self._load()
+        if not texts:
+            if self.dim is None:
+                self.dim = self._encode_batch([""]).shape[1]
+            return np.empty((0, self.dim), np.float32)
+        chunks = [
+            self._encode_batch(texts[start : start + self.batch_size])
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        return np.vstack(chunks)
+
+
+class HashBackend(EmbedBackend):
+    """
+    Deterministic hashing vectorizer (scikit-learn), no model files at all
+    Word unigrams + bigrams hashed into EMBED_HASH_DIM (default 384) buckets,
+    L2 normalized. Scores are lexical overlap, not semantics: for tests, CI and
+    load tests of the whole make -> optimize -> build pipeline offline
+    """
+
+    name = "hash"
+    VERSION = "1"  # bump when the vectorizer settings change
+
+    def __init__(self, dim: int = None) -> None:
+        load_dotenv()
+        # pylint: disable=import-outside-toplevel
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dim = dim or int(os.getenv("EMBED_HASH_DIM", "384"))
+        self.vectorizer = HashingVectorizer(
+            n_features=self.dim,
+            ngram_range=(1, 2),
+            lowercase=True,
+            alternate_sign=False,
+            norm="l2",
+        )
+
+    def model_id(self) -> str:
+        return f"hash-v{self.VERSION}-{self.dim}"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        return [len(text.split()) for text in texts]
+
+    def warm_up(self) -> bool:
+        return True
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend,
+    HashBackend.name: HashBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> EmbedBackend:
+    """
+    The worker-wide backend picked by EMBED_BACKEND
+    """
+    global _backend  # pylint: disable=global-statement
+    if _backend is not None:
+        return _backend
+    load_dotenv()
+    name = os.getenv("EMBED_BACKEND", TorchBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"EMBED_BACKEND must be one of {list(BACKENDS)}, got {name}")
+    with _backend_lock:
+        if _backend is None:
+            _backend = BACKENDS[name]()
+    return _backend
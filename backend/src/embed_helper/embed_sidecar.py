@@ -0,0 +1,178 @@
+"""
+Embedding sidecar: one process per host owns the model and serves encode
+requests to every API worker over a local Unix socket
+
+Without it, every gunicorn worker holds its own copy of the transformer weights.
+With EMBED_SIDECAR_SOCKET set, workers encode through SidecarClient instead and
+fall back to in-process encoding when the sidecar is down (see encoder.py).
+
+Start (from repo root, same .env as the API so OPT_MODEL_PATH matches):
+python -m backend.src.embed_helper.embed_sidecar [socket_path]
+
+Protocol, every message is a 4 byte big-endian length followed by that many bytes:
+- request: json {"op": "encode", "texts": [...]} or {"op": "ping"}
+- response: json header {"ok": bool, "shape": [N, D], "model_id": str, "error": str},
+  then for encode, one more message with the float32 (little endian) matrix
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+
+import numpy as np
+from dotenv import load_dotenv
+
+_LENGTH = struct.Struct(">I")
+
+
+def default_socket_path() -> str:
+    """
+    Socket path configured through EMBED_SIDECAR_SOCKET
+    """
+    load_dotenv()
+    return os.getenv("EMBED_SIDECAR_SOCKET", "/tmp/resumix_embed.sock")
+
+
+def _send(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("sidecar connection closed mid message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return _recv_exact(sock, size)
+
+
+class SidecarModelMismatch(RuntimeError):
+    """
+    The sidecar serves another model id (model, quantization, projection,
+    backend) than this worker is configured for
+    """
+
+    def __init__(self, sidecar_model_id: str, local_model_id: str) -> None:
+        super().__init__(f"sidecar serves {sidecar_model_id}, this worker expects {local_model_id}")
+        self.sidecar_model_id = sidecar_model_id
+        self.local_model_id = local_model_id
+
+
+class SidecarClient:
+    """
+    Talks to a running sidecar
+    Raises OSError/ConnectionError when it cannot be reached, ValueError on a
+    garbled reply (bad json / body size), callers fall back
+    """
+
+    def __init__(self, socket_path: str = None, timeout: float = 30.0) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def _request(self, request: dict) -> tuple[dict, bytes]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            _send(sock, json.dumps(request).encode("utf-8"))
+            header = json.loads(_recv(sock))
+            if not header.get("ok"):
+                raise RuntimeError(f"sidecar error: {header.get('error')}")
+            body = _recv(sock) if request["op"] == "encode" else b""
+        return header, body
+
+    def ping(self) -> dict:
+        """
+        Returns the sidecar header (model_id etc.) if it is up
+        """
+        header, _ = self._request({"op": "ping"})
+        return header
+
+    def encode(self, texts: list[str], expected_model_id: str = None) -> np.ndarray:
+        """
+        Normalized embeddings of texts, shape (N, D)
+        Raises SidecarModelMismatch if the sidecar serves another model id than
+        expected_model_id (its vectors would be stored under the wrong id)
+        """
+        header, body = self._request({"op": "encode", "texts": list(texts)})
+        if expected_model_id is not None and header.get("model_id") != expected_model_id:
+            raise SidecarModelMismatch(header.get("model_id"), expected_model_id)
+        return np.frombuffer(body, dtype="<f4").reshape(header["shape"])
+
+
+class _SidecarHandler(socketserver.BaseRequestHandler):
+    """
+    One connection = one request
+    """
+
+    def handle(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from .encoder import encode_direct_or_batched, model_id
+
+        try:
+            request = json.loads(_recv(self.request))
+            header = {"ok": True, "model_id": model_id()}
+            if request.get("op") == "ping":
+                _send(self.request, json.dumps(header).encode("utf-8"))
+                return
+            if request.get("op") != "encode":
+                raise ValueError(f"unknown op {request.get('op')}")
+            vecs = np.asarray(
+                encode_direct_or_batched(request["texts"]), dtype="<f4"
+            )
+            header["shape"] = list(vecs.shape)
+            _send(self.request, json.dumps(header).encode("utf-8"))
+            _send(self.request, vecs.tobytes())
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"ERROR: sidecar request failed: {e}")
+            try:
+                _send(self.request, json.dumps({"ok": False, "error": str(e)}).encode())
+            except OSError:
+                pass
+
+
+class SidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threaded so concurrent workers can share encode batches (ENCODE_BATCH_WAIT_MS)
+    """
+
+    daemon_threads = True
+
+
+def serve(socket_path: str = None) -> None:
+    """
+    Load + warm the model, then serve until interrupted
+    """
+    # pylint: disable=import-outside-toplevel
+    from .embed_backends import get_backend
+    from .encoder import model_id
+    from . import thread_governor
+
+    # The sidecar is the only process encoding on the host, it gets every core
+    thread_governor.apply(workers=1)
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    backend = get_backend()
+    if not backend.warm_up():
+        raise SystemExit("ERROR: sidecar could not load the model")
+    with SidecarServer(socket_path, _SidecarHandler) as server:
+        os.chmod(socket_path, 0o660)
+        print(f"Embedding sidecar serving {model_id()} on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,164 @@
+"""
+Cross-request micro-batching for sentence transformer encoding
+
+Concurrent line_eval callers each have a small batch of texts. Instead of
+running model.encode once per caller, requests are queued, collected for at
+most max_wait_ms (or until max_batch texts), encoded as one padded batch,
+and every caller gets back its own slice.
+
+Sample usage:
+batcher = EncodeBatcher(encode_fn, max_wait_ms=5, max_batch=256)
+vecs = batcher.encode(texts)  # blocks until the batch containing texts is done
+print(batcher.stats())
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class _EncodeRequest:
+    """
+    One caller's texts, filled with result or error by the worker thread
+    """
+
+    def __init__(self, texts: list[str]) -> None:
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+def _bucket(size: int) -> str:
+    """
+    Power of two histogram bucket label, e.g. 5 -> "4-7"
+    """
+    if size <= 1:
+        return "1"
+    low = 1 << (size.bit_length() - 1)
+    return f"{low}-{2 * low - 1}"
+
+
+class EncodeBatcher:
+    """
+    Collects encode requests from many threads into shared batches
+    - encode_fn: function list[str] -> np.ndarray (N, D), called from one thread only
+    - max_wait_ms: how long the first request of a batch waits for company
+    - max_batch: stop collecting once this many texts are queued
+    The worker thread is a daemon, started on first use
+    """
+
+    def __init__(self, encode_fn, max_wait_ms: float = 5, max_batch: int = 256) -> None:
+        self.encode_fn = encode_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.batch_count = 0
+        self.request_count = 0
+        self.text_count = 0
+        self.max_queue_depth = 0
+        self.batch_size_hist = {}  # bucket -> number of batches (in texts)
+        self.requests_per_batch_hist = {}  # bucket -> number of batches (in callers)
+        self.queue_depth_hist = {}  # bucket -> times seen when a batch started
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode texts as part of the next shared batch
+        Raises whatever encode_fn raised for that batch
+        """
+        self._ensure_started()
+        request = _EncodeRequest(list(texts))
+        self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _ensure_started(self) -> None:
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self._run, name="encode-batcher", daemon=True
+                )
+                self.thread.start()
+
+    def _collect(self) -> list:
+        """
+        Block for the first request, then gather more until full or timed out
+        """
+        batch = [self.requests.get()]
+        queue_depth = self.requests.qsize() + 1
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        self._record(queue_depth, len(batch), size)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            all_texts = []
+            for request in batch:
+                all_texts.extend(request.texts)
+            try:
+                vecs = self.encode_fn(all_texts)
+                offset = 0
+                for request in batch:
+                    request.result = vecs[offset : offset + len(request.texts)]
+                    offset += len(request.texts)
+            except Exception as e:  # pylint: disable=broad-except
+                for request in batch:
+                    request.error = e
+            for request in batch:
+                request.done.set()
+
+    def _record(self, queue_depth: int, request_count: int, text_count: int) -> None:
+        with self.stats_lock:
+            self.batch_count += 1
+            self.request_count += request_count
+            self.text_count += text_count
+            self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+            for hist, value in (
+                (self.batch_size_hist, text_count),
+                (self.requests_per_batch_hist, request_count),
+                (self.queue_depth_hist, queue_depth),
+            ):
+                label = _bucket(value)
+                hist[label] = hist.get(label, 0) + 1
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the batching metrics
+        """
+        with self.stats_lock:
+            return {
+                "max_wait_ms": self.max_wait * 1000.0,
+                "max_batch": self.max_batch,
+                "queue_depth": self.requests.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "batches": self.batch_count,
+                "requests": self.request_count,
+                "texts": self.text_count,
+                "avg_batch_size": (
+                    self.text_count / self.batch_count if self.batch_count else 0.0
+                ),
+                "batch_size_hist": dict(self.batch_size_hist),
+                "requests_per_batch_hist": dict(self.requests_per_batch_hist),
+                "queue_depth_hist": dict(self.queue_depth_hist),
+            }
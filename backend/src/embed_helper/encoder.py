@@ -0,0 +1,234 @@
+"""
+Single entry point for turning texts into normalized embeddings
+line_eval and everything else that embeds text goes through encode_texts
+
+Modes, picked from the environment:
+- EMBED_SIDECAR_SOCKET set: encode through the host-wide sidecar (embed_sidecar.py),
+  falling back to in-process encoding while it is down or serving another
+  model id than model_id()
+- ENCODE_BATCH_WAIT_MS > 0: in-process micro-batching across concurrent
+  requests (encode_batcher.py), ENCODE_BATCH_MAX caps the batch size
+- otherwise: plain in-process encode
+In-process encoding runs on the backend picked by EMBED_BACKEND (embed_backends.py),
+length bucketed when ENCODE_BUCKETS is set (length_buckets.py) and reduced
+with the PCA projection at EMBED_PROJECTION_PATH if set (projection.py)
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+from . import thread_governor
+from .encode_batcher import EncodeBatcher
+from .embed_sidecar import SidecarClient, SidecarModelMismatch
+from .embed_backends import get_backend
+from .model_registry import model_registry
+from .length_buckets import LengthBucketer, parse_buckets
+from .projection import get_projection
+
+# After a failed sidecar call, encode in-process for this long before retrying
+SIDECAR_RETRY_SECONDS = 10.0
+# After the sidecar served another model id, wait longer (it needs a redeploy)
+SIDECAR_MISMATCH_RETRY_SECONDS = 300.0
+
+_batcher = None
+_batcher_lock = threading.Lock()
+_bucketer = {"instance": None, "checked": False}
+_sidecar = {"client": None, "down_until": 0.0, "fallbacks": 0, "mismatches": 0}
+_projection_warned = {"reason": None}
+
+
+def encode_direct(texts: list[str]) -> np.ndarray:
+    """
+    Encode in the calling thread with the configured backend, shape (N, D)
+    """
+    bucketer = get_bucketer()
+    if bucketer is not None and texts:
+        vecs = bucketer.encode(texts)
+    else:
+        vecs = get_backend().encode(texts)
+    projection = _get_projection()
+    if projection is not None:
+        vecs = projection.apply(vecs)
+    return vecs
+
+
+def projection_mismatch() -> str:
+    """
+    Why the configured projection cannot be used with this backend, None if
+    it can (or none is configured)
+    """
+    projection = get_projection()
+    if projection is not None and projection.source_model_id != get_backend().model_id():
+        return (
+            f"projection {projection.tag()} was fitted on {projection.source_model_id}, "
+            f"not {get_backend().model_id()}"
+        )
+    return None
+
+
+def _get_projection():
+    """
+    The configured projection, None if there is none or it was fitted on
+    another backend model id (a stale EMBED_PROJECTION_PATH after a rollout):
+    that is logged once and the process encodes at full dimension, see warm_up
+    """
+    mismatch = projection_mismatch()
+    if mismatch is not None:
+        if _projection_warned.get("reason") != mismatch:
+            print(f"ERROR: {mismatch}, encoding without the projection")
+            _projection_warned["reason"] = mismatch
+        return None
+    return get_projection()
+
+
+def get_bucketer():
+    """
+    The worker-wide LengthBucketer, or None when ENCODE_BUCKETS is not set
+    """
+    if not _bucketer["checked"]:
+        load_dotenv()
+        spec = os.getenv("ENCODE_BUCKETS", "").strip()
+        if spec:
+            backend = get_backend()
+            _bucketer["instance"] = LengthBucketer(
+                backend.token_lengths, backend.encode_batch, parse_buckets(spec)
+            )
+        _bucketer["checked"] = True
+    return _bucketer["instance"]
+
+
+def model_id() -> str:
+    """
+    Identifier of the vectors encode_texts produces, stored with every
+    cached vector (sidecar vectors are only used when the sidecar reports
+    the same id)
+    """
+    projection = _get_projection()
+    if projection is not None:
+        return f"{get_backend().model_id()}|{projection.tag()}"
+    return get_backend().model_id()
+
+
+def get_batcher():
+    """
+    The worker-wide EncodeBatcher, or None when batching is off
+    """
+    global _batcher  # pylint: disable=global-statement
+    if _batcher is not None:
+        return _batcher
+    load_dotenv()
+    max_wait_ms = float(os.getenv("ENCODE_BATCH_WAIT_MS", "0"))
+    if max_wait_ms <= 0:
+        return None
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = EncodeBatcher(
+                encode_direct,
+                max_wait_ms=max_wait_ms,
+                max_batch=int(os.getenv("ENCODE_BATCH_MAX", "256")),
+            )
+    return _batcher
+
+
+def get_sidecar():
+    """
+    SidecarClient when EMBED_SIDECAR_SOCKET is set, else None
+    """
+    if _sidecar["client"] is None:
+        load_dotenv()
+        socket_path = os.getenv("EMBED_SIDECAR_SOCKET")
+        if not socket_path:
+            return None
+        _sidecar["client"] = SidecarClient(socket_path)
+    return _sidecar["client"]
+
+
+def encode_direct_or_batched(texts: list[str]) -> np.ndarray:
+    """
+    In-process encode, shared with concurrent callers when batching is on
+    """
+    batcher = get_batcher()
+    if batcher is not None:
+        return batcher.encode(texts)
+    return encode_direct(texts)
+
+
+def encode_texts(texts: list[str]) -> np.ndarray:
+    """
+    Normalized embeddings of texts, shape (N, D)
+    """
+    sidecar = get_sidecar()
+    if sidecar is not None and time.monotonic() >= _sidecar["down_until"]:
+        try:
+            return sidecar.encode(texts, model_id())
+        except SidecarModelMismatch as e:
+            _sidecar_mismatch(e)
+        except (OSError, ConnectionError, RuntimeError, ValueError) as e:
+            print(f"WARNING: embedding sidecar unavailable, encoding in-process: {e}")
+            _sidecar["down_until"] = time.monotonic() + SIDECAR_RETRY_SECONDS
+            _sidecar["fallbacks"] += 1
+    return encode_direct_or_batched(texts)
+
+
+def _sidecar_mismatch(error: SidecarModelMismatch) -> None:
+    """
+    Stop using a sidecar that serves another model id for a while
+    """
+    print(f"WARNING: embedding sidecar model mismatch, encoding in-process: {error}")
+    _sidecar["down_until"] = time.monotonic() + SIDECAR_MISMATCH_RETRY_SECONDS
+    _sidecar["mismatches"] += 1
+
+
+def warm_up() -> bool:
+    """
+    Get encoding ready at boot
+    In sidecar mode only check the sidecar, the whole point is to not load
+    the model in this process. A sidecar serving another model id is not
+    used, the local model is warmed up instead.
+    Raises ValueError if EMBED_PROJECTION_PATH holds a projection fitted on
+    another model, so a stale config fails the boot, not every request
+    """
+    mismatch = projection_mismatch()
+    if mismatch is not None:
+        raise ValueError(f"{mismatch}, refit it or unset EMBED_PROJECTION_PATH")
+    sidecar = get_sidecar()
+    if sidecar is not None:
+        try:
+            header = sidecar.ping()
+        except (OSError, ConnectionError, RuntimeError, ValueError) as e:
+            print(f"WARNING: embedding sidecar not reachable at boot: {e}")
+            return False
+        if header.get("model_id") == model_id():
+            print(f"DEBUG: embedding sidecar up, serving {header.get('model_id')}")
+            return True
+        _sidecar_mismatch(SidecarModelMismatch(header.get("model_id"), model_id()))
+    return get_backend().warm_up()
+
+
+def encode_stats() -> dict:
+    """
+    Encoding metrics of this worker: batching (queue depth, batch size
+    histograms), per length bucket timing, thread settings, model startup
+    timings and sidecar fallbacks / model id mismatches
+    """
+    stats = {
+        "sidecar": get_sidecar() is not None,
+        "sidecar_fallbacks": _sidecar["fallbacks"],
+        "sidecar_mismatches": _sidecar["mismatches"],
+    }
+    batcher = get_batcher()
+    if batcher is None:
+        stats["batching"] = False
+    else:
+        stats["batching"] = True
+        stats.update(batcher.stats())
+    bucketer = get_bucketer()
+    if bucketer is not None:
+        stats["length_buckets"] = bucketer.stats()
+    stats["threads"] = thread_governor.status()
+    stats["startup"] = model_registry.startup_timings
+    return stats
@@ -0,0 +1,190 @@
+"""
+Global content-addressed vector store, shared by every user
+
+Lots of lines are identical across users ("Python, Java, SQL", course names,
+tool lists). Before anything is encoded, the normalized text is hashed and
+looked up in global_vecs; only texts nobody has had before are encoded, and
+those are added for everyone else.
+
+Key: sha256 of the normalized content_str + model id. The table has no uid
+and no timestamps, so it cannot tell who owns a line or when it was added.
+Writers only ever insert (ON CONFLICT DO NOTHING, in hash order), the same
+key always maps to the same vector, so concurrent writers are safe.
+
+Table (see README, created by vec_migrate tables):
+global_vecs (content_hash, model_id, encoding, vec BYTEA)
+Without the table the store turns itself off (see dbconn.TableCheck),
+texts are then just encoded.
+
+Sample usage:
+store = GlobalVecStore(database)
+vecs = store.encode(texts)  # same as encoder.encode_texts, minus known texts
+print(global_vecs.worker_stats(), global_vecs.store_stats(database))
+
+GLOBAL_VECS=0 turns the store off (plain encoder.encode_texts).
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ..db_helper.dbconn import DBConn, TableCheck
+from . import encoder
+from . import vec_codec
+
+# store_stats runs count(*) scans, its answer is reused for this long
+STORE_STATS_TTL_S = 60.0
+
+# Per worker counters, see worker_stats
+_counters = {"lookups": 0, "hits": 0, "inserted": 0, "errors": 0}
+_counters_lock = threading.Lock()
+_table = TableCheck("global_vecs")
+_stats_cache = {}  # model_id -> (time, store_stats result)
+
+
+def normalize_content(content_str: str) -> str:
+    """
+    Unicode NFC, whitespace collapsed and trimmed
+    Case is kept, cased models embed "Go" and "go" differently
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", content_str or "")).strip()
+
+
+def global_hash(content_str: str) -> str:
+    """
+    Key of a text in the global store
+    """
+    return hashlib.sha256(normalize_content(content_str).encode("utf-8")).hexdigest()
+
+
+def is_enabled() -> bool:
+    """
+    GLOBAL_VECS, on by default
+    """
+    load_dotenv()
+    return os.getenv("GLOBAL_VECS", "1") != "0"
+
+
+def table_ready(database: DBConn) -> bool:
+    """
+    Whether global_vecs exists, see TableCheck
+    """
+    return _table.ready(database)
+
+
+def _count(**deltas) -> None:
+    with _counters_lock:
+        for name, delta in deltas.items():
+            _counters[name] += delta
+
+
+class GlobalVecStore:
+    """
+    encode(texts): vectors from the global store where known, encoded
+    (and shared) otherwise
+    Database errors never fail the caller, texts are then just encoded
+    """
+
+    def __init__(self, database: DBConn) -> None:
+        self.database = database
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Normalized embeddings of texts, shape (N, D), like encoder.encode_texts
+        """
+        if not texts or not is_enabled() or not table_ready(self.database):
+            return encoder.encode_texts(texts)
+        model_id = encoder.model_id()
+        hashes = [global_hash(text) for text in texts]
+        try:
+            found = self.database.fetch_global_vecs(model_id, sorted(set(hashes)))
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: global vector store unavailable: {e}")
+            _count(errors=1)
+            return encoder.encode_texts(texts)
+        known = {
+            content_hash: vec_codec.from_bytes(vec_bytes, encoding)
+            for content_hash, (encoding, vec_bytes) in found.items()
+        }
+        # Encode every unknown text once, even if it shows up several times
+        unknown = {}  # content_hash -> normalized text
+        for text, content_hash in zip(texts, hashes):
+            if content_hash not in known:
+                unknown.setdefault(content_hash, normalize_content(text))
+        if unknown:
+            new_vecs = encoder.encode_texts(list(unknown.values()))
+            encoding = vec_codec.default_encoding()
+            to_store = {}
+            for content_hash, vec in zip(unknown, new_vecs):
+                known[content_hash] = vec
+                to_store[content_hash] = vec_codec.to_bytes(vec, encoding)
+            try:
+                if self.database.insert_global_vecs(model_id, to_store, encoding):
+                    _count(inserted=len(to_store))
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"WARNING: could not add to the global vector store: {e}")
+                _count(errors=1)
+        hits = sum(1 for content_hash in hashes if content_hash in found)
+        _count(lookups=len(texts), hits=hits)
+        print(f"DEBUG: global vector store: {hits} of {len(texts)} texts already known")
+        return np.vstack([known[content_hash] for content_hash in hashes])
+
+
+def worker_stats() -> dict:
+    """
+    This worker's lookups, hits (texts not encoded thanks to the store),
+    inserted vectors and errors
+    """
+    with _counters_lock:
+        stats = dict(_counters)
+    stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+    return stats
+
+
+def store_stats(database: DBConn, model_id: str = None) -> dict:
+    """
+    Size of the store and how much it deduplicates, for one model
+    - vectors: distinct texts stored
+    - table_bytes: on disk size of global_vecs (all models, with indexes)
+    - line_refs: per-user line vectors (line_vecs rows) for the model
+    - dedup_ratio: line_refs / vectors, how many user lines share a vector
+    Counting scans both tables, so the answer is reused for STORE_STATS_TTL_S
+    """
+    model_id = model_id or encoder.model_id()
+    cached = _stats_cache.get(model_id)
+    if cached is not None and time.monotonic() - cached[0] < STORE_STATS_TTL_S:
+        return cached[1]
+    if not table_ready(database):
+        return {"model_id": model_id, "error": "global_vecs table missing"}
+    try:
+        rows = database.run_sql(
+            """
+            SELECT
+                (SELECT count(*) FROM global_vecs WHERE model_id = %s) AS vectors,
+                (SELECT pg_total_relation_size('global_vecs')) AS table_bytes,
+                (SELECT count(*) FROM line_vecs WHERE model_id = %s) AS line_refs;
+            """,
+            (model_id, model_id),
+        )
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"WARNING: global vector store stats failed: {e}")
+        rows = []
+    if not rows:
+        return {"model_id": model_id, "error": "store not reachable"}
+    row = rows[0]
+    vectors, line_refs = int(row["vectors"]), int(row["line_refs"])
+    stats = {
+        "model_id": model_id,
+        "vectors": vectors,
+        "table_bytes": int(row["table_bytes"]),
+        "line_refs": line_refs,
+        "dedup_ratio": round(line_refs / vectors, 3) if vectors else 0.0,
+    }
+    _stats_cache[model_id] = (time.monotonic(), stats)
+    return stats
@@ -0,0 +1,136 @@
+"""
+Length-bucketed encoding
+
+Texts are tokenized first, sorted by token length and split into buckets
+(e.g. <=32, <=64, <=128, longer). Each bucket is encoded in batches of its own
+size, so a short skill list is never padded to the length of a long bullet
+point and short texts can go through in bigger batches. The vectors are put
+back in the original order.
+
+Buckets come from ENCODE_BUCKETS as max_tokens:batch_size pairs, e.g.
+"32:128,64:64,128:32,256:16". Texts longer than the last bound go in the last
+bucket (they are truncated to max_seq_length by the backend anyway).
+
+Sample usage:
+bucketer = LengthBucketer(backend.token_lengths, backend.encode_batch,
+                          parse_buckets("32:128,64:64,128:32"))
+vecs = bucketer.encode(texts)
+print(bucketer.stats())  # per bucket texts, batches, ms per text
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+def parse_buckets(spec: str) -> list[tuple[int, int]]:
+    """
+    "32:128,64:64" -> [(32, 128), (64, 64)], sorted by max tokens
+    Raises ValueError on a malformed spec
+    """
+    buckets = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        max_tokens, batch_size = part.split(":")
+        buckets.append((int(max_tokens), int(batch_size)))
+    if not buckets or any(size <= 0 for _, size in buckets):
+        raise ValueError(f"bad bucket spec {spec!r}, expected max_tokens:batch_size,...")
+    return sorted(buckets)
+
+
+class LengthBucketer:
+    """
+    Wraps a backend's encode_batch with length bucketing
+    - token_lengths_fn(texts) -> token count of each text (after truncation)
+    - encode_batch_fn(texts) -> normalized vectors of exactly these texts as one batch
+    - buckets: [(max_tokens, batch_size), ...]
+    Thread safe, timing is accumulated per bucket for stats()
+    """
+
+    def __init__(self, token_lengths_fn, encode_batch_fn, buckets: list[tuple[int, int]]):
+        self.token_lengths_fn = token_lengths_fn
+        self.encode_batch_fn = encode_batch_fn
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # bucket label -> {"texts", "batches", "tokens", "seconds"}
+        self.timings = {self._label(i): self._empty() for i in range(len(buckets))}
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"texts": 0, "batches": 0, "tokens": 0, "seconds": 0.0}
+
+    def _label(self, index: int) -> str:
+        if index == len(self.buckets) - 1:
+            return f">{self.buckets[index - 1][0]}" if index else "all"
+        return f"<={self.buckets[index][0]}"
+
+    def _bucket_index(self, length: int) -> int:
+        for index, (max_tokens, _) in enumerate(self.buckets[:-1]):
+            if length <= max_tokens:
+                return index
+        return len(self.buckets) - 1
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Normalized embeddings in the order of texts, shape (N, D)
+        """
+        if not texts:
+            return self.encode_batch_fn(texts)
+        lengths = self.token_lengths_fn(texts)
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        groups = {}  # bucket index -> text indices, shortest first
+        for i in order:
+            groups.setdefault(self._bucket_index(lengths[i]), []).append(i)
+        result = None
+        for index, members in sorted(groups.items()):
+            batch_size = self.buckets[index][1]
+            t0 = time.perf_counter()
+            batches = 0
+            for start in range(0, len(members), batch_size):
+                chunk = members[start : start + batch_size]
+                vecs = self.encode_batch_fn([texts[i] for i in chunk])
+                if result is None:
+                    result = np.empty((len(texts), vecs.shape[1]), dtype=vecs.dtype)
+                result[chunk] = vecs
+                batches += 1
+            self._record(index, members, lengths, batches, time.perf_counter() - t0)
+        return result
+
+    def _record(self, index, members, lengths, batches, seconds) -> None:
+        with self.lock:
+            timing = self.timings[self._label(index)]
+            timing["texts"] += len(members)
+            timing["batches"] += batches
+            timing["tokens"] += sum(lengths[i] for i in members)
+            timing["seconds"] += seconds
+
+    def stats(self) -> dict:
+        """
+        Per bucket: batch size, texts, batches, average tokens, ms per text
+        """
+        with self.lock:
+            report = {}
+            for index, (_, batch_size) in enumerate(self.buckets):
+                timing = self.timings[self._label(index)]
+                texts = timing["texts"]
+                report[self._label(index)] = {
+                    "batch_size": batch_size,
+                    "texts": texts,
+                    "batches": timing["batches"],
+                    "avg_tokens": timing["tokens"] / texts if texts else 0.0,
+                    "ms_per_text": timing["seconds"] * 1000.0 / texts if texts else 0.0,
+                    "seconds": timing["seconds"],
+                }
+            return report
+
+    def reset_stats(self) -> None:
+        """
+        Start timing from scratch, e.g. between benchmark runs
+        """
+        with self.lock:
+            self.timings = {
+                self._label(i): self._empty() for i in range(len(self.buckets))
+            }
@@ -0,0 +1,270 @@
+"""
+Process-wide registry for the sentence transformer models used in scoring
+Each configured model is loaded once per worker and shared by every line_eval call
+
+Sample usage:
+from ..embed_helper.model_registry import model_registry
+model = model_registry.get_model()  # defaults to OPT_MODEL_PATH
+vecs = model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+model_registry.unload_model()  # only under memory pressure
+
+EMBED_MAX_SEQ_LENGTH overrides the token limit of the models (long job
+descriptions are truncated there).
+OPT_MODEL_SNAPSHOT points at a memory-mapped snapshot of OPT_MODEL_PATH for fast
+cold starts (model_snapshot.py), startup_timings has import / weight map /
+first encode times.
+OPT_MODEL_QUANTIZE=int8 loads the models with dynamic int8 linear layers (CPU),
+see segment_tests/quant_test.py for how close the rankings stay to fp32.
+
+Note: loading is lazy, warm_up() should be called once at boot so the first
+request does not pay for it. Under gunicorn with EMBED_PRELOAD=1 that happens
+once in the master and freeze_for_fork() lets every worker share the weights.
+"""
+
+import gc
+import os
+import threading
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+
+class ModelRegistry:
+    """
+    Holds one SentenceTransformer per model path
+    - get_model: load if needed, then hand out the shared instance
+    - warm_up: load + run a dummy encode for every configured model
+    - unload_model / unload_all: drop models to free memory
+    Thread safe: concurrent first calls only load the model once
+    """
+
+    WARM_UP_TEXTS = ["warm up the sentence transformer"]
+
+    def __init__(self) -> None:
+        self.models = {}  # dict of model_path -> SentenceTransformer
+        self.lock = threading.Lock()
+        # model_path -> import_s, weight_map_s (or load_s), first_encode_s, source
+        self.startup_timings = {}
+
+    def default_model_path(self) -> str:
+        """
+        The model path configured for scoring
+        """
+        load_dotenv()
+        return os.getenv("OPT_MODEL_PATH")
+
+    def model_id(self, model_path: str = None) -> str:
+        """
+        Identifier stored next to every cached vector
+        Vectors with a different id are treated as stale and re-encoded
+        Bump OPT_MODEL_VERSION when the files behind a path change
+        """
+        if model_path is None:
+            model_path = self.default_model_path()
+        version = os.getenv("OPT_MODEL_VERSION")
+        model_id = f"{model_path}@{version}" if version else str(model_path)
+        # Truncating at another length changes the vectors of long texts
+        max_seq_length = self.max_seq_length()
+        if max_seq_length:
+            model_id += f"#seq{max_seq_length}"
+        return model_id
+
+    def max_seq_length(self) -> int:
+        """
+        Token limit from EMBED_MAX_SEQ_LENGTH, None keeps the model's own
+        """
+        load_dotenv()
+        value = os.getenv("EMBED_MAX_SEQ_LENGTH", "").strip()
+        return int(value) if value else None
+
+    def configured_model_paths(self) -> list[str]:
+        """
+        All model paths to keep loaded: OPT_MODEL_PATH and optionally
+        OPT_EXTRA_MODEL_PATHS (comma separated)
+        """
+        load_dotenv()
+        paths = [self.default_model_path()]
+        extra = os.getenv("OPT_EXTRA_MODEL_PATHS", "")
+        for path in extra.split(","):
+            path = path.strip()
+            if path and path not in paths:
+                paths.append(path)
+        return [path for path in paths if path]
+
+    def get_model(self, model_path: str = None):
+        """
+        Returns the shared model for model_path, loading it on first use
+        Raises if the model cannot be loaded
+        """
+        if model_path is None:
+            model_path = self.default_model_path()
+        model = self.models.get(model_path)
+        if model is not None:
+            return model
+        with self.lock:
+            # Another thread may have loaded it while we waited
+            if model_path not in self.models:
+                self.models[model_path] = self._load_model(model_path)
+            return self.models[model_path]
+
+    def _load_model(self, model_path: str):
+        """
+        Actually load the model, torch is only imported here
+        From the OPT_MODEL_SNAPSHOT snapshot (memory mapped, see model_snapshot.py)
+        when there is a usable one for this path
+        """
+        timings = {}
+        t0 = time.perf_counter()
+        # pylint: disable=import-outside-toplevel
+        from sentence_transformers import SentenceTransformer
+        from . import model_snapshot
+
+        timings["import_s"] = time.perf_counter() - t0
+        quantization = self.quantization()
+        snapshot_path = model_snapshot.default_snapshot_path()
+        t0 = time.perf_counter()
+        if (
+            snapshot_path
+            and model_path == self.default_model_path()
+            and model_snapshot.is_usable(snapshot_path, model_path)
+        ):
+            model = model_snapshot.load(snapshot_path, timings)
+            timings["source"] = snapshot_path
+        else:
+            # Quantized linear layers only run on CPU
+            model = SentenceTransformer(model_path, device="cpu" if quantization else None)
+            timings["load_s"] = time.perf_counter() - t0
+            timings["source"] = model_path
+        print(f"DEBUG: Model loaded from {timings['source']} in {time.perf_counter() - t0:.3f}s")
+        max_seq_length = self.max_seq_length()
+        if max_seq_length:
+            model.max_seq_length = max_seq_length
+        if quantization == "int8":
+            model = self.quantize_model(model)
+            print(f"DEBUG: Model {model_path} quantized to dynamic int8")
+        self.startup_timings[model_path] = timings
+        return model
+
+    def quantization(self) -> str:
+        """
+        Opt-in quantized mode from OPT_MODEL_QUANTIZE: "int8" or None (fp32)
+        """
+        load_dotenv()
+        mode = os.getenv("OPT_MODEL_QUANTIZE", "").strip().lower() or None
+        if mode not in (None, "int8"):
+            raise ValueError(f"OPT_MODEL_QUANTIZE must be int8 or empty, got {mode}")
+        return mode
+
+    @staticmethod
+    def quantize_model(model):
+        """
+        Dynamic int8 quantization of every nn.Linear (CPU only)
+        Weights are stored as int8, activations are quantized on the fly
+        """
+        import torch  # pylint: disable=import-outside-toplevel
+
+        model.eval()
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    def warm_up(self, model_paths: list[str] = None) -> bool:
+        """
+        Load every configured model and run a dummy encode on it
+        Returns True if all models are ready
+        """
+        if model_paths is None:
+            model_paths = self.configured_model_paths()
+        all_ready = True
+        for model_path in model_paths:
+            try:
+                t0 = datetime.now()
+                model = self.get_model(model_path)
+                t1 = time.perf_counter()
+                model.encode(
+                    self.WARM_UP_TEXTS,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                )
+                timings = self.startup_timings.setdefault(model_path, {})
+                timings.setdefault("first_encode_s", time.perf_counter() - t1)
+                print(
+                    f"DEBUG: Model {model_path} warmed up in {datetime.now() - t0} "
+                    f"(startup: {timings})"
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"ERROR: failed to warm up model {model_path}: {e}")
+                all_ready = False
+        return all_ready
+
+    def freeze_for_fork(self) -> int:
+        """
+        Call in the gunicorn master after loading, right before workers fork
+        Puts every model in inference mode (no autograd state is ever written
+        to the weights) and moves all live objects to gc's permanent generation,
+        so collections in the workers do not touch, and thereby copy, the
+        pages shared with the master
+        Returns the number of frozen objects
+        """
+        with self.lock:
+            for model in self.models.values():
+                model.eval()
+                for param in model.parameters():
+                    param.requires_grad_(False)
+        gc.collect()
+        gc.freeze()
+        print(
+            f"DEBUG: {len(self.models)} model(s) frozen for fork, "
+            f"{gc.get_freeze_count()} objects moved to the permanent generation"
+        )
+        return gc.get_freeze_count()
+
+    def is_loaded(self, model_path: str = None) -> bool:
+        """
+        Whether the model is currently held in memory
+        """
+        if model_path is None:
+            model_path = self.default_model_path()
+        return model_path in self.models
+
+    def unload_model(self, model_path: str = None) -> bool:
+        """
+        Drop the model so its memory can be reclaimed
+        The next get_model call will load it again
+        Returns False if the model was not loaded
+        """
+        if model_path is None:
+            model_path = self.default_model_path()
+        with self.lock:
+            model = self.models.pop(model_path, None)
+        if model is None:
+            return False
+        del model
+        self._release_memory()
+        print(f"DEBUG: Model {model_path} unloaded")
+        return True
+
+    def unload_all(self) -> None:
+        """
+        Drop every loaded model
+        """
+        with self.lock:
+            self.models.clear()
+        self._release_memory()
+
+    def _release_memory(self) -> None:
+        """
+        Give freed tensors back to the system
+        """
+        try:
+            import torch  # pylint: disable=import-outside-toplevel
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        gc.collect()
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,235 @@
+"""
+Memory-mapped model snapshots for fast cold starts
+
+A snapshot is a folder prepared once from OPT_MODEL_PATH:
+- weights.safetensors: every parameter and buffer of the sentence transformer
+- skeleton.pt: the module tree with weights on the meta device (no data)
+- manifest.json: source model path, library versions, tensor aliases
+
+Loading unpickles the skeleton (no weights read), maps weights.safetensors
+with a copy-on-write mmap and points every parameter at its slice of the
+mapping. Pages are only read when first touched and are shared through the
+page cache by every worker on the host. Nothing is copied.
+
+The skeleton is a pickle, only load snapshots prepared by this script.
+A snapshot is ignored (normal load) if it was made from another model path
+or with other torch / transformers / sentence_transformers versions.
+
+Usage (from repo root):
+python -m backend.src.embed_helper.model_snapshot prepare [output_dir]
+Then set OPT_MODEL_SNAPSHOT=output_dir, see model_registry._load_model
+"""
+
+import copy
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from dotenv import load_dotenv
+
+SKELETON_FILE = "skeleton.pt"
+WEIGHTS_FILE = "weights.safetensors"
+MANIFEST_FILE = "manifest.json"
+
+
+def default_snapshot_path() -> str:
+    """
+    Configured snapshot folder (OPT_MODEL_SNAPSHOT), None if unset
+    """
+    load_dotenv()
+    return os.getenv("OPT_MODEL_SNAPSHOT") or None
+
+
+def library_versions() -> dict:
+    """
+    Versions the skeleton pickle depends on
+    """
+    # pylint: disable=import-outside-toplevel
+    import sentence_transformers
+    import torch
+    import transformers
+
+    return {
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "sentence_transformers": sentence_transformers.__version__,
+    }
+
+
+def _named_tensors(model) -> list:
+    """
+    (name, tensor) of every parameter and buffer, including non-persistent
+    buffers and every name of a shared tensor
+    """
+    tensors = list(model.named_parameters(remove_duplicate=False))
+    tensors += list(model.named_buffers(remove_duplicate=False))
+    return tensors
+
+
+def prepare(model_path: str, output_dir: str) -> dict:
+    """
+    Write a snapshot of model_path to output_dir, returns the manifest
+    """
+    # pylint: disable=import-outside-toplevel
+    from safetensors.torch import save_file
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_path, device="cpu")
+    model.eval()
+    weights = {}
+    aliases = {}  # name -> name the data is stored under (shared tensors)
+    stored_by_ptr = {}
+    for name, tensor in _named_tensors(model):
+        key = (tensor.data_ptr(), tensor.dtype, tuple(tensor.shape))
+        if key in stored_by_ptr:
+            aliases[name] = stored_by_ptr[key]
+            continue
+        stored_by_ptr[key] = name
+        weights[name] = tensor.detach().contiguous()
+    os.makedirs(output_dir, exist_ok=True)
+    save_file(weights, os.path.join(output_dir, WEIGHTS_FILE))
+
+    import torch  # pylint: disable=import-outside-toplevel
+
+    skeleton = copy.deepcopy(model).to("meta")
+    torch.save(skeleton, os.path.join(output_dir, SKELETON_FILE))
+    manifest = {
+        "model_path": model_path,
+        "versions": library_versions(),
+        "aliases": aliases,
+        "tensors": len(weights),
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def is_usable(snapshot_path: str, model_path: str) -> bool:
+    """
+    Whether the snapshot was made from model_path with the installed libraries
+    """
+    manifest_path = os.path.join(snapshot_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        print(f"WARNING: no model snapshot at {snapshot_path}")
+        return False
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("model_path") != model_path:
+        print(f"WARNING: snapshot {snapshot_path} is of {manifest.get('model_path')}")
+        return False
+    if manifest.get("versions") != library_versions():
+        print(f"WARNING: snapshot {snapshot_path} was made with other library versions")
+        return False
+    return True
+
+
+def _map_weights(weights_path: str) -> dict:
+    """
+    name -> tensor backed by a copy-on-write mmap of the safetensors file
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+
+    dtypes = {
+        "F32": torch.float32,
+        "F16": torch.float16,
+        "BF16": torch.bfloat16,
+        "F64": torch.float64,
+        "I64": torch.int64,
+        "I32": torch.int32,
+        "I8": torch.int8,
+        "U8": torch.uint8,
+        "BOOL": torch.bool,
+    }
+    with open(weights_path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        # ACCESS_COPY: writable views, pages stay shared until written
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = dtypes[info["dtype"]]
+        start, end = info["data_offsets"]
+        count = (end - start) // dtype.itemsize
+        if count == 0:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        tensors[name] = torch.frombuffer(
+            mapping, dtype=dtype, count=count, offset=data_start + start
+        ).reshape(info["shape"])
+    return tensors
+
+
+def _assign(model, name: str, tensor) -> None:
+    """
+    Replace the meta parameter / buffer called name with tensor
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+
+    module_path, _, leaf = name.rpartition(".")
+    module = model.get_submodule(module_path) if module_path else model
+    if leaf in module._parameters:  # pylint: disable=protected-access
+        module._parameters[leaf] = torch.nn.Parameter(  # pylint: disable=protected-access
+            tensor, requires_grad=False
+        )
+    else:
+        module._buffers[leaf] = tensor  # pylint: disable=protected-access
+
+
+def load(snapshot_path: str, timings: dict = None):
+    """
+    SentenceTransformer from a snapshot, on CPU
+    timings (optional dict) gets skeleton_s and weight_map_s
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+
+    with open(os.path.join(snapshot_path, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    t0 = time.perf_counter()
+    # Our own pickle, see the module docstring
+    model = torch.load(os.path.join(snapshot_path, SKELETON_FILE), weights_only=False)
+    t1 = time.perf_counter()
+    tensors = _map_weights(os.path.join(snapshot_path, WEIGHTS_FILE))
+    for name, tensor in tensors.items():
+        _assign(model, name, tensor)
+    for name, target in manifest["aliases"].items():
+        _assign(model, name, tensors[target])
+    t2 = time.perf_counter()
+    leftover = [name for name, tensor in _named_tensors(model) if tensor.is_meta]
+    if leftover:
+        raise RuntimeError(f"snapshot {snapshot_path} is missing tensors: {leftover[:5]}")
+    model.eval()
+    if timings is not None:
+        timings["skeleton_s"] = t1 - t0
+        timings["weight_map_s"] = t2 - t1
+    return model
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "prepare":
+        raise SystemExit("Usage: model_snapshot prepare [output_dir]")
+    load_dotenv()
+    source = os.getenv("OPT_MODEL_PATH")
+    target = sys.argv[2] if len(sys.argv) > 2 else default_snapshot_path()
+    if not source or not target:
+        raise SystemExit("Set OPT_MODEL_PATH and pass output_dir (or OPT_MODEL_SNAPSHOT)")
+    final_manifest = prepare(source, target)
+    print(f"Snapshot of {source} written to {target}: {final_manifest['tensors']} tensors")
+
+    # Check the snapshot encodes exactly like the source model
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    texts = ["Built REST APIs in Python", "Led a team of four engineers"]
+    expected = SentenceTransformer(source, device="cpu").encode(texts)
+    actual = load(target).encode(texts)
+    max_diff = float(np.abs(expected - actual).max())
+    print(f"Max difference against {source}: {max_diff:.2e}")
+    if max_diff > 1e-5:
+        raise SystemExit("ERROR: snapshot does not reproduce the model")
@@ -0,0 +1,73 @@
+"""
+Export the transformer of OPT_MODEL_PATH to ONNX for the onnx embedding backend
+
+Only the transformer is exported (token embeddings out), pooling and
+normalization are done by OnnxBackend. Checks the exported graph against
+SentenceTransformer.encode before returning.
+
+Usage (from repo root, needs torch and onnxruntime):
+python -m backend.src.embed_helper.onnx_export [output_path]
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from .model_registry import model_registry
+from .embed_backends import OnnxBackend
+
+CHECK_TEXTS = [
+    "Developed RESTful APIs with Flask on AWS.",
+    "Python, Java, SQL",
+    "Collaborated with UX designers to refine UI/UX, increasing user engagement by 15%",
+]
+
+
+def export(model_path: str = None, output_path: str = None, tolerance: float = 1e-3) -> str:
+    """
+    Write model.onnx and verify cosine scores match the torch model
+    Returns the output path
+    """
+    # pylint: disable=import-outside-toplevel
+    import torch
+
+    model_path = model_path or model_registry.default_model_path()
+    output_path = output_path or os.path.join(model_path, "onnx", "model.onnx")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    model = model_registry.get_model(model_path)
+    transformer = model[0].auto_model.eval()
+    tokens = model[0].tokenizer(CHECK_TEXTS, padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask"]
+    args = (tokens["input_ids"], tokens["attention_mask"])
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "seq"},
+        "attention_mask": {0: "batch", 1: "seq"},
+        "token_embeddings": {0: "batch", 1: "seq"},
+    }
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            args,
+            output_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+    print(f"ONNX model written to {output_path}")
+
+    torch_vecs = model.encode(
+        CHECK_TEXTS, normalize_embeddings=True, show_progress_bar=False
+    )
+    onnx_vecs = OnnxBackend(model_path, output_path).encode(CHECK_TEXTS)
+    max_diff = float(np.abs(torch_vecs @ torch_vecs.T - onnx_vecs @ torch_vecs.T).max())
+    print(f"Max cosine difference torch vs onnx: {max_diff:.2e}")
+    if max_diff > tolerance:
+        raise ValueError(f"ONNX export drifts from torch by {max_diff}, over {tolerance}")
+    return output_path
+
+
+if __name__ == "__main__":
+    export(output_path=sys.argv[1] if len(sys.argv) > 1 else None)
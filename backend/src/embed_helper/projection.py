@@ -0,0 +1,236 @@
+"""
+Optional PCA projection of embeddings to fewer dimensions
+
+Fitted offline on resume lines and job requirements, then applied to every
+vector right after encoding (encoder.encode_direct), so stored line vectors,
+cached requirement vectors and the line_vecs @ req_vecs.T product in
+line_eval all use the reduced dimension. Projected vectors are L2
+normalized again, so dot products stay cosine similarities.
+
+The projection is a .npz file (mean, components, source model id) loaded from
+EMBED_PROJECTION_PATH. Its tag (dimension + short hash) becomes part of
+encoder.model_id(), so full and projected vectors never mix in the caches.
+
+Usage (from repo root):
+python -m backend.src.embed_helper.projection fit <dim> <output.npz> [corpus.txt]
+Without corpus.txt the corpus is read from the database: every resume line
+in data.resumeinfo plus every requirement in req_cache.
+The fit holds out 20% of the corpus and prints the ranking fidelity report.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy.stats import spearmanr
+
+HOLDOUT_SHARE = 0.2
+
+_loaded = {"path": None, "projection": None}
+_lock = threading.Lock()
+
+
+class Projection:
+    """
+    vecs -> normalize((vecs - mean) @ components.T)
+    - mean: (D,) (zeros unless fitted centered), components: (d, D) principal
+      axes, largest variance first
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, source_model_id: str):
+        self.mean = mean.astype(np.float32)
+        self.components = components.astype(np.float32)
+        self.source_model_id = source_model_id
+
+    @property
+    def dim(self) -> int:
+        """
+        Output dimension
+        """
+        return self.components.shape[0]
+
+    def tag(self) -> str:
+        """
+        Short id of this exact projection, appended to the model id
+        """
+        digest = hashlib.sha256(self.components.tobytes()).hexdigest()[:8]
+        return f"pca{self.dim}-{digest}"
+
+    def apply(self, vecs: np.ndarray) -> np.ndarray:
+        """
+        Project (N, D) normalized vectors to (N, d) normalized vectors
+        """
+        reduced = (np.asarray(vecs, dtype=np.float32) - self.mean) @ self.components.T
+        norms = np.clip(np.linalg.norm(reduced, axis=1, keepdims=True), 1e-12, None)
+        return reduced / norms
+
+    def save(self, path: str) -> None:
+        """
+        Write the projection as .npz
+        """
+        np.savez(
+            path,
+            mean=self.mean,
+            components=self.components,
+            source_model_id=np.array(self.source_model_id),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Projection":
+        """
+        Read a projection written by save
+        """
+        with np.load(path) as data:
+            return cls(data["mean"], data["components"], str(data["source_model_id"]))
+
+
+def fit(vecs: np.ndarray, dim: int, source_model_id: str, center: bool = False) -> Projection:
+    """
+    Top dim principal axes of full-dimension vectors (rows)
+    Uncentered by default (truncated SVD): it keeps dot products, i.e. the
+    cosine scores line_eval uses, closer than centered PCA does
+    """
+    if not 0 < dim < min(vecs.shape):
+        raise ValueError(
+            f"dim must be between 1 and {min(vecs.shape) - 1} for {vecs.shape[0]} "
+            f"vectors of {vecs.shape[1]} dims"
+        )
+    mean = vecs.mean(axis=0) if center else np.zeros(vecs.shape[1], dtype=np.float32)
+    _, _, vt = np.linalg.svd(vecs - mean, full_matrices=False)
+    return Projection(mean, vt[:dim], source_model_id)
+
+
+def fidelity(line_vecs: np.ndarray, req_vecs: np.ndarray, projection: Projection,
+             top_k: int = 10) -> dict:
+    """
+    How much line ranking changes once projected, on full-dimension vectors
+    - line_spearman: rank correlation of the line_eval raw scores (max over
+      requirements), over all lines
+    - per_req_spearman: mean rank correlation of lines for each requirement
+    - top_k_overlap: share of the top_k lines (by line_eval score) kept
+    - max_score_diff: largest change of a raw cosine score
+    - bytes_per_vec: float32 bytes before and after
+    """
+    full = line_vecs @ req_vecs.T
+    reduced = projection.apply(line_vecs) @ projection.apply(req_vecs).T
+    full_scores, reduced_scores = full.max(axis=1), reduced.max(axis=1)
+    top_k = min(top_k, len(full_scores))
+    kept = set(np.argsort(-full_scores)[:top_k]) & set(np.argsort(-reduced_scores)[:top_k])
+    per_req = [
+        spearmanr(full[:, col], reduced[:, col]).correlation for col in range(full.shape[1])
+    ]
+    return {
+        "dim": projection.dim,
+        "line_spearman": float(spearmanr(full_scores, reduced_scores).correlation),
+        "per_req_spearman": float(np.mean(per_req)),
+        "top_k_overlap": len(kept) / float(top_k) if top_k else 1.0,
+        "max_score_diff": float(np.abs(full - reduced).max()),
+        "bytes_per_vec": (line_vecs.shape[1] * 4, projection.dim * 4),
+    }
+
+
+def get_projection() -> Projection:
+    """
+    The projection configured by EMBED_PROJECTION_PATH, None if unset
+    """
+    load_dotenv()
+    path = os.getenv("EMBED_PROJECTION_PATH") or None
+    if path != _loaded["path"]:
+        with _lock:
+            if path != _loaded["path"]:
+                _loaded["projection"] = Projection.load(path) if path else None
+                _loaded["path"] = path
+                if path:
+                    print(f"DEBUG: embedding projection {_loaded['projection'].tag()} loaded")
+    return _loaded["projection"]
+
+
+def corpus_from_database() -> tuple[list[str], list[str]]:
+    """
+    (resume lines, requirements) of every user and cached job description
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..db_helper.dbconn import DBConn
+    from .vec_fill import resume_line_texts
+    from .vec_migrate import iter_rows
+
+    database = DBConn()
+    try:
+        lines = set()
+        for _, resumeinfo in iter_rows(database, 200):
+            lines.update(text for text in resume_line_texts(resumeinfo) if text)
+        requirements = set()
+        for row in database.run_sql("SELECT requirements FROM req_cache;") or []:
+            value = row["requirements"]
+            requirements.update(json.loads(value) if isinstance(value, str) else value)
+    finally:
+        database.close()
+    return sorted(lines), sorted(requirements)
+
+
+def holdout_cuts(line_count: int, req_count: int) -> tuple[int, int]:
+    """
+    How many lines and requirements fit_and_report trains on
+    """
+    line_cut = int(line_count * (1 - HOLDOUT_SHARE))
+    req_cut = max(1, int(req_count * (1 - HOLDOUT_SHARE)))
+    return line_cut, req_cut
+
+
+def max_fit_dim(line_count: int, req_count: int, extra_count: int, full_dim: int) -> int:
+    """
+    Largest dim fit_and_report can fit for a corpus of this size
+    """
+    line_cut, req_cut = holdout_cuts(line_count, req_count)
+    return min(line_cut + req_cut + extra_count, full_dim) - 1
+
+
+def fit_and_report(
+    lines: list[str], requirements: list[str], dim: int, extra_texts: list[str] = None
+) -> tuple:
+    """
+    Encode the corpus at full dimension, fit on 80%, report on the held-out 20%
+    extra_texts are only fitted on, for corpora with fewer rows than dims
+    Returns (projection, report)
+    """
+    # pylint: disable=import-outside-toplevel
+    from .embed_backends import get_backend
+
+    backend = get_backend()
+    rng = np.random.default_rng(0)
+    line_vecs = backend.encode(lines)
+    req_vecs = backend.encode(requirements)
+    line_order = rng.permutation(len(lines))
+    req_order = rng.permutation(len(requirements))
+    line_cut, req_cut = holdout_cuts(len(lines), len(requirements))
+    train = [line_vecs[line_order[:line_cut]], req_vecs[req_order[:req_cut]]]
+    if extra_texts:
+        train.append(backend.encode(extra_texts))
+    train = np.vstack(train)
+    projection = fit(train, dim, backend.model_id())
+    held_out_reqs = req_order[req_cut:] if req_cut < len(requirements) else req_order
+    report = fidelity(line_vecs[line_order[line_cut:]], req_vecs[held_out_reqs], projection)
+    return projection, report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != "fit":
+        raise SystemExit("Usage: projection fit <dim> <output.npz> [corpus.txt]")
+    arg_dim, output_path = int(sys.argv[2]), sys.argv[3]
+    if len(sys.argv) > 4:
+        # Plain text corpus: one text per row, requirements after a line "---"
+        with open(sys.argv[4], encoding="utf-8") as f:
+            rows = [row.strip() for row in f if row.strip()]
+        split_at = rows.index("---") if "---" in rows else len(rows)
+        corpus_lines, corpus_reqs = rows[:split_at], rows[split_at + 1 :] or rows[:split_at]
+    else:
+        corpus_lines, corpus_reqs = corpus_from_database()
+    print(f"Fitting on {len(corpus_lines)} lines and {len(corpus_reqs)} requirements")
+    final_projection, final_report = fit_and_report(corpus_lines, corpus_reqs, arg_dim)
+    final_projection.save(output_path)
+    print(f"Projection {final_projection.tag()} written to {output_path}")
+    print("Held-out fidelity:", json.dumps(final_report))
@@ -0,0 +1,257 @@
+"""
+Resumable background re-embedding of every stored resume line
+
+After a model rollout (OPT_MODEL_PATH, quantization, projection or backend
+change) encoder.model_id() changes and every line_vecs row is stale. This job
+walks data through a server-side cursor (uid order), finds the lines of each
+user without a vector for the current model id, encodes them in large
+batches across many users (lines other users share are encoded once, through
+the global store) and writes them back with one bulk transaction per batch.
+Users then find warm vectors on their first generation.
+
+Progress is checkpointed to a JSON file after every written batch (last
+fully written uid + counters), a rerun continues from there. Ctrl-C is safe
+at any time. Old model vectors are left alone.
+
+Usage (from repo root):
+python -m backend.src.embed_helper.reembed_job [--batch-lines N]
+    [--max-lines-per-s X] [--max-seconds S] [--checkpoint path] [--restart]
+Defaults: REEMBED_BATCH_LINES (512), REEMBED_MAX_LINES_PER_S (no limit),
+REEMBED_CHECKPOINT (reembed_checkpoint.json)
+"""
+
+import argparse
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+from ..db_helper.dbconn import DBConn
+from . import encoder
+from . import vec_cache
+from . import vec_codec
+from .global_vecs import GlobalVecStore
+from .vec_fill import resume_line_texts
+
+USER_GROUP = 200  # users whose stored hashes are fetched in one query
+
+
+def default_settings() -> dict:
+    """
+    batch_lines, max_lines_per_s and checkpoint_path from the environment
+    """
+    load_dotenv()
+    max_rate = os.getenv("REEMBED_MAX_LINES_PER_S")
+    return {
+        "batch_lines": int(os.getenv("REEMBED_BATCH_LINES", "512")),
+        "max_lines_per_s": float(max_rate) if max_rate else None,
+        "checkpoint_path": os.getenv("REEMBED_CHECKPOINT", "reembed_checkpoint.json"),
+    }
+
+
+def new_checkpoint(model_id: str) -> dict:
+    """
+    Progress of a job that has not started yet
+    """
+    return {
+        "model_id": model_id,
+        "last_uid": "",
+        "users": 0,
+        "lines_written": 0,
+        "elapsed_s": 0.0,
+        "done": False,
+    }
+
+
+def load_checkpoint(path: str, model_id: str) -> dict:
+    """
+    Saved progress for model_id, a new checkpoint if there is none
+    (or it belongs to another model id)
+    """
+    if not os.path.exists(path):
+        return new_checkpoint(model_id)
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("model_id") != model_id:
+        print(f"WARNING: checkpoint {path} is for {checkpoint.get('model_id')}, starting over")
+        return new_checkpoint(model_id)
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """
+    Write the checkpoint atomically (a crash never leaves half a file)
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ReembedJob:
+    """
+    One run of the re-embedding job, see the module docstring
+    run() returns the final report (the checkpoint plus lines_per_s)
+    """
+
+    def __init__(
+        self,
+        database: DBConn,
+        batch_lines: int = None,
+        max_lines_per_s: float = None,
+        checkpoint_path: str = None,
+    ) -> None:
+        settings = default_settings()
+        self.database = database
+        self.batch_lines = batch_lines or settings["batch_lines"]
+        self.max_lines_per_s = max_lines_per_s or settings["max_lines_per_s"]
+        self.checkpoint_path = checkpoint_path or settings["checkpoint_path"]
+        self.model_id = encoder.model_id()
+        self.global_store = GlobalVecStore(database)
+        self.checkpoint = None
+        self.pending = {}  # uid -> {line_hash: text}
+        self.pending_lines = 0
+        self.pending_users = 0
+        self.pending_last_uid = None
+        self.run_lines = 0  # lines written by this run, for the rate limit
+        self.run_start = None
+
+    def run(self, restart: bool = False, max_seconds: float = None) -> dict:
+        """
+        Walk every user after the checkpoint, returns the report
+        Stops early (resumable) after max_seconds
+        """
+        if restart:
+            self.checkpoint = new_checkpoint(self.model_id)
+        else:
+            self.checkpoint = load_checkpoint(self.checkpoint_path, self.model_id)
+        self.run_start = time.monotonic()
+        elapsed_before = self.checkpoint["elapsed_s"]
+        print(f"DEBUG: re-embedding for {self.model_id} after uid '{self.checkpoint['last_uid']}'")
+        rows = self.database.stream_sql(
+            "SELECT uid, resumeinfo FROM data WHERE uid > %s ORDER BY uid;",
+            (self.checkpoint["last_uid"],),
+        )
+        group = []
+        finished = True
+        try:
+            for row in rows:
+                resumeinfo = row["resumeinfo"]
+                if isinstance(resumeinfo, str):
+                    resumeinfo = json.loads(resumeinfo)
+                group.append((row["uid"], resume_line_texts(resumeinfo)))
+                if len(group) >= USER_GROUP:
+                    self._collect(group)
+                    group = []
+                if self.pending_lines >= self.batch_lines:
+                    if not self._flush(elapsed_before):
+                        finished = False
+                        break
+                if max_seconds is not None and time.monotonic() - self.run_start >= max_seconds:
+                    print("DEBUG: re-embedding time budget used up, stopping")
+                    finished = False
+                    break
+            if finished:
+                self._collect(group)
+                finished = self._flush(elapsed_before)
+        except KeyboardInterrupt:
+            print("WARNING: re-embedding interrupted, rerun to continue from the checkpoint")
+            finished = False
+        finally:
+            rows.close()
+        self.checkpoint["done"] = finished
+        save_checkpoint(self.checkpoint_path, self.checkpoint)
+        report = dict(self.checkpoint)
+        run_s = time.monotonic() - self.run_start
+        report["run_s"] = run_s
+        report["lines_per_s"] = self.run_lines / run_s if run_s > 0 else 0.0
+        print(f"DEBUG: re-embedding report: {report}")
+        return report
+
+    def _collect(self, group: list) -> None:
+        """
+        Queue the stale lines of a group of users (uid, texts)
+        """
+        if not group:
+            return
+        stored = self.database.fetch_line_vec_hashes_many(
+            [uid for uid, _ in group], self.model_id
+        )
+        for uid, texts in group:
+            known = stored.get(uid, set())
+            for text in texts:
+                line_hash = vec_cache.content_hash(text)
+                if line_hash not in known and line_hash not in self.pending.get(uid, {}):
+                    self.pending.setdefault(uid, {})[line_hash] = text
+                    self.pending_lines += 1
+        self.pending_users += len(group)
+        self.pending_last_uid = group[-1][0]
+
+    def _flush(self, elapsed_before: float) -> bool:
+        """
+        Encode and write every queued line, then move the checkpoint past
+        the collected users. Returns False if the write failed.
+        """
+        if self.pending_lines:
+            texts = list(
+                dict.fromkeys(text for lines in self.pending.values() for text in lines.values())
+            )
+            vec_by_text = dict(zip(texts, self.global_store.encode(texts)))
+            encoding = vec_codec.default_encoding()
+            vecs_by_uid = {
+                uid: {
+                    line_hash: vec_codec.to_bytes(vec_by_text[text], encoding)
+                    for line_hash, text in lines.items()
+                }
+                for uid, lines in self.pending.items()
+            }
+            if not self.database.upsert_line_vecs_many(self.model_id, vecs_by_uid, encoding):
+                print("ERROR: failed to write re-embedded vectors, checkpoint not moved")
+                return False
+        self.run_lines += self.pending_lines
+        if self.pending_last_uid is not None:
+            self.checkpoint["last_uid"] = self.pending_last_uid
+        self.checkpoint["users"] += self.pending_users
+        self.checkpoint["lines_written"] += self.pending_lines
+        run_s = time.monotonic() - self.run_start
+        self.checkpoint["elapsed_s"] = elapsed_before + run_s
+        save_checkpoint(self.checkpoint_path, self.checkpoint)
+        print(
+            f"DEBUG: re-embedded up to uid {self.checkpoint['last_uid']}: "
+            f"{self.checkpoint['users']} users, {self.checkpoint['lines_written']} lines, "
+            f"{self.run_lines / run_s if run_s > 0 else 0.0:.1f} lines/s"
+        )
+        self.pending, self.pending_lines, self.pending_users = {}, 0, 0
+        self.pending_last_uid = None
+        if self.max_lines_per_s:
+            # Sleep until this run is back under the rate limit
+            ahead_s = self.run_lines / self.max_lines_per_s - (time.monotonic() - self.run_start)
+            if ahead_s > 0:
+                time.sleep(ahead_s)
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-embed stale line vectors")
+    parser.add_argument("--batch-lines", type=int, default=None)
+    parser.add_argument("--max-lines-per-s", type=float, default=None)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint")
+    cli_args = parser.parse_args()
+    job_database = DBConn()
+    try:
+        final_report = ReembedJob(
+            job_database,
+            cli_args.batch_lines,
+            cli_args.max_lines_per_s,
+            cli_args.checkpoint,
+        ).run(cli_args.restart, cli_args.max_seconds)
+    finally:
+        job_database.close()
+    print(
+        f"{'Done' if final_report['done'] else 'Stopped'}: {final_report['users']} users, "
+        f"{final_report['lines_written']} lines written, "
+        f"{final_report['lines_per_s']:.1f} lines/s this run"
+    )
@@ -0,0 +1,172 @@
+"""
+Cache of parsed job requirements and their embeddings
+
+Regenerating against the same job description (e.g. after tweaking weights)
+skips both the LLM round trip and the requirement encode.
+Key: sha256 of the normalized job description + prompt version + LLM model
++ embedding model id, so changing any of them misses the cache.
+
+Two tiers:
+- memory: per-worker LRU, shared by every ReqCache object
+- postgres: req_cache table (optional, only when a database is given)
+Both expire entries after REQ_CACHE_TTL_HOURS and keep at most
+REQ_CACHE_MAX_ENTRIES, least recently used entries are evicted first.
+
+Table (see README, created by vec_migrate tables):
+req_cache (cache_key, requirements JSONB, encoding, dim, vecs BYTEA,
+    created_at, last_used)
+A failing postgres tier (e.g. no req_cache table) is logged and skipped, the
+requirements are then parsed and encoded as without a cache.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ..db_helper.dbconn import DBConn
+from . import vec_codec
+
+
+def normalize_job_req(job_req: str) -> str:
+    """
+    Whitespace and case changes should not miss the cache
+    """
+    return re.sub(r"\s+", " ", job_req or "").strip().lower()
+
+
+class ReqCache:
+    """
+    Usage:
+    req_cache = ReqCache(database)  # or ReqCache() for memory only
+    key = req_cache.make_key(job_req, prompt_version, llm_model, embed_model_id)
+    cached = req_cache.get(key)  # None or (requirements, req_vecs)
+    req_cache.put(key, requirements, req_vecs)
+    """
+
+    _memory = OrderedDict()  # key -> (created_at, requirements, req_vecs)
+    _lock = threading.Lock()
+
+    def __init__(self, database: DBConn = None) -> None:
+        load_dotenv()
+        self.database = database
+        self.ttl_seconds = float(os.getenv("REQ_CACHE_TTL_HOURS", "168")) * 3600
+        self.max_entries = int(os.getenv("REQ_CACHE_MAX_ENTRIES", "512"))
+
+    @staticmethod
+    def make_key(
+        job_req: str, prompt_version: str, llm_model: str, embed_model_id: str
+    ) -> str:
+        """
+        Cache key for one job description under one prompt/model setup
+        """
+        raw = "\n".join(
+            [normalize_job_req(job_req), str(prompt_version), llm_model, embed_model_id]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns (requirements, req_vecs) or None if missing/expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    print("DEBUG: requirement cache hit (memory)")
+                    return list(entry[1]), entry[2]
+                del self._memory[key]
+        if self.database is None:
+            return None
+        try:
+            rows = self.database.run_sql(
+                """
+                UPDATE req_cache SET last_used = now()
+                WHERE cache_key = %s AND created_at > now() - make_interval(secs => %s)
+                RETURNING requirements, encoding, dim, vecs, created_at;
+                """,
+                (key, self.ttl_seconds),
+            )
+            if not rows:
+                return None
+            row = rows[0]
+            requirements = row["requirements"]
+            if isinstance(requirements, str):
+                requirements = json.loads(requirements)
+            req_vecs = vec_codec.from_bytes(bytes(row["vecs"]), row["encoding"]).reshape(
+                -1, row["dim"]
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: requirement cache read failed: {e}")
+            return None
+        self._remember(key, row["created_at"].timestamp(), requirements, req_vecs)
+        print("DEBUG: requirement cache hit (postgres)")
+        return list(requirements), req_vecs
+
+    def put(self, key: str, requirements: list, req_vecs) -> None:
+        """
+        Store the parsed requirements and their embeddings in every tier
+        """
+        req_vecs = np.asarray(req_vecs, dtype=np.float32)
+        self._remember(key, time.time(), list(requirements), req_vecs)
+        if self.database is None:
+            return
+        try:
+            encoding = vec_codec.default_encoding()
+            self.database.run_sql(
+                """
+                INSERT INTO req_cache (cache_key, requirements, encoding, dim, vecs)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    requirements = EXCLUDED.requirements, encoding = EXCLUDED.encoding,
+                    dim = EXCLUDED.dim, vecs = EXCLUDED.vecs,
+                    created_at = now(), last_used = now();
+                """,
+                (
+                    key,
+                    json.dumps(list(requirements)),
+                    encoding,
+                    int(req_vecs.shape[1]),
+                    vec_codec.to_bytes(req_vecs, encoding),
+                ),
+            )
+            # Expired entries first, then everything past the LRU capacity
+            self.database.run_sql(
+                """
+                DELETE FROM req_cache
+                WHERE created_at < now() - make_interval(secs => %s)
+                   OR cache_key IN (
+                        SELECT cache_key FROM req_cache
+                        ORDER BY last_used DESC OFFSET %s
+                   );
+                """,
+                (self.ttl_seconds, self.max_entries),
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: requirement cache write failed: {e}")
+
+    def _remember(self, key: str, created_at: float, requirements: list, req_vecs) -> None:
+        """
+        Put an entry in the memory tier, evicting the least recently used
+        """
+        with self._lock:
+            self._memory[key] = (created_at, requirements, req_vecs)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        """
+        Drop the memory tier of this worker
+        """
+        with cls._lock:
+            cls._memory.clear()
@@ -0,0 +1,188 @@
+"""
+Local requirement bank, turns a job description into requirement sentences
+without the LLM
+
+The bank is every canonical requirement sentence of skill_taxonomy (about two
+thousand), embedded once with the current model and stored as a folder:
+- vecs.npy: (E, D) float32 normalized vectors, memory-mapped when loaded
+- entries.json: text / skill / category of every row
+- manifest.json: model id the vectors were made with, entry count, dim
+
+Fast mode (SkillBank.match):
+1. the job description is cut into segments (lines, bullets, sentences,
+   lists)
+2. segments are encoded and compared with every bank sentence
+3. every segment votes for its closest bank sentence, skills voted for
+   above SKILL_BANK_MIN_SIM are emitted best first, at most
+   SKILL_BANK_TOP_N, at least one soft skill like the AI prompt asks for
+
+Config (environment):
+- SKILL_BANK_PATH: bank folder, unset means no bank
+- REQ_MODE: default requirement mode, "ai" (default) or "bank", overridable
+  per request (resume_req req_mode)
+
+A bank made with another model id (model, quantization, projection, backend)
+is not used, requests then fall back to the AI parse.
+
+Usage (from repo root):
+python -m backend.src.embed_helper.skill_bank build [output_dir]
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from . import encoder
+from .skill_taxonomy import bank_entries
+
+VECS_FILE = "vecs.npy"
+ENTRIES_FILE = "entries.json"
+MANIFEST_FILE = "manifest.json"
+
+REQ_MODES = ("ai", "bank")
+SOFT_CATEGORIES = ("soft_skills", "soft_traits")
+
+_loaded = {"path": None, "bank": None}
+_lock = threading.Lock()
+
+
+def default_bank_path() -> str:
+    """
+    SKILL_BANK_PATH, None if unset
+    """
+    load_dotenv()
+    return os.getenv("SKILL_BANK_PATH") or None
+
+
+def default_mode() -> str:
+    """
+    REQ_MODE, "ai" unless set to "bank"
+    """
+    load_dotenv()
+    mode = os.getenv("REQ_MODE", "ai")
+    return mode if mode in REQ_MODES else "ai"
+
+
+def segment_job_req(job_req: str) -> list[str]:
+    """
+    Cut a job description into short segments worth matching
+    Lists ("Python, Java and SQL", "AWS/GCP") also add every part
+    """
+    pieces = re.split(r"[\n\r;•·▪●]+|(?<=[.!?])\s+|\s[-*]\s", job_req or "")
+    segments = []
+    for piece in pieces:
+        piece = piece.strip(" \t-*:.")
+        if len(piece) < 3 or not re.search(r"[A-Za-z]", piece):
+            continue
+        segments.append(piece)
+        parts = [part.strip(" .") for part in re.split(r",|\band\b|\bor\b|/", piece)]
+        parts = [part for part in parts if len(part) >= 2]
+        if len(parts) >= 2:
+            segments.extend(parts)
+    return list(dict.fromkeys(segments))  # dedupe, keep order
+
+
+def build(output_dir: str) -> dict:
+    """
+    Embed every taxonomy sentence with the current encoder, returns the manifest
+    """
+    entries = bank_entries()
+    vecs = encoder.encode_texts([entry["text"] for entry in entries]).astype(np.float32)
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, VECS_FILE), vecs)
+    with open(os.path.join(output_dir, ENTRIES_FILE), "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+    manifest = {"model_id": encoder.model_id(), "entries": len(entries), "dim": vecs.shape[1]}
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class SkillBank:
+    """
+    A built bank, vectors are memory-mapped (read only, shared by workers
+    through the page cache)
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(path, ENTRIES_FILE), encoding="utf-8") as f:
+            self.entries = json.load(f)
+        self.vecs = np.load(os.path.join(path, VECS_FILE), mmap_mode="r")
+        self.model_id = self.manifest["model_id"]
+        self.is_soft = np.array([entry["category"] in SOFT_CATEGORIES for entry in self.entries])
+
+    def match(self, job_req: str, top_n: int = None, min_sim: float = None) -> tuple:
+        """
+        Requirement sentences for a job description, best match first
+        Returns (requirement list, their bank vectors (R, D)), ([], None) if
+        nothing in the job description could be segmented
+        """
+        load_dotenv()
+        top_n = top_n or int(os.getenv("SKILL_BANK_TOP_N", "10"))
+        min_sim = float(os.getenv("SKILL_BANK_MIN_SIM", "0.35")) if min_sim is None else min_sim
+        segments = segment_job_req(job_req)
+        if not segments:
+            return [], None
+        sims = encoder.encode_texts(segments) @ self.vecs.T  # (S, E)
+        # Every segment votes for its best skill, so phrasing shared by many
+        # bank sentences ("Experience with ...") cannot pull in unrelated skills
+        skill_score = {}  # skill -> (similarity, entry index)
+        for seg_sims in sims:
+            idx = int(np.argmax(seg_sims))
+            skill = self.entries[idx]["skill"]
+            if seg_sims[idx] > skill_score.get(skill, (-1.0, None))[0]:
+                skill_score[skill] = (float(seg_sims[idx]), idx)
+        ranked = [idx for _, idx in sorted(skill_score.values(), key=lambda pair: -pair[0])]
+        chosen = [idx for idx in ranked if sims[:, idx].max() >= min_sim][:top_n]
+        if not chosen:
+            chosen = ranked[:1]  # always give line_eval something to score against
+        if top_n >= 3 and not any(self.is_soft[idx] for idx in chosen):
+            # Best soft skill of the whole job description, like the AI prompt asks
+            soft_sims = np.where(self.is_soft, sims.max(axis=0), -np.inf)
+            chosen = chosen[: top_n - 1] + [int(np.argmax(soft_sims))]
+        requirements = [self.entries[idx]["text"] for idx in chosen]
+        return requirements, np.array(self.vecs[chosen])
+
+
+def get_bank() -> SkillBank:
+    """
+    The bank at SKILL_BANK_PATH, None if unset, missing or made with another
+    model id than encoder.model_id()
+    """
+    path = default_bank_path()
+    if path != _loaded["path"]:
+        with _lock:
+            if path != _loaded["path"]:
+                bank = None
+                if path and os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                    bank = SkillBank(path)
+                    print(f"DEBUG: skill bank of {len(bank.entries)} sentences loaded")
+                elif path:
+                    print(f"WARNING: no skill bank at {path}")
+                _loaded["bank"] = bank
+                _loaded["path"] = path
+    bank = _loaded["bank"]
+    if bank is not None and bank.model_id != encoder.model_id():
+        print(f"WARNING: skill bank is for {bank.model_id}, not {encoder.model_id()}")
+        return None
+    return bank
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        raise SystemExit("Usage: skill_bank build [output_dir]")
+    target = sys.argv[2] if len(sys.argv) > 2 else default_bank_path()
+    if not target:
+        raise SystemExit("Pass output_dir or set SKILL_BANK_PATH")
+    final_manifest = build(target)
+    print(
+        f"Skill bank of {final_manifest['entries']} sentences "
+        f"({final_manifest['model_id']}) written to {target}"
+    )
@@ -0,0 +1,231 @@
+"""
+Canonical skills the local requirement bank is generated from, see skill_bank
+
+SKILLS: category -> skills of that category
+TEMPLATES: template kind -> requirement phrasings, {skill} is filled in
+CATEGORY_KIND: which template kind each category uses
+
+Every (skill, phrasing) pair becomes one bank sentence. Adding a skill or a
+phrasing only needs a rebuild of the bank (skill_bank build).
+"""
+
+TEMPLATES = {
+    "tool": [
+        "Experience with {skill}.",
+        "Strong proficiency in {skill}.",
+        "Hands-on experience building software with {skill}.",
+        "Familiarity with {skill} in a production environment.",
+        "Solid working knowledge of {skill}.",
+        "Proven track record delivering projects using {skill}.",
+    ],
+    "practice": [
+        "Experience with {skill}.",
+        "Strong understanding of {skill}.",
+        "Practical experience applying {skill} on real projects.",
+        "Familiarity with {skill} best practices.",
+        "Ability to lead and improve {skill} within a team.",
+    ],
+    "domain": [
+        "Knowledge of {skill}.",
+        "Experience working in {skill}.",
+        "Background in {skill} is a plus.",
+        "Understanding of the {skill} domain and its constraints.",
+    ],
+    "soft": [
+        "Strong {skill} skills.",
+        "Demonstrated {skill} skills in a team setting.",
+        "Ability to apply {skill} skills in a fast-paced environment.",
+        "Excellent {skill} skills.",
+    ],
+    # Traits read wrong with "skills" appended ("attention to detail skills")
+    "trait": [
+        "Strong {skill}.",
+        "Demonstrated {skill} on past projects.",
+        "Ability to show {skill} in a fast-paced environment.",
+        "A high degree of {skill}.",
+    ],
+    "degree": [
+        "Degree in {skill} or a related field.",
+        "Bachelor's degree in {skill}.",
+        "Currently pursuing a degree in {skill}.",
+    ],
+}
+
+CATEGORY_KIND = {
+    "programming_languages": "tool",
+    "web_frontend": "tool",
+    "web_backend": "tool",
+    "mobile": "tool",
+    "databases": "tool",
+    "data_engineering": "tool",
+    "machine_learning": "tool",
+    "cloud_devops": "tool",
+    "testing": "tool",
+    "security": "practice",
+    "engineering_practices": "practice",
+    "data_analysis": "practice",
+    "design": "tool",
+    "business_tools": "tool",
+    "embedded_hardware": "tool",
+    "domains": "domain",
+    "soft_skills": "soft",
+    "soft_traits": "trait",
+    "degrees": "degree",
+}
+
+SKILLS = {
+    "programming_languages": [
+        "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go",
+        "Rust", "Kotlin", "Swift", "Objective-C", "Ruby", "PHP", "Scala", "R",
+        "MATLAB", "Julia", "Perl", "Haskell", "Elixir", "Erlang", "Clojure",
+        "Dart", "Lua", "Bash scripting", "PowerShell", "SQL", "Assembly",
+        "Fortran", "COBOL", "F#", "OCaml", "Solidity", "Verilog", "VHDL",
+    ],
+    "web_frontend": [
+        "React", "Angular", "Vue.js", "Svelte", "Next.js", "Nuxt", "Redux",
+        "HTML and CSS", "Tailwind CSS", "Sass", "Webpack", "Vite", "jQuery",
+        "Bootstrap", "Material UI", "web accessibility standards",
+        "responsive web design", "GraphQL clients such as Apollo",
+        "browser performance optimization", "single page applications",
+    ],
+    "web_backend": [
+        "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring Boot",
+        "ASP.NET", "Ruby on Rails", "Laravel", "NestJS", "gRPC", "GraphQL",
+        "REST APIs", "WebSockets", "microservices", "message queues",
+        "RabbitMQ", "Apache Kafka", "Celery", "OAuth and JWT authentication",
+        "API design", "server-side rendering", "Nginx", "caching with Redis",
+    ],
+    "mobile": [
+        "iOS development", "Android development", "React Native", "Flutter",
+        "SwiftUI", "Jetpack Compose", "Xamarin", "mobile app publishing",
+        "mobile UI performance", "push notifications",
+    ],
+    "databases": [
+        "PostgreSQL", "MySQL", "SQLite", "Microsoft SQL Server", "Oracle Database",
+        "MongoDB", "Redis", "Cassandra", "DynamoDB", "Elasticsearch",
+        "Neo4j", "Firebase", "Snowflake", "BigQuery", "Amazon Redshift",
+        "database schema design", "query optimization", "database indexing",
+        "vector databases", "ORMs such as SQLAlchemy",
+    ],
+    "data_engineering": [
+        "Apache Spark", "Hadoop", "Apache Airflow", "dbt", "ETL pipelines",
+        "data warehousing", "data lakes", "stream processing", "Apache Flink",
+        "Databricks", "data modeling", "batch data processing",
+        "data quality monitoring", "Pandas", "NumPy", "Polars",
+    ],
+    "machine_learning": [
+        "machine learning", "deep learning", "PyTorch", "TensorFlow", "Keras",
+        "scikit-learn", "natural language processing", "computer vision",
+        "large language models", "prompt engineering",
+        "retrieval augmented generation", "transformer models",
+        "reinforcement learning", "recommendation systems",
+        "time series forecasting", "MLOps", "model deployment",
+        "feature engineering", "Hugging Face Transformers", "XGBoost",
+        "embedding models and semantic search", "model evaluation and metrics",
+        "data labeling and annotation", "OpenCV", "speech recognition",
+    ],
+    "cloud_devops": [
+        "Amazon Web Services", "AWS Lambda", "Amazon EC2", "Amazon S3",
+        "Google Cloud Platform", "Microsoft Azure", "Docker", "Kubernetes",
+        "Terraform", "Ansible", "Helm", "CI/CD pipelines", "GitHub Actions",
+        "Jenkins", "GitLab CI", "Linux system administration", "serverless architectures",
+        "infrastructure as code", "monitoring with Prometheus and Grafana",
+        "logging and observability", "cloud cost optimization", "load balancing",
+        "networking and TCP/IP", "site reliability engineering", "Git version control",
+    ],
+    "testing": [
+        "unit testing", "integration testing", "end-to-end testing", "pytest",
+        "JUnit", "Jest", "Cypress", "Selenium", "Playwright",
+        "test-driven development", "performance testing", "load testing",
+        "manual QA testing", "test automation frameworks",
+    ],
+    "security": [
+        "application security", "secure coding practices", "penetration testing",
+        "identity and access management", "encryption and key management",
+        "network security", "threat modeling", "vulnerability management",
+        "security compliance such as SOC 2", "incident response",
+    ],
+    "engineering_practices": [
+        "object-oriented programming", "functional programming",
+        "data structures and algorithms", "system design", "distributed systems",
+        "concurrency and multithreading", "software architecture", "design patterns",
+        "code review", "Agile methodologies", "Scrum", "Kanban",
+        "technical documentation", "debugging complex systems",
+        "performance optimization", "scalable backend systems",
+        "clean code principles", "refactoring legacy code", "open source contribution",
+        "release management", "requirements gathering", "product thinking",
+    ],
+    "data_analysis": [
+        "data analysis", "statistical analysis", "A/B testing", "data visualization",
+        "business intelligence reporting", "Excel modeling", "dashboard building",
+        "experimental design", "quantitative research", "financial modeling",
+        "SQL reporting", "predictive analytics",
+    ],
+    "design": [
+        "Figma", "Sketch", "Adobe XD", "Adobe Photoshop", "Adobe Illustrator",
+        "user experience design", "user interface design", "wireframing and prototyping",
+        "user research", "design systems", "motion design", "3D modeling with Blender",
+    ],
+    "business_tools": [
+        "Jira", "Confluence", "Salesforce", "SAP", "HubSpot", "Tableau",
+        "Power BI", "Looker", "Google Analytics", "Microsoft Office",
+        "Notion", "Slack integrations", "Zendesk", "ServiceNow",
+    ],
+    "embedded_hardware": [
+        "embedded C programming", "microcontrollers", "Arduino", "Raspberry Pi",
+        "real-time operating systems", "FPGA development", "PCB design",
+        "firmware development", "robotics", "ROS", "signal processing",
+        "CAD tools such as SolidWorks", "circuit design", "IoT devices",
+    ],
+    "domains": [
+        "financial services", "fintech", "healthcare", "e-commerce", "education technology",
+        "gaming", "cybersecurity", "telecommunications", "automotive software",
+        "aerospace", "energy and utilities", "logistics and supply chain",
+        "advertising technology", "media and streaming", "real estate technology",
+        "legal technology", "insurance", "government and public sector",
+        "biotechnology", "retail", "manufacturing", "SaaS products",
+        "enterprise software", "consumer mobile apps", "developer tools",
+        "search and information retrieval", "payments", "blockchain",
+        "social media platforms", "travel and hospitality", "human resources software",
+        "high-frequency trading", "scientific computing", "climate technology",
+    ],
+    "soft_skills": [
+        "communication", "written communication", "verbal communication",
+        "teamwork", "collaboration", "leadership", "mentorship", "problem-solving",
+        "critical thinking", "time management", "stakeholder management",
+        "cross-functional collaboration", "conflict resolution",
+        "presentation", "decision making", "prioritization", "negotiation",
+        "project management", "organizational", "analytical thinking",
+        "strategic thinking", "coaching",
+    ],
+    "soft_traits": [
+        "attention to detail", "adaptability", "ownership", "self-motivation",
+        "customer focus", "creativity", "curiosity and eagerness to learn",
+        "initiative", "empathy", "resilience", "accountability", "independence",
+    ],
+    "degrees": [
+        "Computer Science", "Software Engineering", "Computer Engineering",
+        "Electrical Engineering", "Mechanical Engineering", "Mathematics",
+        "Statistics", "Data Science", "Physics", "Information Systems",
+        "Business Administration", "Finance", "Economics", "Design",
+        "Cognitive Science",
+    ],
+}
+
+
+def bank_entries() -> list[dict]:
+    """
+    Every bank sentence as {"text", "skill", "category"}, in a fixed order
+    """
+    entries = []
+    for category, skills in SKILLS.items():
+        for skill in skills:
+            for template in TEMPLATES[CATEGORY_KIND[category]]:
+                entries.append(
+                    {
+                        "text": template.format(skill=skill),
+                        "skill": skill,
+                        "category": category,
+                    }
+                )
+    return entries
@@ -0,0 +1,138 @@
+"""
+Keep encoding threads from oversubscribing the CPU when several API workers
+share one host
+
+By default torch (and the BLAS under numpy) start one intra-op thread per
+core in every worker, so W workers on C cores run W*C busy threads and p99
+latency collapses. The governor gives every worker its share instead:
+threads = max(1, cores // workers)
+
+Configuration (environment):
+- EMBED_WORKERS: workers per host, falls back to WEB_CONCURRENCY (gunicorn), then 1
+- EMBED_THREADS: threads per worker, overrides the computed share
+- EMBED_CPU_PIN=1: pin worker i to its own slice of cores (needs the worker
+  index, passed by the gunicorn post_fork hook in backend/gunicorn.conf.py)
+- EMBED_THREAD_GOVERNOR=0: leave the libraries alone
+
+apply() must run before torch / numpy spin up their pools to be fully
+effective: it sets OMP/MKL/OPENBLAS env vars for libraries not loaded yet,
+and calls torch.set_num_threads / threadpoolctl for the ones already loaded.
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+_state = {"applied": None}  # the plan last applied in this process
+
+
+def available_cores() -> list[int]:
+    """
+    Cores this process may run on (respects cgroup / taskset limits)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan(
+    workers: int = None, cores: list[int] = None, worker_index: int = None, threads: int = None
+) -> dict:
+    """
+    Thread count (and optionally cores to pin to) for one worker
+    threads overrides both EMBED_THREADS and the computed share
+    Pure function of the inputs and the environment, nothing is changed
+    """
+    load_dotenv()
+    if workers is None:
+        workers = int(os.getenv("EMBED_WORKERS") or os.getenv("WEB_CONCURRENCY") or "1")
+    workers = max(1, workers)
+    if cores is None:
+        cores = available_cores()
+    threads = threads or int(os.getenv("EMBED_THREADS", "0")) or max(1, len(cores) // workers)
+    pin = None
+    if os.getenv("EMBED_CPU_PIN", "0") == "1" and worker_index is not None:
+        # Contiguous slice per worker, wrapping around when workers > cores
+        start = (worker_index * threads) % len(cores)
+        pin = [cores[(start + offset) % len(cores)] for offset in range(threads)]
+    return {
+        "workers": workers,
+        "cores": len(cores),
+        "threads": threads,
+        "worker_index": worker_index,
+        "pinned_cores": pin,
+    }
+
+
+def apply(
+    workers: int = None, worker_index: int = None, force: bool = False, threads: int = None
+) -> dict:
+    """
+    Apply the plan to this process, returns it (None when the governor is off)
+    Only the first call does anything unless force is set
+    threads=1 is for a process that forks workers later (gunicorn preload
+    master): a parallel op before fork can hang the children
+    """
+    load_dotenv()
+    if os.getenv("EMBED_THREAD_GOVERNOR", "1") == "0":
+        return None
+    if _state["applied"] is not None and not force:
+        return _state["applied"]
+    threads_plan = plan(workers=workers, worker_index=worker_index, threads=threads)
+    threads = threads_plan["threads"]
+    if threads_plan["pinned_cores"] and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, threads_plan["pinned_cores"])
+    for env_var in THREAD_ENV_VARS:
+        os.environ[env_var] = str(threads)
+    # Only touch torch if something already imported it, the onnx backend
+    # never needs it
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # can only be set before the first parallel op
+    try:
+        # pylint: disable=import-outside-toplevel
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+    _state["applied"] = threads_plan
+    print(
+        f"DEBUG: thread governor: {threads} threads per worker "
+        f"({threads_plan['workers']} workers on {threads_plan['cores']} cores)"
+        + (f", pinned to {threads_plan['pinned_cores']}" if threads_plan["pinned_cores"] else "")
+    )
+    return threads_plan
+
+
+def current_threads() -> int:
+    """
+    Threads per worker, for backends that take an explicit count (onnxruntime)
+    0 means let the library decide
+    """
+    threads_plan = _state["applied"] or apply()
+    return threads_plan["threads"] if threads_plan else 0
+
+
+def status() -> dict:
+    """
+    The applied plan and what the libraries actually run with
+    """
+    report = {"plan": _state["applied"]}
+    if "torch" in sys.modules:
+        report["torch_threads"] = sys.modules["torch"].get_num_threads()
+    if hasattr(os, "sched_getaffinity"):
+        report["affinity"] = sorted(os.sched_getaffinity(0))
+    return report
@@ -0,0 +1,103 @@
+"""
+Content-hash cache for line vectors
+
+A line's vector is kept in line.aux_info along with what produced it:
+- vec: the embedding (compact string once stored, see vec_codec)
+- vec_hash: hash of line.content_str at the time of encoding
+- vec_model: model id (see model_registry.model_id) used for encoding
+A cached vector is only reused when both still match, so edited lines and
+vectors from an older model are re-encoded automatically.
+"""
+
+import hashlib
+
+from . import vec_codec
+
+
+def content_hash(content_str: str) -> str:
+    """
+    Stable hash of the line content
+    """
+    return hashlib.sha256((content_str or "").encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """
+    Hit/miss counters for one request
+    - hits: cached vector reused
+    - misses: no vector cached for the line
+    - stale: vector cached, but content or model changed
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def record(self, other: "CacheStats") -> None:
+        """
+        Add the counts of another CacheStats to this one
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        self.stale += other.stale
+
+    def total(self) -> int:
+        """
+        Number of lookups
+        """
+        return self.hits + self.misses + self.stale
+
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups served from the cache
+        """
+        if self.total() == 0:
+            return 0.0
+        return self.hits / self.total()
+
+    def to_dict(self) -> dict:
+        """
+        For logging and response headers
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hit_rate(), 3),
+        }
+
+    def __str__(self) -> str:
+        return f"CacheStats({self.to_dict()})"
+
+
+def lookup(line, model_id: str, stats: CacheStats = None):
+    """
+    Returns the cached vector of the line as a numpy array, or None if
+    it is missing or stale
+    """
+    aux_info = getattr(line, "aux_info", None)
+    if not aux_info or aux_info.get("vec") is None:
+        if stats is not None:
+            stats.misses += 1
+        return None
+    if aux_info.get("vec_model") != model_id or aux_info.get(
+        "vec_hash"
+    ) != content_hash(line.content_str):
+        if stats is not None:
+            stats.stale += 1
+        return None
+    if stats is not None:
+        stats.hits += 1
+    return vec_codec.decode_vec(aux_info["vec"])
+
+
+def store(line, vec, model_id: str) -> None:
+    """
+    Cache the vector on the line, tagged with its content hash and model id
+    """
+    if getattr(line, "aux_info", None) is None:
+        line.aux_info = {}
+    line.aux_info["vec"] = vec
+    line.aux_info["vec_hash"] = content_hash(line.content_str)
+    line.aux_info["vec_model"] = model_id
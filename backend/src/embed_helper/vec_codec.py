@@ -0,0 +1,119 @@
+"""
+Compact encoding for line vectors
+
+A 768-dim vector as a json list of floats is ~15 KB of text per line.
+to_bytes/from_bytes give the raw form stored in line_vecs.vec (BYTEA),
+encode_vec gives a json-safe string for anything still kept in json:
+- "f16:<base64>": float16, 2 bytes per dim (~2 KB per line)
+- "i8:<base64>": int8 quantized, 1 byte per dim (~1 KB per line). There is
+  no separate scale field in the string: the decoded payload is a 4 byte
+  little-endian float32 scale (max |x| / 127) followed by the int8 values,
+  exactly the line_vecs.vec bytes of to_bytes
+Mode is picked with VEC_ENCODING (f16 by default).
+
+decode_vec accepts every stored shape (encoded str, legacy float list, ndarray)
+so old rows keep working until they are migrated (see vec_migrate.py).
+"""
+
+import base64
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+ENCODINGS = ("f16", "i8")
+
+
+def default_encoding() -> str:
+    """
+    Encoding configured through VEC_ENCODING
+    """
+    load_dotenv()
+    encoding = os.getenv("VEC_ENCODING", "f16")
+    if encoding not in ENCODINGS:
+        raise ValueError(f"VEC_ENCODING must be one of {ENCODINGS}, got {encoding}")
+    return encoding
+
+
+def to_bytes(vec, encoding: str = "f16") -> bytes:
+    """
+    Raw bytes of the vector in the given encoding
+    For i8, the first 4 bytes are the float32 scale
+    """
+    arr = np.asarray(vec, dtype=np.float32).ravel()
+    if encoding == "f16":
+        return arr.astype("<f2").tobytes()
+    if encoding == "i8":
+        max_abs = float(np.abs(arr).max()) if arr.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        quantized = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).astype("<f4").tobytes() + quantized.tobytes()
+    raise ValueError(f"Unknown vector encoding: {encoding}")
+
+
+def from_bytes(data: bytes, encoding: str = "f16") -> np.ndarray:
+    """
+    Inverse of to_bytes, always returns float32
+    """
+    if encoding == "f16":
+        return np.frombuffer(data, dtype="<f2").astype(np.float32)
+    if encoding == "i8":
+        scale = np.frombuffer(data[:4], dtype="<f4")[0]
+        quantized = np.frombuffer(data[4:], dtype=np.int8)
+        return quantized.astype(np.float32) * scale
+    raise ValueError(f"Unknown vector encoding: {encoding}")
+
+
+def encode_vec(vec, encoding: str = None) -> str:
+    """
+    Encode a vector into a json-safe string
+    """
+    if encoding is None:
+        encoding = default_encoding()
+    payload = base64.b64encode(to_bytes(vec, encoding)).decode("ascii")
+    return f"{encoding}:{payload}"
+
+
+def decode_vec(value) -> np.ndarray:
+    """
+    Decode any stored vector shape into a float32 numpy array
+    - encoded string from encode_vec
+    - legacy list of floats
+    - numpy array (freshly encoded, not stored yet)
+    """
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False)
+    if isinstance(value, str):
+        encoding, payload = value.split(":", 1)
+        return from_bytes(base64.b64decode(payload), encoding)
+    return np.asarray(value, dtype=np.float32)
+
+
+def is_compact(value) -> bool:
+    """
+    Whether the stored vector is already in compact form
+    """
+    return isinstance(value, str)
+
+
+def compact_vecs(obj, encoding: str = None):
+    """
+    Recursively replace every aux_info["vec"] under obj by its encoded form
+    Returns a new structure ready for json.dumps, obj is not modified
+    """
+    if isinstance(obj, dict):
+        result = {}
+        for key, value in obj.items():
+            if key == "aux_info" and isinstance(value, dict) and "vec" in value:
+                value = dict(value)
+                if value["vec"] is not None and not is_compact(value["vec"]):
+                    value["vec"] = encode_vec(value["vec"], encoding)
+                result[key] = value
+            else:
+                result[key] = compact_vecs(value, encoding)
+        return result
+    if isinstance(obj, list):
+        return [compact_vecs(value, encoding) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return obj
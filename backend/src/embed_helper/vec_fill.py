@@ -0,0 +1,173 @@
+"""
+Fill in missing line vectors outside of the generate path
+
+Used at resume save time: the incoming lines are diffed against the vectors
+already stored for the user, and only new/edited lines are embedded.
+Embedding runs synchronously within a time budget, anything left over is
+finished on a background thread with its own DBConn, so generation later
+finds every vector present.
+
+Sample usage:
+report = vec_fill.fill_missing_vecs(database, uid, content_strs, budget_s=0.3)
+if report["remaining"]:
+    vec_fill.schedule_fill(uid, report["remaining"])
+
+Login warm-up (opt-in, LOGIN_VEC_WARMUP=1): after a successful login the
+user's stored resume is checked in the background (schedule_login_warm_up),
+so the first generation of the session finds every vector.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from ..db_helper.dbconn import DBConn
+from . import encoder
+from . import vec_cache
+from . import vec_codec
+from . import vec_store
+from .global_vecs import GlobalVecStore
+
+# One background thread per worker is plenty, fills are small and rare
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vec-fill")
+
+# uid -> time of the last login warm-up in this worker, oldest first, see
+# schedule_login_warm_up (entries past the debounce interval are evicted)
+_last_warm_up = OrderedDict()
+_warm_up_lock = threading.Lock()
+
+
+def resume_line_texts(resume_dict: dict) -> list[str]:
+    """
+    content_str of every line in a resume dict, in document order
+    """
+    texts = []
+    for section in (resume_dict or {}).get("sections", []):
+        for item in section.get("items", []):
+            for line in item.get("lines", []) or []:
+                texts.append(line.get("content_str", ""))
+    return texts
+
+
+def fill_missing_vecs(
+    database: DBConn,
+    uid: str,
+    content_strs: list[str],
+    budget_s: float = None,
+    chunk_size: int = 16,
+) -> dict:
+    """
+    Embed the lines that have no stored vector for the current model
+    Stops starting new chunks once budget_s is used up (None: no limit)
+    Returns a report: missing, encoded, remaining (texts still without vector)
+    Without the line_vecs table there is nowhere to store them, nothing is done
+    """
+    t0 = time.monotonic()
+    if not vec_store.table_ready(database):
+        return {"missing": 0, "encoded": 0, "remaining": [], "elapsed_s": 0.0}
+    model_id = encoder.model_id()
+    stored_hashes = database.fetch_line_vec_hashes(uid, model_id)
+    missing = {}  # line_hash -> text, deduplicated
+    for text in content_strs:
+        line_hash = vec_cache.content_hash(text)
+        if line_hash not in stored_hashes:
+            missing[line_hash] = text
+    pending = list(missing.items())
+    encoded = 0
+    encoding = vec_codec.default_encoding()
+    # Lines other users already have are copied, not encoded
+    global_store = GlobalVecStore(database)
+    while pending:
+        if budget_s is not None and time.monotonic() - t0 >= budget_s:
+            break
+        chunk, pending = pending[:chunk_size], pending[chunk_size:]
+        vecs = global_store.encode([text for _, text in chunk])
+        to_store = {
+            line_hash: vec_codec.to_bytes(vec, encoding)
+            for (line_hash, _), vec in zip(chunk, vecs)
+        }
+        if not database.upsert_line_vecs(uid, model_id, to_store, encoding):
+            print("ERROR: failed to store line vectors")
+            break
+        encoded += len(chunk)
+    report = {
+        "missing": len(missing),
+        "encoded": encoded,
+        "remaining": [text for _, text in pending],
+        "elapsed_s": time.monotonic() - t0,
+    }
+    print(
+        f"DEBUG: vec fill for {uid}: {report['missing']} missing, "
+        f"{encoded} encoded, {len(pending)} left in {report['elapsed_s']:.3f}s"
+    )
+    return report
+
+
+def _fill_in_background(uid: str, content_strs: list[str]) -> None:
+    database = DBConn()
+    try:
+        fill_missing_vecs(database, uid, content_strs)
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"ERROR: background vec fill for {uid} failed: {e}")
+    finally:
+        database.close()
+
+
+def schedule_fill(uid: str, content_strs: list[str]):
+    """
+    Finish embedding on the background thread, returns the Future
+    """
+    return _executor.submit(_fill_in_background, uid, list(content_strs))
+
+
+def save_budget_s() -> float:
+    """
+    Synchronous embedding budget at save time, SAVE_EMBED_BUDGET_MS (default 300)
+    0 means everything is done in the background
+    """
+    load_dotenv()
+    return float(os.getenv("SAVE_EMBED_BUDGET_MS", "300")) / 1000.0
+
+
+def login_warm_up_enabled() -> bool:
+    """
+    LOGIN_VEC_WARMUP, off by default
+    """
+    load_dotenv()
+    return os.getenv("LOGIN_VEC_WARMUP", "0") == "1"
+
+
+def schedule_login_warm_up(uid: str, resumeinfo):
+    """
+    After a login: fill the user's missing / stale line vectors in the
+    background. Returns right away (the Future, None if nothing was scheduled).
+    resumeinfo is the stored resume (dict or JSON string).
+    A user is checked at most once per LOGIN_WARMUP_INTERVAL_S (default 300)
+    per worker, repeated logins and token refreshes do not pile up.
+    """
+    if not login_warm_up_enabled() or not uid:
+        return None
+    load_dotenv()
+    interval_s = float(os.getenv("LOGIN_WARMUP_INTERVAL_S", "300"))
+    now = time.monotonic()
+    with _warm_up_lock:
+        while _last_warm_up and now - next(iter(_last_warm_up.values())) >= interval_s:
+            _last_warm_up.popitem(last=False)
+        if uid in _last_warm_up:
+            return None
+        _last_warm_up[uid] = now
+    try:
+        resume_dict = json.loads(resumeinfo) if isinstance(resumeinfo, str) else resumeinfo
+    except ValueError:
+        print(f"WARNING: resumeinfo of {uid} is not JSON, no warm-up")
+        return None
+    content_strs = [text for text in resume_line_texts(resume_dict) if text]
+    if not content_strs:
+        return None
+    print(f"DEBUG: login warm-up of {len(content_strs)} lines scheduled for {uid}")
+    return schedule_fill(uid, content_strs)
@@ -0,0 +1,190 @@
+"""
+One-off migrations for line vectors stored in data.resumeinfo
+
+- compact: rewrite legacy float-list vectors into the compact encoding from vec_codec
+- split: move every vector out of resumeinfo into the line_vecs table
+  (creates the table if needed), then strip the vectors from resumeinfo
+- tables: create the line_vecs, req_cache and global_vecs tables if they do
+  not exist
+
+Rows are walked in uid order, page by page, and only rewritten when something
+changed. Both are safe to re-run. Legacy rows keep working without this:
+decode_vec reads every stored shape and lines without a stored vector are
+simply encoded again on the next generation.
+
+Usage (from repo root):
+python -m backend.src.embed_helper.vec_migrate tables
+python -m backend.src.embed_helper.vec_migrate split [page_size]
+python -m backend.src.embed_helper.vec_migrate compact [page_size] [encoding]
+"""
+
+import json
+import sys
+
+from ..db_helper.dbconn import DBConn
+from ..general_helper.vec_rip import vec_rip
+from . import vec_cache
+from . import vec_codec
+from . import encoder
+
+LINE_VECS_DDL = """
+    CREATE TABLE IF NOT EXISTS line_vecs (
+        uid VARCHAR(256) NOT NULL REFERENCES data(uid) ON DELETE CASCADE,
+        line_hash CHAR(64) NOT NULL,
+        model_id VARCHAR(256) NOT NULL,
+        encoding VARCHAR(8) NOT NULL,
+        vec BYTEA NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (uid, line_hash, model_id)
+    );
+"""
+
+REQ_CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS req_cache (
+        cache_key CHAR(64) PRIMARY KEY,
+        requirements JSONB NOT NULL,
+        encoding VARCHAR(8) NOT NULL,
+        dim INT NOT NULL,
+        vecs BYTEA NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        last_used TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+
+GLOBAL_VECS_DDL = """
+    CREATE TABLE IF NOT EXISTS global_vecs (
+        content_hash CHAR(64) NOT NULL,
+        model_id VARCHAR(256) NOT NULL,
+        encoding VARCHAR(8) NOT NULL,
+        vec BYTEA NOT NULL,
+        PRIMARY KEY (content_hash, model_id)
+    );
+"""
+
+
+def create_tables(database: DBConn) -> dict:
+    """
+    Create line_vecs, req_cache and global_vecs if missing
+    """
+    database.run_sql(LINE_VECS_DDL)
+    database.run_sql(REQ_CACHE_DDL)
+    database.run_sql(GLOBAL_VECS_DDL)
+    return {"tables": ["line_vecs", "req_cache", "global_vecs"]}
+
+
+def iter_rows(database: DBConn, page_size: int):
+    """
+    Yields (uid, resumeinfo dict) for every user, one page at a time
+    """
+    last_uid = ""
+    while True:
+        rows = database.run_sql(
+            "SELECT uid, resumeinfo FROM data WHERE uid > %s ORDER BY uid LIMIT %s;",
+            (last_uid, page_size),
+        )
+        if not rows:
+            return
+        for row in rows:
+            last_uid = row["uid"]
+            resumeinfo = row["resumeinfo"]
+            if isinstance(resumeinfo, str):
+                resumeinfo = json.loads(resumeinfo)
+            yield row["uid"], resumeinfo
+        print(f"DEBUG: migrated up to uid {last_uid}")
+
+
+def _line_dicts(obj) -> list:
+    """
+    Every line dict (aux_info type lines) under obj
+    """
+    found = []
+    if isinstance(obj, dict):
+        if isinstance(obj.get("aux_info"), dict) and obj["aux_info"].get("type") == "lines":
+            found.append(obj)
+        for value in obj.values():
+            found.extend(_line_dicts(value))
+    elif isinstance(obj, list):
+        for value in obj:
+            found.extend(_line_dicts(value))
+    return found
+
+
+def migrate_compact(database: DBConn, page_size: int = 100, encoding: str = None) -> dict:
+    """
+    Compact every vector left in resumeinfo
+    Returns counts of scanned and rewritten rows and bytes saved
+    """
+    report = {"rows_scanned": 0, "rows_updated": 0, "bytes_before": 0, "bytes_after": 0}
+    for uid, resumeinfo in iter_rows(database, page_size):
+        report["rows_scanned"] += 1
+        if not resumeinfo:
+            continue
+        before = json.dumps(resumeinfo)
+        after = json.dumps(vec_codec.compact_vecs(resumeinfo, encoding))
+        if before == after:
+            continue
+        database.run_sql(
+            "UPDATE data SET resumeinfo = %s WHERE uid = %s", (after, uid)
+        )
+        report["rows_updated"] += 1
+        report["bytes_before"] += len(before)
+        report["bytes_after"] += len(after)
+    return report
+
+
+def migrate_split(database: DBConn, page_size: int = 100) -> dict:
+    """
+    Move vectors from resumeinfo into line_vecs
+    Vectors without a recorded model are assumed to come from the current model,
+    as that was the only model before vectors were tagged
+    """
+    create_tables(database)
+    encoding = vec_codec.default_encoding()
+    current_model_id = encoder.model_id()
+    report = {"rows_scanned": 0, "rows_updated": 0, "vecs_moved": 0}
+    for uid, resumeinfo in iter_rows(database, page_size):
+        report["rows_scanned"] += 1
+        if not resumeinfo:
+            continue
+        by_model = {}  # model_id -> {line_hash: bytes}
+        for line_dict in _line_dicts(resumeinfo):
+            aux_info = line_dict["aux_info"]
+            if aux_info.get("vec") is None:
+                continue
+            model_id = aux_info.get("vec_model") or current_model_id
+            line_hash = vec_cache.content_hash(line_dict.get("content_str", ""))
+            vec = vec_codec.decode_vec(aux_info["vec"])
+            by_model.setdefault(model_id, {})[line_hash] = vec_codec.to_bytes(
+                vec, encoding
+            )
+        for model_id, vecs in by_model.items():
+            if not database.upsert_line_vecs(uid, model_id, vecs, encoding):
+                raise RuntimeError(f"failed to move vectors of {uid}, stopping")
+            report["vecs_moved"] += len(vecs)
+        stripped = vec_rip(resumeinfo)
+        if stripped is not resumeinfo:
+            database.run_sql(
+                "UPDATE data SET resumeinfo = %s WHERE uid = %s",
+                (json.dumps(stripped), uid),
+            )
+            report["rows_updated"] += 1
+    return report
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "split"
+    arg_page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    db = DBConn()
+    if mode == "compact":
+        arg_encoding = sys.argv[3] if len(sys.argv) > 3 else None
+        final_report = migrate_compact(db, arg_page_size, arg_encoding)
+    elif mode == "split":
+        final_report = migrate_split(db, arg_page_size)
+    elif mode == "tables":
+        final_report = create_tables(db)
+    else:
+        db.close()
+        raise SystemExit(f"Unknown mode {mode}, use split, compact or tables")
+    db.close()
+    print("Migration finished:", final_report)
@@ -0,0 +1,112 @@
+"""
+Bridge between Line objects and the line_vecs table
+
+Vectors are kept out of data.resumeinfo. Before scoring, all of a user's
+vectors are fetched in one query and attached to the lines (by content hash);
+after scoring, the newly encoded ones are written back in one bulk upsert.
+
+Table (see README, created by vec_migrate tables):
+line_vecs (uid, line_hash, model_id, encoding, vec BYTEA, updated_at)
+    PRIMARY KEY (uid, line_hash, model_id)
+Without the table (or when it fails) nothing is loaded or stored, every line
+is then encoded in-process like before line_vecs existed.
+
+Sample usage:
+known = vec_store.load_user_vecs(database, uid, lines, model_id)
+line_eval(requirements, lines)
+vec_store.save_user_vecs(database, uid, lines, model_id, known)
+"""
+
+import numpy as np
+
+from ..db_helper.dbconn import DBConn, TableCheck
+from . import vec_cache
+from . import vec_codec
+
+_table = TableCheck("line_vecs")
+
+
+def table_ready(database: DBConn) -> bool:
+    """
+    Whether line_vecs exists, see TableCheck
+    """
+    return _table.ready(database)
+
+
+def attach_vecs(lines: list, stored: dict, model_id: str) -> int:
+    """
+    Put stored vectors on the lines whose content hash matches
+    stored is a dict of line_hash -> (encoding, bytes), as from DBConn.fetch_line_vecs
+    Returns the number of lines that got a vector
+    """
+    attached = 0
+    for ln in lines:
+        entry = stored.get(vec_cache.content_hash(ln.content_str))
+        if entry is None:
+            continue
+        encoding, data = entry
+        vec_cache.store(ln, vec_codec.from_bytes(data, encoding), model_id)
+        attached += 1
+    return attached
+
+
+def collect_vecs(
+    lines: list, model_id: str, skip_hashes=(), encoding: str = None
+) -> dict:
+    """
+    Vectors on the lines that are valid for model_id and not in skip_hashes
+    Returns a dict of line_hash -> bytes, ready for DBConn.upsert_line_vecs
+    """
+    if encoding is None:
+        encoding = vec_codec.default_encoding()
+    result = {}
+    for ln in lines:
+        aux_info = getattr(ln, "aux_info", None) or {}
+        if aux_info.get("vec") is None or aux_info.get("vec_model") != model_id:
+            continue
+        line_hash = vec_cache.content_hash(ln.content_str)
+        if aux_info.get("vec_hash") != line_hash or line_hash in skip_hashes:
+            continue
+        vec = vec_codec.decode_vec(aux_info["vec"])
+        result[line_hash] = vec_codec.to_bytes(np.asarray(vec), encoding)
+    return result
+
+
+def load_user_vecs(database: DBConn, uid: str, lines: list, model_id: str) -> set:
+    """
+    Fetch all vectors of the user in one query and attach them to lines
+    Returns the set of line hashes already stored
+    """
+    if not table_ready(database):
+        return set()
+    try:
+        stored = database.fetch_line_vecs(uid, model_id)
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"WARNING: could not load line vectors, encoding every line: {e}")
+        return set()
+    attached = attach_vecs(lines, stored, model_id)
+    print(f"DEBUG: attached {attached}/{len(lines)} stored line vectors")
+    return set(stored.keys())
+
+
+def save_user_vecs(
+    database: DBConn, uid: str, lines: list, model_id: str, known_hashes=()
+) -> int:
+    """
+    Bulk upsert every vector on the lines that is not stored yet
+    Pass an empty known_hashes to rewrite all (e.g. after no_cache)
+    Returns the number of vectors written
+    """
+    if not table_ready(database):
+        return 0
+    encoding = vec_codec.default_encoding()
+    new_vecs = collect_vecs(lines, model_id, known_hashes, encoding)
+    try:
+        stored = not new_vecs or database.upsert_line_vecs(uid, model_id, new_vecs, encoding)
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"WARNING: could not store line vectors: {e}")
+        stored = False
+    if not stored:
+        print("ERROR: failed to store line vectors")
+        return 0
+    return len(new_vecs)
@@ -0,0 +1,390 @@
+"""
+Async AI usage class, the AsyncOpenAI version of AIBot
+
+- every call has a timeout (AI_TIMEOUT_S, default 30, or timeout_s per call)
+- at most AI_MAX_CONCURRENCY (default 8) calls are in flight per event loop
+  (sync wrappers all share one loop, so that is the limit of the worker)
+- calls can be cancelled, the HTTP request to the provider is dropped
+- responses go through the same cache as AIBot (llm_cache.py), its
+  sqlite/postgres I/O runs in a worker thread so it never blocks the loop
+- cache keys, reply parsing and retry corrections are AIBot's (isa_bot helpers)
+- OPENAI_BASE_URL points at an OpenAI compatible stand-in, see
+  segment_tests/fake_openai_server.py
+
+Timeouts and cancellations raise AICallError, except in
+pythoned_response_instruction which returns (False, None) like on bad replies.
+
+SyncAIBot has the AIBot interface on top of a shared AsyncAIBot running on a
+background event loop, so sync code (Resume.make) can switch over without
+becoming async. AI_CLIENT=async makes resume generation use it.
+
+USAGE:
+bot = AsyncAIBot()
+success, parsed = await bot.pythoned_response_instruction(prompt, instruction, list)
+
+bot = SyncAIBot(should_cancel=disconnect_probe(request.environ))
+success, parsed = bot.pythoned_response_instruction(prompt, instruction, list)
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import select
+import socket
+import threading
+import weakref
+from typing import Callable
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from .isa_bot import DEFAULT_MODEL, CachedBot, chat_messages, parse_attempt, parse_cached
+from .llm_cache import LLMCache
+
+# One asyncio.Semaphore per event loop, see _semaphore
+_semaphores = weakref.WeakKeyDictionary()
+_semaphores_lock = threading.Lock()
+
+# Background loop of the sync wrappers, see run_sync
+_runner = {"loop": None, "thread": None, "bot": None}
+_runner_lock = threading.Lock()
+
+
+class AICallError(Exception):
+    """
+    An AI call timed out or was cancelled
+    """
+
+
+def async_enabled() -> bool:
+    """
+    AI_CLIENT=async, resume generation then uses SyncAIBot
+    """
+    load_dotenv()
+    return os.getenv("AI_CLIENT", "sync") == "async"
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """
+    Concurrency limit of the running event loop (AI_MAX_CONCURRENCY)
+    """
+    loop = asyncio.get_running_loop()
+    with _semaphores_lock:
+        if loop not in _semaphores:
+            load_dotenv()
+            _semaphores[loop] = asyncio.Semaphore(int(os.getenv("AI_MAX_CONCURRENCY", "8")))
+        return _semaphores[loop]
+
+
+class AsyncAIBot(CachedBot):
+    """
+    Same calls as AIBot, as coroutines, plus timeout_s on each
+    One object can be shared by many concurrent calls on one event loop
+    """
+
+    def __init__(
+        self, ai_source: str = "gpt", default_model: str = DEFAULT_MODEL
+    ) -> None:
+        load_dotenv()
+        if ai_source != "gpt":
+            raise ValueError("ai source bad")
+        self.api_key = os.getenv("OPENAI_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key not found in .env file")
+        self.timeout_s = float(os.getenv("AI_TIMEOUT_S", "30"))
+        self.ai_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            timeout=self.timeout_s,
+            max_retries=int(os.getenv("AI_MAX_RETRIES", "1")),
+        )
+        self.default_model = default_model
+        self.total_tokens = 0
+        self.cache = LLMCache()
+
+    async def _cache_lookup(self, key: str, no_cache: bool) -> str:
+        """
+        Cached response of a call, None if not cached, bypassed or missing
+        """
+        if not self._use_cache(key, no_cache):
+            return None
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def _cache_put(self, key: str, value: str) -> None:
+        """
+        Store a response unless the call is not cacheable
+        """
+        if key is not None:
+            await asyncio.to_thread(self.cache.put, key, value)
+
+    async def _create(
+        self, model: str, messages: list, token_limit: int, temperature: float,
+        timeout_s: float,
+    ) -> ChatCompletion:
+        """
+        The actual network call: waits for a concurrency slot, then gives the
+        provider at most timeout_s (waiting for the slot does not count)
+        """
+        timeout_s = timeout_s or self.timeout_s
+        async with _semaphore():
+            print("DEBUG: AI CALL (async)")
+            try:
+                response = await asyncio.wait_for(
+                    self.ai_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=token_limit,
+                        temperature=temperature,
+                    ),
+                    timeout_s,
+                )
+            except asyncio.TimeoutError as e:
+                print(f"WARNING: AI call timed out after {timeout_s}s")
+                raise AICallError(f"AI call timed out after {timeout_s}s") from e
+        if response.usage is not None:
+            self.total_tokens += response.usage.total_tokens
+        return response
+
+    async def _complete(
+        self, model: str, messages: list, token_limit: int, temperature: float,
+        prompt_version: str, no_cache: bool, timeout_s: float,
+    ) -> str:
+        key = self._cache_key(model, messages, token_limit, temperature, prompt_version)
+        cached = await self._cache_lookup(key, no_cache)
+        if cached is not None:
+            return cached
+        response = await self._create(model, messages, token_limit, temperature, timeout_s)
+        reply = response.choices[0].message.content.strip()
+        await self._cache_put(key, reply)
+        return reply
+
+    async def response_simple(
+        self,
+        prompt: str,
+        model: str = None,
+        token_limit: int = 2000,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
+        timeout_s: float = None,
+    ) -> str:
+        """
+        See AIBot.response_simple
+        """
+        messages = chat_messages(prompt)
+        return await self._complete(
+            model or self.default_model, messages, token_limit, temperature,
+            prompt_version, no_cache, timeout_s,
+        )
+
+    async def response_instruction(
+        self,
+        prompt: str,
+        instruction: str,
+        model: str = None,
+        token_limit: int = 2000,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
+        timeout_s: float = None,
+    ) -> str:
+        """
+        See AIBot.response_instruction
+        """
+        messages = chat_messages(prompt, instruction)
+        return await self._complete(
+            model or self.default_model, messages, token_limit, temperature,
+            prompt_version, no_cache, timeout_s,
+        )
+
+    async def pythoned_response_instruction(
+        self,
+        prompt: str,
+        instruction: str,
+        datatype: type,
+        model: str = None,
+        token_limit: int = 2000,
+        retries: int = 3,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
+        timeout_s: float = None,
+    ) -> tuple[bool, "datatype"]:
+        """
+        See AIBot.pythoned_response_instruction
+        timeout_s applies to each attempt, a timeout ends the call with (False, None)
+        """
+        model = model or self.default_model
+        messages = chat_messages(prompt, instruction)
+        key = self._cache_key(model, messages, token_limit, temperature, prompt_version)
+        cached = await self._cache_lookup(key, no_cache)
+        if cached is not None:
+            success, parsed = parse_cached(cached, datatype)
+            if success:
+                return True, parsed
+        for attempt in range(retries):
+            try:
+                response = await self._create(
+                    model, messages, token_limit, temperature, timeout_s
+                )
+            except AICallError:
+                return False, None
+            reply = response.choices[0].message.content.strip()
+            success, parsed = parse_attempt(messages, reply, datatype, attempt)
+            if success:
+                await self._cache_put(key, reply)
+                return True, parsed
+        print(f"Failed to get a valid response after {retries} attempts.")
+        return False, None
+
+    async def response_dict(
+        self,
+        prompt_dict: dict,
+        model: str = None,
+        token_limit: int = 2000,
+        response_temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
+        timeout_s: float = None,
+    ) -> ChatCompletion:
+        """
+        See AIBot.response_dict
+        """
+        model = model or self.default_model
+        messages = [
+            {"role": role, "content": content} for role, content in prompt_dict.items()
+        ]
+        key = self._cache_key(model, messages, token_limit, response_temperature, prompt_version)
+        cached = await self._cache_lookup(key, no_cache)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        response = await self._create(
+            model, messages, token_limit, response_temperature, timeout_s
+        )
+        await self._cache_put(key, response.model_dump_json())
+        return response
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    The event loop of the sync wrappers, started on first use (daemon thread)
+    """
+    with _runner_lock:
+        if _runner["loop"] is None or not _runner["thread"].is_alive():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="ai-loop", daemon=True
+            )
+            thread.start()
+            _runner["loop"], _runner["thread"] = loop, thread
+        return _runner["loop"]
+
+
+def shared_async_bot() -> AsyncAIBot:
+    """
+    The AsyncAIBot of the background loop, one per worker
+    (its HTTP connection pool belongs to that loop)
+    """
+    _background_loop()
+    with _runner_lock:
+        if _runner["bot"] is None:
+            _runner["bot"] = AsyncAIBot()
+        return _runner["bot"]
+
+
+def run_sync(coro, should_cancel: Callable[[], bool] = None, poll_s: float = 0.1):
+    """
+    Run a coroutine on the background loop and wait for its result
+    should_cancel is polled every poll_s, once it returns True the coroutine
+    is cancelled (dropping the HTTP request) and AICallError is raised
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    while True:
+        try:
+            return future.result(timeout=poll_s)
+        except concurrent.futures.TimeoutError:
+            if should_cancel is not None and should_cancel():
+                future.cancel()
+                print("WARNING: AI call cancelled, client went away")
+                raise AICallError("AI call cancelled") from None
+
+
+class SyncAIBot:
+    """
+    Blocking AIBot interface on the shared AsyncAIBot
+    should_cancel: optional callable, see run_sync (e.g. disconnect_probe)
+    total_tokens counts the tokens of this wrapper's calls only
+    """
+
+    def __init__(self, should_cancel: Callable[[], bool] = None) -> None:
+        self.async_bot = shared_async_bot()
+        self.default_model = self.async_bot.default_model
+        self.should_cancel = should_cancel
+        self.total_tokens = 0
+
+    def _run(self, coro):
+        before = self.async_bot.total_tokens
+        try:
+            return run_sync(coro, self.should_cancel)
+        finally:
+            # Concurrent calls of other wrappers can land in between, close enough
+            self.total_tokens += self.async_bot.total_tokens - before
+
+    def response_simple(self, prompt: str, **kwargs) -> str:
+        """
+        See AsyncAIBot.response_simple
+        """
+        return self._run(self.async_bot.response_simple(prompt, **kwargs))
+
+    def response_instruction(self, prompt: str, instruction: str, **kwargs) -> str:
+        """
+        See AsyncAIBot.response_instruction
+        """
+        return self._run(self.async_bot.response_instruction(prompt, instruction, **kwargs))
+
+    def pythoned_response_instruction(
+        self, prompt: str, instruction: str, datatype: type, **kwargs
+    ) -> tuple[bool, "datatype"]:
+        """
+        See AsyncAIBot.pythoned_response_instruction, a cancel is (False, None)
+        """
+        try:
+            return self._run(
+                self.async_bot.pythoned_response_instruction(
+                    prompt, instruction, datatype, **kwargs
+                )
+            )
+        except AICallError:
+            return False, None
+
+    def response_dict(self, prompt_dict: dict, **kwargs) -> ChatCompletion:
+        """
+        See AsyncAIBot.response_dict
+        """
+        return self._run(self.async_bot.response_dict(prompt_dict, **kwargs))
+
+
+def disconnect_probe(environ: dict) -> Callable[[], bool]:
+    """
+    should_cancel for a request: True once the client closed its connection
+    Reads the socket gunicorn puts in the WSGI environ (sync workers), other
+    servers get a probe that never fires
+    """
+    sock = environ.get("gunicorn.socket")
+    if sock is None:
+        return lambda: False
+
+    def client_gone() -> bool:
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            # Readable with nothing to read means the peer closed the connection
+            return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            return True
+
+    return client_gone
@@ -3,26 +3,136 @@ AI usage class
 POTENTIALLY build encorporation of multiple AI sources to facilitate uses
 USAGE:
 
+Responses of deterministic calls (temperature 0, the default) are cached,
+see llm_cache.py. Pass prompt_version when the prompt template changes and
+no_cache=True to force a fresh answer (it is still cached).
 """
 
 import datetime
 import time
 import ast
 import os
+import threading
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from openai.types.chat import ChatCompletion
 from typing import Type, TypeVar, Any
 
+from .llm_cache import LLMCache
 
-class AIBot:
+
+# Model of every bot that is not given one, also part of req_cache keys
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# (api key, base url) -> OpenAI client, shared by every AIBot of the process
+# (the client is thread safe and keeps its own connection pool)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def shared_openai_client(api_key: str, base_url: str = None) -> OpenAI:
+    """
+    The process-wide OpenAI client for this key / endpoint, created on first use
+    """
+    with _clients_lock:
+        client = _clients.get((api_key, base_url))
+        if client is None:
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            _clients[(api_key, base_url)] = client
+        return client
+
+
+def chat_messages(prompt: str, instruction: str = None) -> list:
+    """
+    Messages of a prompt, with the instruction as system message if given
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if instruction is not None:
+        messages.insert(0, {"role": "system", "content": instruction})
+    return messages
+
+
+def parse_cached(cached: str, datatype: type) -> tuple[bool, Any]:
+    """
+    A cached pythoned reply parsed into datatype, (False, None) if it does not
+    """
+    try:
+        parsed = ast.literal_eval(cached)
+        if isinstance(parsed, datatype):
+            return True, parsed
+    except (SyntaxError, ValueError):
+        pass
+    print("WARNING: cached response does not parse, asking again")
+    return False, None
+
+
+def parse_attempt(messages: list, reply: str, datatype: type, attempt: int) -> tuple[bool, Any]:
+    """
+    Parse one reply of pythoned_response_instruction into datatype
+    A reply that is not valid python gets a correction appended to messages
+    for the next attempt
+    """
+    try:
+        parsed = ast.literal_eval(reply)
+    except (SyntaxError, ValueError) as e:
+        print(f"Attempt {attempt + 1}: Error parsing response: {e}")
+        messages.append({"role": "assistant", "content": reply})
+        correction = (
+            f"Your last response was not a valid {datatype.__name__}. \n"
+            f"Please ensure your response is a valid Python {datatype.__name__}.\n"
+        )
+        messages.append({"role": "user", "content": correction})
+        return False, None
+    if isinstance(parsed, datatype):
+        return True, parsed
+    print(
+        f"Attempt {attempt + 1}: Parsed type mismatch. "
+        f"Expected {datatype}, got {type(parsed)}"
+    )
+    return False, None
+
+
+class CachedBot:
+    """
+    Response cache plumbing of AIBot and async_bot.AsyncAIBot
+    Subclasses set self.cache (LLMCache)
+    """
+
+    cache: LLMCache
+
+    def _cache_key(
+        self, model: str, messages: list, token_limit: int, temperature: float,
+        prompt_version: str,
+    ) -> str:
+        """
+        Cache key of a call, None if calls with this temperature are not cached
+        """
+        if not self.cache.cacheable(temperature):
+            return None
+        return LLMCache.make_key(model, messages, temperature, token_limit, prompt_version)
+
+    @staticmethod
+    def _use_cache(key: str, no_cache: bool) -> bool:
+        """
+        Whether a call should look in the cache (no_cache counts as a bypass)
+        """
+        if key is None:
+            return False
+        if no_cache:
+            LLMCache.count_bypass()
+            return False
+        return True
+
+
+class AIBot(CachedBot):
     """
     Each object should be built and used for one convo/group of prompts
+    Bots are cheap: the HTTP client is shared, see shared_openai_client
     """
 
     def __init__(
-        self, ai_source: str = "gpt", default_model: str = "gpt-4o-mini"
+        self, ai_source: str = "gpt", default_model: str = DEFAULT_MODEL
     ) -> None:
         # Load environment variables from .env file
         load_dotenv()
@@ -35,57 +145,96 @@ class AIBot:
 
         else:
             raise ValueError("ai source bad")
-        self.ai_client = OpenAI(api_key=self.api_key)
+        # OPENAI_BASE_URL points at an OpenAI compatible stand-in (tests, local models)
+        self.ai_client = shared_openai_client(self.api_key, os.getenv("OPENAI_BASE_URL") or None)
         self.default_model = default_model
         self.total_tokens = 0
+        self.cache = LLMCache()
+
+    def _cache_lookup(self, key: str, no_cache: bool) -> str:
+        """
+        Cached response of a call, None if not cached, bypassed or missing
+        """
+        return self.cache.get(key) if self._use_cache(key, no_cache) else None
+
+    def _create(
+        self, model: str, messages: list, token_limit: int, temperature: float
+    ) -> ChatCompletion:
+        """
+        The actual network call, counts tokens
+        """
+        response = self.ai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=token_limit,
+            temperature=temperature,
+        )
+        self.total_tokens += response.usage.total_tokens
+        return response
+
+    def _complete(
+        self, model: str, messages: list, token_limit: int, temperature: float,
+        prompt_version: str, no_cache: bool,
+    ) -> str:
+        """
+        Reply text of a chat completion, from the cache if possible
+        """
+        key = self._cache_key(model, messages, token_limit, temperature, prompt_version)
+        cached = self._cache_lookup(key, no_cache)
+        if cached is not None:
+            return cached
+        print("DEBUG: AI CALL")
+        response = self._create(model, messages, token_limit, temperature)
+        reply = response.choices[0].message.content.strip()
+        if key is not None:
+            self.cache.put(key, reply)
+        return reply
 
     def response_simple(
-        self, prompt: str, model: str = None, token_limit: int = 2000
+        self,
+        prompt: str,
+        model: str = None,
+        token_limit: int = 2000,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
     ) -> str:
         """
         Get a simple response from the AI
         :param prompt: The prompt to send to the AI
         :param model: The model to use (optional, defaults to self.default_model)
+        :param temperature: 0 (default) is deterministic and cached
+        :param prompt_version: part of the cache key, bump when the prompt changes
+        :param no_cache: skip the cache lookup
         :return: The AI's response as a string
         """
-        print("DEBUG: AI CALL")
         if model is None:
             model = self.default_model
-
-        response = self.ai_client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=token_limit,
-            temperature=0.7,
-        )
-        self.total_tokens += response.usage.total_tokens
-        return response.choices[0].message.content.strip()
+        messages = chat_messages(prompt)
+        return self._complete(model, messages, token_limit, temperature, prompt_version, no_cache)
 
     def response_instruction(
-        self, prompt: str, instruction: str, model: str = None, token_limit: int = 2000
+        self,
+        prompt: str,
+        instruction: str,
+        model: str = None,
+        token_limit: int = 2000,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
     ) -> str:
         """
         Get a response from the AI with an instruction
         :param prompt: The prompt to send to the AI
         :param instruction: The instruction to give to the AI
         :param model: The model to use (optional, defaults to self.default_model)
+        :param temperature, prompt_version, no_cache: see response_simple
         :return: The AI's response as a string
         """
-        print("DEBUG: AI CALL")
         if model is None:
             model = self.default_model
-
-        response = self.ai_client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": instruction},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=token_limit,
-            temperature=0.7,
-        )
-        self.total_tokens += response.usage.total_tokens
-        return response.choices[0].message.content.strip()
+        messages = chat_messages(prompt, instruction)
+        return self._complete(model, messages, token_limit, temperature, prompt_version, no_cache)
 
     def pythoned_response_instruction(
         self,
@@ -95,51 +244,40 @@ class AIBot:
         model: str = None,
         token_limit: int = 2000,
         retries: int = 3,
-        temperature: float = 0.1,
+        temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
     ) -> tuple[bool, "datatype"]:
         """
         Get a response from the AI with an instruction and parse it into a specific type
         Have up to retries attempts to get valid response
+        Only a reply that parsed is cached (keyed on the first prompt, not the
+        corrections), temperature / prompt_version / no_cache: see response_simple
         """
-        print("DEBUG: AI CALL")
         t0 = datetime.datetime.now()
         if model is None:
             model = self.default_model
-        messages = [
-            {"role": "system", "content": instruction},
-            {"role": "user", "content": prompt},
-        ]
+        messages = chat_messages(prompt, instruction)
+        key = self._cache_key(model, messages, token_limit, temperature, prompt_version)
+        cached = self._cache_lookup(key, no_cache)
+        if cached is not None:
+            success, parsed = parse_cached(cached, datatype)
+            if success:
+                return True, parsed
+        print("DEBUG: AI CALL")
         for attempt in range(retries):
             print(f"Attempt {attempt + 1} to get a valid response...")
-            resp = self.ai_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=token_limit,
-                temperature=temperature,
-            )
-            self.total_tokens += resp.usage.total_tokens
+            resp = self._create(model, messages, token_limit, temperature)
             reply = resp.choices[0].message.content.strip()
-            try:
-                parsed = ast.literal_eval(reply)
-                if isinstance(parsed, datatype):
-                    print("DEBUG: Parsed response successfully:" + str(parsed))
-                    t1 = datetime.datetime.now()
-                    print(f"Time taken to get gpt response: {t1 - t0}")
-                    return True, parsed
-                else:
-                    print(
-                        f"Attempt {attempt + 1}: Parsed type mismatch. "
-                        f"Expected {datatype}, got {type(parsed)}"
-                    )
-            except (SyntaxError, ValueError) as e:
-                print(f"Attempt {attempt + 1}: Error parsing response: {e}")
-                messages.append({"role": "assistant", "content": reply})
-                correction = (
-                    f"Your last response was not a valid {datatype.__name__}. \n"
-                    f"Please ensure your response is a valid Python {datatype.__name__}.\n"
-                )
-                messages.append({"role": "user", "content": correction})
-                time.sleep(0.1)  # Optional: wait before retrying
+            success, parsed = parse_attempt(messages, reply, datatype, attempt)
+            if success:
+                print("DEBUG: Parsed response successfully:" + str(parsed))
+                t1 = datetime.datetime.now()
+                print(f"Time taken to get gpt response: {t1 - t0}")
+                if key is not None:
+                    self.cache.put(key, reply)
+                return True, parsed
+            time.sleep(0.1)  # Optional: wait before retrying
         print(f"Failed to get a valid response after {retries} attempts.")
         return False, None
 
@@ -148,29 +286,32 @@ class AIBot:
         prompt_dict: dict,
         model: str = None,
         token_limit: int = 2000,
-        response_temperature: float = 0.7,
+        response_temperature: float = 0.0,
+        prompt_version: str = None,
+        no_cache: bool = False,
     ) -> ChatCompletion:
         """
         Get a response from the AI using a dictionary of prompts
         :param prompt_dict: A dictionary where keys are roles and values are messages
         :param model: The model to use (optional, defaults to self.default_model)
-        :param response_temperature: The temperature to use for the response (default is 0.7)
+        :param response_temperature: The temperature to use for the response (default is 0,
+            deterministic and cached)
+        :param prompt_version, no_cache: see response_simple
         :return: The AI's response as a string
         NOTE: the keys in prompt_dict should be 'system', 'user', or 'assistant' and its value is the content
         """
-        print("DEBUG: AI CALL")
         if model is None:
             model = self.default_model
 
         messages = [
             {"role": role, "content": content} for role, content in prompt_dict.items()
         ]
-
-        response = self.ai_client.chat.completions.create(
-            model=model,
-            messages=messages,
-            max_tokens=token_limit,
-            temperature=response_temperature,
-        )
-        self.total_tokens += response.usage.total_tokens
+        key = self._cache_key(model, messages, token_limit, response_temperature, prompt_version)
+        cached = self._cache_lookup(key, no_cache)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        print("DEBUG: AI CALL")
+        response = self._create(model, messages, token_limit, response_temperature)
+        if key is not None:
+            self.cache.put(key, response.model_dump_json())
         return response
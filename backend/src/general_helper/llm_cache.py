@@ -0,0 +1,278 @@
+"""
+Cache of LLM responses, used inside AIBot
+
+Identical prompts sent with deterministic settings get the same answer, so
+the answer is stored and reused instead of going to the network again.
+Key: sha256 of (model, messages, temperature, max_tokens, prompt version).
+Only calls with temperature <= LLM_CACHE_MAX_TEMPERATURE (default 0) are
+cached, sampled answers are not meant to be reused.
+
+Two tiers:
+- memory: per-worker LRU, shared by every LLMCache object
+- store (LLM_CACHE_STORE): "sqlite" (file at LLM_CACHE_PATH), "postgres"
+  (llm_cache table, see README) or "memory" (default, no second tier)
+Both expire entries after LLM_CACHE_TTL_HOURS and keep at most
+LLM_CACHE_MAX_ENTRIES, least recently used entries are evicted first.
+Store errors never fail a call, it is then just a miss.
+
+Sample usage:
+cache = LLMCache()
+key = LLMCache.make_key(model, messages, temperature, max_tokens, prompt_version)
+reply = cache.get(key)  # None on a miss
+cache.put(key, reply)
+print(llm_cache.stats())
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+STORES = ("memory", "sqlite", "postgres")
+
+# Per worker counters, see stats
+_counters = {"hits_memory": 0, "hits_store": 0, "misses": 0, "bypassed": 0, "stored": 0, "errors": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def stats() -> dict:
+    """
+    This worker's hits (per tier), misses, bypassed lookups (no_cache),
+    stored responses and store errors
+    """
+    with _counters_lock:
+        result = dict(_counters)
+    lookups = result["hits_memory"] + result["hits_store"] + result["misses"]
+    result["hit_rate"] = (
+        round((result["hits_memory"] + result["hits_store"]) / lookups, 3) if lookups else 0.0
+    )
+    return result
+
+
+class LLMCache:
+    """
+    Usage: see the module docstring
+    """
+
+    _memory = OrderedDict()  # key -> (created_at, response)
+    _lock = threading.Lock()
+    _database = None  # DBConn of the postgres store, created on first use
+    _sqlite_ready = set()  # sqlite paths whose table exists
+
+    def __init__(self) -> None:
+        load_dotenv()
+        self.store = os.getenv("LLM_CACHE_STORE", "memory")
+        if self.store not in STORES:
+            print(f"WARNING: unknown LLM_CACHE_STORE {self.store}, using memory")
+            self.store = "memory"
+        self.sqlite_path = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+        self.ttl_seconds = float(os.getenv("LLM_CACHE_TTL_HOURS", "720")) * 3600
+        self.max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+        self.max_temperature = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0"))
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        prompt_version: str = None,
+    ) -> str:
+        """
+        Cache key of one completion request
+        """
+        raw = json.dumps(
+            [model, messages, float(temperature), max_tokens, prompt_version],
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def cacheable(self, temperature: float) -> bool:
+        """
+        Whether a call with this temperature is cached at all
+        """
+        return temperature <= self.max_temperature
+
+    def get(self, key: str) -> str:
+        """
+        Cached response or None if missing/expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    _count("hits_memory")
+                    print("DEBUG: LLM cache hit (memory)")
+                    return entry[1]
+                del self._memory[key]
+        found = None
+        try:
+            if self.store == "sqlite":
+                found = self._sqlite_get(key, now)
+            elif self.store == "postgres":
+                found = self._postgres_get(key)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: LLM cache store unavailable: {e}")
+            _count("errors")
+        if found is None:
+            _count("misses")
+            return None
+        self._remember(key, found[0], found[1])
+        _count("hits_store")
+        print(f"DEBUG: LLM cache hit ({self.store})")
+        return found[1]
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response in every tier
+        """
+        now = time.time()
+        self._remember(key, now, response)
+        _count("stored")
+        try:
+            if self.store == "sqlite":
+                self._sqlite_put(key, response, now)
+            elif self.store == "postgres":
+                self._postgres_put(key, response)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"WARNING: could not store LLM response: {e}")
+            _count("errors")
+
+    @staticmethod
+    def count_bypass() -> None:
+        """
+        A cacheable call that skipped the lookup (no_cache)
+        """
+        _count("bypassed")
+
+    def _remember(self, key: str, created_at: float, response: str) -> None:
+        """
+        Put an entry in the memory tier, evicting the least recently used
+        """
+        with self._lock:
+            self._memory[key] = (created_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _sqlite_connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.sqlite_path, timeout=5)
+        if self.sqlite_path not in self._sqlite_ready:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                """
+            )
+            conn.commit()
+            self._sqlite_ready.add(self.sqlite_path)
+        return conn
+
+    def _sqlite_get(self, key: str, now: float):
+        conn = self._sqlite_connect()
+        try:
+            row = conn.execute(
+                "SELECT created_at, response FROM llm_cache WHERE cache_key = ? AND created_at > ?;",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE cache_key = ?;", (now, key))
+                conn.commit()
+        finally:
+            conn.close()
+        return row
+
+    def _sqlite_put(self, key: str, response: str, now: float) -> None:
+        conn = self._sqlite_connect()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (cache_key, response, created_at, last_used)
+                VALUES (?, ?, ?, ?);
+                """,
+                (key, response, now, now),
+            )
+            # Expired entries first, then everything past the LRU capacity
+            conn.execute(
+                """
+                DELETE FROM llm_cache
+                WHERE created_at < ?
+                   OR cache_key IN (
+                        SELECT cache_key FROM llm_cache
+                        ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                   );
+                """,
+                (now - self.ttl_seconds, self.max_entries),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    @classmethod
+    def _get_database(cls):
+        # pylint: disable=import-outside-toplevel
+        from ..db_helper.dbconn import DBConn
+
+        with cls._lock:
+            if cls._database is None:
+                cls._database = DBConn()
+        return cls._database
+
+    def _postgres_get(self, key: str):
+        rows = self._get_database().run_sql(
+            """
+            UPDATE llm_cache SET last_used = now()
+            WHERE cache_key = %s AND created_at > now() - make_interval(secs => %s)
+            RETURNING response, created_at;
+            """,
+            (key, self.ttl_seconds),
+        )
+        if not rows:
+            return None
+        return rows[0]["created_at"].timestamp(), rows[0]["response"]
+
+    def _postgres_put(self, key: str, response: str) -> None:
+        database = self._get_database()
+        database.run_sql(
+            """
+            INSERT INTO llm_cache (cache_key, response) VALUES (%s, %s)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                response = EXCLUDED.response, created_at = now(), last_used = now();
+            """,
+            (key, response),
+        )
+        database.run_sql(
+            """
+            DELETE FROM llm_cache
+            WHERE created_at < now() - make_interval(secs => %s)
+               OR cache_key IN (
+                    SELECT cache_key FROM llm_cache
+                    ORDER BY last_used DESC OFFSET %s
+               );
+            """,
+            (self.ttl_seconds, self.max_entries),
+        )
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        """
+        Drop the memory tier of this worker
+        """
+        with cls._lock:
+            cls._memory.clear()
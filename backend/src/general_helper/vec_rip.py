@@ -1,25 +1,33 @@
 """
 Vector removal utility for resume data
 Removes vector data from resume dictionaries to reduce payload size for frontend
+
+Line vectors live in the line_vecs table now, so most rows have nothing to rip.
+Only the branches that actually hold vector data are copied, the rest of the
+structure is shared with the input (which is never modified).
 """
 
-import copy
 from typing import Dict, Any, List, Union
 
+# aux_info keys that belong to the line vector cache
+VEC_KEYS = ("vec", "vec_hash", "vec_model")
+
 
 def vec_rip(
     data: Union[Dict[str, Any], List[Dict[str, Any]]],
 ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Recursively removes vector data from resume dictionary responses.
-    This function removes 'vec' fields from 'aux_info' dictionaries throughout
-    the nested structure to reduce payload size when sending to frontend.
+    This function removes the vector cache fields (see VEC_KEYS) from 'aux_info'
+    dictionaries throughout the nested structure to reduce payload size when
+    sending to frontend.
 
     Args:
         data: Dictionary or list of dictionaries containing resume data with vectors
 
     Returns:
-        Clean dictionary/list with all vector data removed
+        Clean dictionary/list with all vector data removed.
+        The input is not modified; parts without vectors are shared, not copied.
 
     Example:
         # Single dictionary
@@ -30,44 +38,38 @@ def vec_rip(
     """
     if data is None:
         return data
+    return _remove_vectors_recursive(data)
 
-    # Handle list of dictionaries
-    if isinstance(data, list):
-        return [vec_rip(item) for item in data]
-
-    # Handle single dictionary
-    if isinstance(data, dict):
-        # Create a deep copy to avoid modifying the original
-        clean_data = copy.deepcopy(data)
-
-        # Recursively process the dictionary
-        _remove_vectors_recursive(clean_data)
-
-        return clean_data
 
-    # Return unchanged for non-dict, non-list types
-    return data
-
-
-def _remove_vectors_recursive(obj: Any) -> None:
+def _remove_vectors_recursive(obj: Any) -> Any:
     """
     Helper function to recursively remove vectors from nested structures.
-    Modifies the object in place.
+    Returns obj itself when nothing under it holds vectors.
 
     Args:
         obj: Object to process (dict, list, or other)
     """
     if isinstance(obj, dict):
-        # Remove 'vec' from 'aux_info' if it exists
-        if "aux_info" in obj and isinstance(obj["aux_info"], dict):
-            if "vec" in obj["aux_info"]:
-                del obj["aux_info"]["vec"]
-
-        # Recursively process all values in the dictionary
-        for value in obj.values():
-            _remove_vectors_recursive(value)
-
-    elif isinstance(obj, list):
-        # Recursively process all items in the list
-        for item in obj:
-            _remove_vectors_recursive(item)
+        result = None  # only allocated once something changes
+        for key, value in obj.items():
+            if (
+                key == "aux_info"
+                and isinstance(value, dict)
+                and any(vec_key in value for vec_key in VEC_KEYS)
+            ):
+                new_value = {k: v for k, v in value.items() if k not in VEC_KEYS}
+            else:
+                new_value = _remove_vectors_recursive(value)
+            if new_value is not value:
+                if result is None:
+                    result = dict(obj)
+                result[key] = new_value
+        return obj if result is None else result
+
+    if isinstance(obj, list):
+        new_list = [_remove_vectors_recursive(item) for item in obj]
+        if all(new is old for new, old in zip(new_list, obj)):
+            return obj
+        return new_list
+
+    return obj
@@ -40,6 +40,8 @@ class Item:
         self.cate_scores = {}
         self.aux_info = {}
         self.style = ""
+        # (template, positions of the chosen lines) -> (height, version_build)
+        self._version_memo = {}
         if class_dict is not None:
             if class_dict["aux_info"]["type"] != "items":
                 raise ValueError(
@@ -75,9 +77,15 @@ class Item:
         """
         returns an array where the ith element is a dict of the total score of
         using the first i highest scoring lines of this item.
+        Heights and version builds only depend on which lines are used (and
+        their order), they are memoized so scoring the same item against
+        several job descriptions only builds each line set once.
         """
         list_of_items: List[dict] = []
         length = len(self.line_objs)
+        # Lines are fixed per Item, so a line set is keyed by positions; the
+        # template object itself is in the key (ids could be reused)
+        position = {id(line): pos for pos, line in enumerate(self.line_objs)}
         for i in range(1, length + 1):
             top_k = self.top_k_lines(self.line_objs, i)
             total_score = 0
@@ -86,15 +94,20 @@ class Item:
             total_score = (
                 total_score * self.cate_scores["weight"] + self.cate_scores["bias"]
             )
-            top_k_contents = [line.content for line in top_k]
+            memo_key = (templ, tuple(position[id(line)] for line in top_k))
+            if memo_key not in self._version_memo:
+                top_k_contents = [line.content for line in top_k]
+                self._version_memo[memo_key] = (
+                    templ.item_height_calculator(self, top_k),
+                    templ.item_builder(self.titles, top_k_contents, self.style),
+                )
+            height, version_build = self._version_memo[memo_key]
 
             item = {
                 "numLines": i,
                 "score": total_score,
-                "height": templ.item_height_calculator(self, top_k),
-                "version_build": templ.item_builder(
-                    self.titles, top_k_contents, self.style
-                ),
+                "height": height,
+                "version_build": version_build,
             }
             list_of_items.append(item)
         return list_of_items
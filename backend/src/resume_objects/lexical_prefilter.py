@@ -0,0 +1,95 @@
+"""
+Cheap lexical first stage for line_eval on very large resumes
+
+Every line without a cached vector is scored with BM25 against each
+requirement sentence (best requirement wins, like the dense max over
+requirements), and only the top N of them go through the dense encoder. The
+rest get a floor score. Lines whose vector is cached skip the prefilter and
+are always scored densely (one matrix row, no encoding).
+
+Config (environment, both overridable per call):
+- LINE_PREFILTER_TOP_N: candidates kept, 0 (default) turns the stage off
+- LINE_PREFILTER_FLOOR: score (0-10 scale) of lines that are not candidates
+
+recall_at_k measures how many of the best dense lines survive the prefilter,
+see segment_tests/prefilter_test.py
+"""
+
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def default_top_n() -> int:
+    """
+    LINE_PREFILTER_TOP_N, 0 means off
+    """
+    load_dotenv()
+    return int(os.getenv("LINE_PREFILTER_TOP_N", "0"))
+
+
+def default_floor() -> float:
+    """
+    LINE_PREFILTER_FLOOR, default 0
+    """
+    load_dotenv()
+    return float(os.getenv("LINE_PREFILTER_FLOOR", "0"))
+
+
+def bm25_scores(requirements: list[str], texts: list[str]) -> np.ndarray:
+    """
+    BM25 of every text (document) against every requirement (query), max over
+    requirements, shape (N,)
+    """
+    # pylint: disable=import-outside-toplevel
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vectorizer = CountVectorizer(lowercase=True, stop_words="english")
+    try:
+        counts = vectorizer.fit_transform(texts).tocsr().astype(np.float64)  # (N, V)
+    except ValueError:
+        # Only stop words / empty lines, nothing to match on
+        return np.zeros(len(texts))
+    doc_len = np.asarray(counts.sum(axis=1)).ravel()
+    avg_len = doc_len.mean() if doc_len.mean() > 0 else 1.0
+    doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log(1.0 + (len(texts) - doc_freq + 0.5) / (doc_freq + 0.5))
+    # BM25 term weight of each (line, term) pair, sparse like counts
+    weights = counts.copy()
+    row_len = np.repeat(doc_len, np.diff(counts.indptr))
+    tf = weights.data
+    weights.data = (
+        idf[weights.indices]
+        * tf
+        * (BM25_K1 + 1)
+        / (tf + BM25_K1 * (1 - BM25_B + BM25_B * row_len / avg_len))
+    )
+    queries = (vectorizer.transform(requirements) > 0).astype(np.float64)  # (R, V)
+    return np.asarray((weights @ queries.T).max(axis=1).todense()).ravel()
+
+
+def select_candidates(requirements: list[str], texts: list[str], top_n: int) -> list[int]:
+    """
+    Indices of the top_n texts by BM25, in input order
+    Ties at the cut are broken by position, so the result is deterministic
+    """
+    if top_n <= 0 or top_n >= len(texts):
+        return list(range(len(texts)))
+    scores = bm25_scores(requirements, texts)
+    order = np.argsort(-scores, kind="stable")
+    return sorted(int(idx) for idx in order[:top_n])
+
+
+def recall_at_k(dense_scores: np.ndarray, candidates: list[int], k: int) -> float:
+    """
+    Share of the k best lines by full dense scoring that are candidates
+    """
+    k = min(k, len(dense_scores))
+    if k == 0:
+        return 1.0
+    best = set(int(idx) for idx in np.argsort(-dense_scores, kind="stable")[:k])
+    return len(best & set(candidates)) / float(k)
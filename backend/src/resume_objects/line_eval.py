@@ -2,19 +2,103 @@
 
 the line_eval function scores every item passed in
 takes in a list of requirements (string) and a list of items (Item class)
-currently, no cache is used, could be a function for the future
+the model is shared across requests through the model registry,
+all encoding goes through encoder.encode_texts
 """
 
-import os
-from dotenv import load_dotenv
 import numpy as np
-import gc
-import torch
 
-from sentence_transformers import SentenceTransformer
+from ..embed_helper import encoder
+from ..embed_helper import vec_cache
+from ..embed_helper.global_vecs import GlobalVecStore
+from . import lexical_prefilter
 
 
-def line_eval(requirements: list[str], lines: list, no_cache: bool = False) -> bool:
+def encode_requirements(requirements: list[str]) -> np.ndarray:
+    """
+    Embeds the requirement sentences with the shared model
+    Returns a normalized array of shape (R, D)
+    """
+    return encoder.encode_texts(requirements)
+
+
+def _cached_vectors(lines: list, no_cache: bool, request_stats: vec_cache.CacheStats) -> list:
+    """
+    Cached vector of every line, None where it is missing or stale
+    """
+    model_id = encoder.model_id()
+    if no_cache:
+        request_stats.misses += len(lines)
+        return [None] * len(lines)
+    return [vec_cache.lookup(ln, model_id, request_stats) for ln in lines]
+
+
+def _encode_missing(
+    lines: list, line_vecs: list, to_encode: list[int], global_store: GlobalVecStore
+) -> None:
+    """
+    Encode the lines at to_encode (through global_store if given), store the
+    vectors on the lines and in line_vecs
+    """
+    if not to_encode:
+        return
+    model_id = encoder.model_id()
+    texts = [lines[idx].content_str for idx in to_encode]
+    if global_store is not None:
+        new_vecs = global_store.encode(texts)  # shape (len(to_encode), D)
+    else:
+        new_vecs = encoder.encode_texts(texts)
+    for idx, vec in zip(to_encode, new_vecs):
+        vec_cache.store(lines[idx], vec, model_id)
+        line_vecs[idx] = vec
+
+
+def _record_stats(request_stats: vec_cache.CacheStats, cache_stats: vec_cache.CacheStats) -> None:
+    print(f"DEBUG: line vector cache: {request_stats}")
+    if cache_stats is not None:
+        cache_stats.record(request_stats)
+
+
+def _line_vectors(
+    lines: list,
+    no_cache: bool,
+    cache_stats: vec_cache.CacheStats,
+    global_store: GlobalVecStore,
+) -> np.ndarray:
+    """
+    Vectors of lines, shape (N, D)
+    cached vectors are reused, only new, edited or stale lines are encoded
+    (through global_store if given) and stored back on the line
+    """
+    request_stats = vec_cache.CacheStats()
+    line_vecs = _cached_vectors(lines, no_cache, request_stats)
+    to_encode = [idx for idx, vec in enumerate(line_vecs) if vec is None]
+    _encode_missing(lines, line_vecs, to_encode, global_store)
+    _record_stats(request_stats, cache_stats)
+    return np.vstack(line_vecs)
+
+
+def _normalize(raw_scores: np.ndarray) -> np.ndarray:
+    """
+    min-max of raw_scores to 0…10
+    """
+    mn, mx = raw_scores.min(), raw_scores.max()
+    if mx > mn:
+        return (raw_scores - mn) / (mx - mn) * 10.0
+    # all lines identical similarity ⇒ give them full marks
+    return np.ones_like(raw_scores) * 10.0
+
+
+def line_eval(
+    requirements: list[str],
+    lines: list,
+    no_cache: bool = False,
+    cache_stats: vec_cache.CacheStats = None,
+    req_vecs: np.ndarray = None,
+    global_store: GlobalVecStore = None,
+    prefilter_top_n: int = None,
+    prefilter_report: dict = None,
+) -> bool:
     """
     Evaluates each Line in `lines` against the set of `requirements` and
     writes back a normalized score in line.score (0–10 scale).
@@ -24,65 +108,61 @@ def line_eval(requirements: list[str], lines: list, no_cache: bool = False) -> b
       lines:        list of objects, each must have:
                       - `line.content_str` : the string to score
                       - `line.score`: will be overwritten with a float
+      no_cache:     ignore cached vectors and re-encode every line
+      cache_stats:  optional CacheStats, hit/miss counts are added to it
+      req_vecs:     optional precomputed encode_requirements(requirements)
+      global_store: optional GlobalVecStore, consulted before encoding lines
+      prefilter_top_n: lines with a cached vector are always scored densely,
+                    of the uncached lines only the top N by BM25 are encoded,
+                    the rest get LINE_PREFILTER_FLOOR (None:
+                    LINE_PREFILTER_TOP_N, 0: off), see lexical_prefilter.py
+      prefilter_report: optional dict, gets lines / candidates (lines scored
+                    densely) counts
 
     Side effects:
       Modifies each line in `lines`:
         line.score = normalized_score  # float in [0,10]
+        line.aux_info vec/vec_hash/vec_model for newly encoded lines
 
     Returns:
       True if scoring completed successfully, False otherwise.
     """
 
-    load_dotenv()
-    model_path = os.getenv("OPT_MODEL_PATH")
     try:
-        print("DEBUG: model_path:", model_path)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        print("DEBUG: script_dir:", script_dir)
-
-        model = SentenceTransformer(model_path)
-        if model:
-            print(f"DEBUG: Model loaded from {model_path}")
-        else:
-            print("DEBUG: Model failed to load")
-        req_vecs = model.encode(
-            requirements, normalize_embeddings=True, show_progress_bar=False
-        )  # shape (R, D)
-
-        # 2.0) use cache if possible
-        if not hasattr(lines[0], "sections"):
-            print("DEBUG: lines[0] missing 'sections' attribute")
-        elif not hasattr(lines[0]["sections"][0], "items"):
-            print("DEBUG: lines[0]['sections'][0] missing 'items' attribute")
-        elif not hasattr(lines[0]["sections"][0]["items"][0], "lines"):
-            print("DEBUG: lines[0]['sections'][0]['items'][0] missing 'lines' attribute")
-        elif not hasattr(lines[0]["sections"][0]["items"][0]["lines"][0], "aux_info"):
-            print("DEBUG: lines[0]['sections'][0]['items'][0]['lines'][0] missing 'aux_info' attribute")
-        elif "vec" not in lines[0]["sections"][0]["items"][0]["lines"][0].aux_info:
-            print("DEBUG: 'vec' not in lines[0]['sections'][0]['items'][0]['lines'][0].aux_info")
-        if (
-            no_cache
-            or not hasattr(lines[0], "sections")
-            or not hasattr(lines[0]["sections"][0], "items")
-            or not hasattr(lines[0]["sections"][0]["items"][0], "lines")
-            or not hasattr(lines[0]["sections"][0]["items"][0]["lines"][0], "aux_info")
-            or "vec" not in lines[0]["sections"][0]["items"][0]["lines"][0].aux_info
-        ):
-            print("DEBUG: Re-generating vectors")
-            # no cache, encode everything
-            # 2) pull out all texts and embed in one batch
-            texts = [line.content_str for line in lines]
-            line_vecs = model.encode(
-                texts, normalize_embeddings=True, show_progress_bar=False
-            )  # shape (N, D)
-            # put that shit back in
-            for ln, vec in zip(lines, line_vecs):
-                if not hasattr(ln, "aux_info"):
-                    print("DEBUG: BAD AUX INFO")
-                    ln.aux_info = {}
-                ln.aux_info["vec"] = vec
-        else:
-            line_vecs = np.vstack([ln.aux_info["vec"] for ln in lines])
+        if req_vecs is None:
+            req_vecs = encode_requirements(requirements)  # shape (R, D)
+
+        # 1b) optional lexical prefilter: cached lines cost one matrix row and
+        # are always scored, only uncached lines are filtered before encoding
+        all_lines = lines
+        request_stats = vec_cache.CacheStats()
+        all_vecs = _cached_vectors(all_lines, no_cache, request_stats)
+        uncached = [idx for idx, vec in enumerate(all_vecs) if vec is None]
+        if prefilter_top_n is None:
+            prefilter_top_n = lexical_prefilter.default_top_n()
+        kept = lexical_prefilter.select_candidates(
+            requirements, [all_lines[idx].content_str for idx in uncached], prefilter_top_n
+        )
+        to_encode = [uncached[pos] for pos in kept]
+        skipped = set(uncached) - set(to_encode)
+        scored = [idx for idx in range(len(all_lines)) if idx not in skipped]
+        lines = [all_lines[idx] for idx in scored]
+        if prefilter_report is not None:
+            prefilter_report["lines"] = len(all_lines)
+            prefilter_report["candidates"] = len(lines)
+        if skipped:
+            print(
+                f"DEBUG: lexical prefilter kept {len(to_encode)} of {len(uncached)} "
+                f"uncached lines ({len(all_lines) - len(uncached)} cached)"
+            )
+            floor = lexical_prefilter.default_floor()
+            for idx in skipped:
+                all_lines[idx].score = floor
+
+        # 2) reuse cached vectors, only encode new, edited or stale candidates
+        _encode_missing(all_lines, all_vecs, to_encode, global_store)
+        _record_stats(request_stats, cache_stats)
+        line_vecs = np.vstack([all_vecs[idx] for idx in scored])  # (N, D)
 
         # 3) compute sim‐matrix (N_lines × N_requirements)
         sim_matrix = line_vecs @ req_vecs.T
@@ -91,29 +171,59 @@ def line_eval(requirements: list[str], lines: list, no_cache: bool = False) -> b
         raw_scores = sim_matrix.max(axis=1)  # shape (N,)
 
         # 5) normalize raw_scores → 0…10
-        mn, mx = raw_scores.min(), raw_scores.max()
-        if mx > mn:
-            norm_scores = (raw_scores - mn) / (mx - mn) * 10.0
-        else:
-            # all lines identical similarity ⇒ give them full marks
-            norm_scores = np.ones_like(raw_scores) * 10.0
+        norm_scores = _normalize(raw_scores)
 
         # 6) write back into each line.score
         for line, sc in zip(lines, norm_scores):
             line.score = float(sc)
 
-        # Release model memory
-        del model
-        try:
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-        except ImportError:
-            pass
-        gc.collect()
         return True
 
     except Exception as e:
         print("DEBUG: line_eval failure. Error:", e)
         # you could log e here if you want more diagnostics
         return False
+
+
+def line_eval_batch(
+    requirement_lists: list[list[str]],
+    lines: list,
+    no_cache: bool = False,
+    cache_stats: vec_cache.CacheStats = None,
+    req_vecs_list: list = None,
+    global_store: GlobalVecStore = None,
+) -> np.ndarray:
+    """
+    Scores lines against K job descriptions at once
+    Line vectors are looked up / encoded once, the requirements of all K lists
+    are stacked and scored with a single lines × (K·R) product, then every
+    list gets its own max over its requirements and its own normalization,
+    exactly like K line_eval calls.
+
+    Args:
+      requirement_lists: K lists of requirement sentences
+      lines, no_cache, cache_stats, global_store: as in line_eval
+      req_vecs_list: optional K precomputed encode_requirements results
+
+    The lexical prefilter is not applied, candidates would differ per list.
+    line.score is NOT written, see Resume.use_batch_scores.
+
+    Returns:
+      array of shape (K, N) with scores on the 0–10 scale, None on failure
+    """
+    try:
+        if req_vecs_list is None:
+            req_vecs_list = [encode_requirements(reqs) for reqs in requirement_lists]
+        line_vecs = _line_vectors(lines, no_cache, cache_stats, global_store)  # (N, D)
+        all_req_vecs = np.vstack(req_vecs_list)  # (K·R, D)
+        sim_matrix = line_vecs @ all_req_vecs.T  # (N, K·R)
+        bounds = np.cumsum([0] + [len(vecs) for vecs in req_vecs_list])
+        return np.vstack(
+            [
+                _normalize(sim_matrix[:, start:end].max(axis=1))
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+        )
+    except Exception as e:  # pylint: disable=broad-except
+        print("DEBUG: line_eval_batch failure. Error:", e)
+        return None
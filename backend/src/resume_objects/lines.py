@@ -36,7 +36,7 @@ class Line:
         self.content_str = ""  # content_str is pure string
         self.keywords = []  # list of pure strings
         self.aux_info = {}
-        self.bot = AIBot()  # AI bot for generating scores
+        self._bot = None  # AI bot for generating scores, created on first use
 
         self.score: int = None  # Used for optimization
 
@@ -57,6 +57,15 @@ class Line:
             self.keywords = class_dict["keywords"] if "keywords" in class_dict else []
             self.aux_info = class_dict["aux_info"]
 
+    @property
+    def bot(self) -> AIBot:
+        """
+        AI bot of this line, only created when an AI call happens
+        """
+        if self._bot is None:
+            self._bot = AIBot()
+        return self._bot
+
     def content_flatten(self) -> None:
         """
         Modifies self.content_str
@@ -130,4 +139,4 @@ class Line:
         """
         Returns the total number of tokens used in the cate_score generation
         """
-        return self.bot.total_tokens
+        return self._bot.total_tokens if self._bot is not None else 0
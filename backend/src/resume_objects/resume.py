@@ -5,11 +5,22 @@ Handlles building, optimizing, etc
 
 import random
 import copy
+import time
 from datetime import datetime
 
+import numpy as np
+
 from .sections import Section
-from .line_eval import line_eval
-from ..general_helper.isa_bot import AIBot
+from .line_eval import line_eval, line_eval_batch, encode_requirements
+from ..general_helper.isa_bot import DEFAULT_MODEL, AIBot
+from ..embed_helper.vec_cache import CacheStats
+from ..embed_helper.req_cache import ReqCache
+from ..embed_helper.global_vecs import GlobalVecStore
+from ..embed_helper import encoder
+from ..embed_helper import skill_bank
+
+# Bump whenever the requirement prompt changes, cached requirements are keyed on it
+REQ_PROMPT_VERSION = "1"
 
 
 class Resume:
@@ -31,13 +42,18 @@ class Resume:
         self.section_build_results = []
         self.requirements = {}
         self.attribute_targets = {}  # dict of cate -> list of attributes
-        self.bot = AIBot()  # AI bot for generating scores
+        self._bot = None  # AI bot, created on first use, see bot
         self.optimization_result = None  # set by optimize(), see docstring for shape
         self.make_results_flattened = (
             []
         )  # Flattened list of item_core_info for optimization
         self.heading_name = ""
         self.heading_subsequent_content = []
+        self.cache_stats = CacheStats()  # line vector cache hits/misses in make()
+        self.prefilter_report = {}  # lines / candidates of the lexical prefilter in make()
+        self.batch_requirements = []  # K requirement lists of make_batch()
+        self.batch_scores = None  # (K, N lines) scores of make_batch()
+        self.req_timing = {}  # mode / ms of the last requirement parse
         if class_dict is not None:
             if class_dict["aux_info"]["type"] != "resume":
                 raise ValueError(
@@ -58,7 +74,121 @@ class Resume:
         else:
             self.aux_info = {"type": "resume"}
 
-    def make(self, job_req: str, no_cache: bool = False) -> bool:
+    @property
+    def bot(self):
+        """
+        AI bot for the requirement parse, only created when an AI call
+        happens (building, to_dict and bank mode never need one)
+        """
+        if self._bot is None:
+            self._bot = AIBot()
+        return self._bot
+
+    @bot.setter
+    def bot(self, bot) -> None:
+        self._bot = bot
+
+    def all_lines(self) -> list:
+        """
+        Every Line object of the resume, in document order
+        """
+        all_lines = []
+        for sect in self.sections:
+            for itm in sect.items:
+                all_lines.extend(itm.line_objs)
+        return all_lines
+
+    def parse_requirements(
+        self,
+        job_req: str,
+        no_cache: bool = False,
+        req_cache: ReqCache = None,
+        req_mode: str = None,
+    ) -> tuple[bool, list, np.ndarray]:
+        """
+        Turn the job description into a list of requirement sentences (AI)
+        and embed them
+        With a req_cache, a job description seen before skips both steps
+        no_cache skips the lookup, but the fresh result is still cached
+        req_mode: "ai" or "bank" (local skill bank, no AI call, see
+            skill_bank.py), None means REQ_MODE. Without a usable bank the AI
+            is used.
+        self.req_timing gets the mode actually used and its latency
+        Returns (success, requirement list, requirement vectors)
+        """
+        start = time.perf_counter()
+        if (req_mode or skill_bank.default_mode()) == "bank":
+            bank = skill_bank.get_bank()
+            if bank is not None:
+                job_requirement_list, req_vecs = bank.match(job_req)
+                if job_requirement_list:
+                    self._record_req_timing("bank", start)
+                    return True, job_requirement_list, req_vecs
+            print("WARNING: skill bank not usable, parsing requirements with AI")
+        success, job_requirement_list, req_vecs, cached = self._parse_requirements_ai(
+            job_req, no_cache, req_cache
+        )
+        self._record_req_timing("ai-cached" if cached else "ai", start)
+        return success, job_requirement_list, req_vecs
+
+    def _record_req_timing(self, mode: str, start: float) -> None:
+        self.req_timing = {"mode": mode, "ms": (time.perf_counter() - start) * 1000}
+        print(f"DEBUG: requirements ({mode}) in {self.req_timing['ms']:.1f} ms")
+
+    def _parse_requirements_ai(
+        self, job_req: str, no_cache: bool, req_cache: ReqCache
+    ) -> tuple[bool, list, np.ndarray, bool]:
+        """
+        AI path of parse_requirements, last value is whether req_cache had it
+        """
+        cache_key = None
+        if req_cache is not None:
+            # Not self.bot: a cache hit must not create a bot
+            llm_model = self._bot.default_model if self._bot is not None else DEFAULT_MODEL
+            cache_key = req_cache.make_key(
+                job_req,
+                REQ_PROMPT_VERSION,
+                llm_model,
+                encoder.model_id(),
+            )
+            if not no_cache:
+                cached = req_cache.get(cache_key)
+                if cached is not None:
+                    return True, cached[0], cached[1], True
+        # parse the job requirement
+        parse_req = (
+            "generate a list of core requirements, each in a single sentence and outlines the requirement of a single skill from the resume. The list of sentences collectively should reflect all of what the job recruiter is looking for. the length of your result list should be between 1 to 12 items. Some of the items in your list should be soft skills inferred from the job requirement or relevant knowledge requirement inferred from the company context. JOB REQUIREMENT: "
+            + job_req
+        )
+        parse_instruction = "your response must be strictly a python list of strings, as it will be parsed by a program."
+        req_success, job_requirement_list = self.bot.pythoned_response_instruction(
+            parse_req,
+            parse_instruction,
+            datatype=list,
+            prompt_version=REQ_PROMPT_VERSION,
+            no_cache=no_cache,
+        )
+        if not req_success:
+            return False, None, None, False
+        # parse_instruction is proper
+        try:
+            req_vecs = encode_requirements(job_requirement_list)
+        except Exception as e:  # pylint: disable=broad-except
+            print("DEBUG: requirement encoding failed. Error:", e)
+            return False, None, None, False
+        if req_cache is not None:
+            req_cache.put(cache_key, job_requirement_list, req_vecs)
+        return True, job_requirement_list, req_vecs, False
+
+    def make(
+        self,
+        job_req: str,
+        no_cache: bool = False,
+        req_cache: ReqCache = None,
+        global_store: GlobalVecStore = None,
+        requirements: list[str] = None,
+        req_mode: str = None,
+    ) -> bool:
         """
         Make the resume build ready
         Using AI, generate the requirement
@@ -80,33 +210,48 @@ class Resume:
         assign score to line
         assign section_make_result and make_results_flattened
         return successfulness
+
+        req_cache: optional ReqCache, see parse_requirements
+        global_store: optional GlobalVecStore, lines other users have are not encoded
+        requirements: optional ready requirement sentences, skips the AI parse
+            of job_req (offline runs, tests, benchmarks)
+        req_mode: "ai" or "bank", see parse_requirements
         """
         # New version
-        all_sects = self.sections
-        all_items = []
-        for sect in all_sects:
-            all_items.extend(sect.items)
-        all_lines = []
-        for itm in all_items:
-            all_lines.extend(itm.line_objs)
-        # parse the job requirement
-        parse_req = (
-            "generate a list of core requirements, each in a single sentence and outlines the requirement of a single skill from the resume. The list of sentences collectively should reflect all of what the job recruiter is looking for. the length of your result list should be between 1 to 12 items. Some of the items in your list should be soft skills inferred from the job requirement or relevant knowledge requirement inferred from the company context. JOB REQUIREMENT: "
-            + job_req
-        )
-        parse_instruction = "your response must be strictly a python list of strings, as it will be parsed by a program."
-        req_success, job_requirement_list = self.bot.pythoned_response_instruction(
-            parse_req, parse_instruction, datatype=list
-        )
+        all_lines = self.all_lines()
+        if requirements is not None:
+            req_success, job_requirement_list = True, list(requirements)
+            req_vecs = encode_requirements(job_requirement_list)
+        else:
+            req_success, job_requirement_list, req_vecs = self.parse_requirements(
+                job_req, no_cache, req_cache, req_mode
+            )
         if not req_success:
             print("DEBUG: parse requirement failed")
             return False
-        # parse_instruction is proper
         # call line_eval
-        if not line_eval(job_requirement_list, all_lines, no_cache):
+        if not line_eval(
+            job_requirement_list,
+            all_lines,
+            no_cache,
+            self.cache_stats,
+            req_vecs,
+            global_store,
+            prefilter_report=self.prefilter_report,
+        ):
             print("DEBUG: line_eval failed")
             return False
+        return self._make_sections()
+
+    def _make_sections(self) -> bool:
+        """
+        Make every section from the current line scores
+        Results of an earlier make are dropped first
+        """
+        self.section_make_results = []
+        self.make_results_flattened = []
         for section in self.sections:
+            section.item_make_results = []
             item_core_info = section.make()  # Deprecate requirements
             for item_info_list in item_core_info:
                 self.make_results_flattened.append(item_info_list)
@@ -116,6 +261,96 @@ class Resume:
             self.section_make_results.append(item_core_info)
         return True
 
+    def make_batch(
+        self,
+        job_reqs: list[str],
+        no_cache: bool = False,
+        req_cache: ReqCache = None,
+        global_store: GlobalVecStore = None,
+        requirements_lists: list[list[str]] = None,
+        req_mode: str = None,
+    ) -> bool:
+        """
+        Score the resume against K job descriptions in one pass
+        Requirements are parsed per job description (req_cache applies to
+        each), line vectors are fetched / encoded once and all K score
+        vectors come out of one line_eval_batch product.
+
+        Result:
+        - self.batch_requirements: K requirement lists
+        - self.batch_scores: array (K, N lines), same line order as all_lines()
+        - line scores and make results are NOT set, call use_batch_scores(k)
+          (or optimize_batch) for each job description
+        - returns successfulness
+
+        requirements_lists: optional ready requirement sentences per job
+            description, skips the AI parse (see make)
+        req_mode: "ai" or "bank", see parse_requirements
+        """
+        all_lines = self.all_lines()
+        requirement_lists, req_vecs_list = [], []
+        if requirements_lists is not None:
+            for requirements in requirements_lists:
+                requirement_lists.append(list(requirements))
+                req_vecs_list.append(encode_requirements(requirement_lists[-1]))
+        else:
+            for job_req in job_reqs:
+                req_success, job_requirement_list, req_vecs = self.parse_requirements(
+                    job_req, no_cache, req_cache, req_mode
+                )
+                if not req_success:
+                    print("DEBUG: parse requirement failed")
+                    return False
+                requirement_lists.append(job_requirement_list)
+                req_vecs_list.append(req_vecs)
+        scores = line_eval_batch(
+            requirement_lists,
+            all_lines,
+            no_cache,
+            self.cache_stats,
+            req_vecs_list,
+            global_store,
+        )
+        if scores is None:
+            print("DEBUG: line_eval_batch failed")
+            return False
+        self.batch_requirements = requirement_lists
+        self.batch_scores = scores
+        return True
+
+    def use_batch_scores(self, k: int) -> bool:
+        """
+        Switch to the scores of job description k of make_batch()
+        Writes line scores and remakes the sections, heights and version
+        builds are reused (see Item.make), so optimize() and build() then
+        work exactly as after make()
+        """
+        if self.batch_scores is None or not 0 <= k < len(self.batch_scores):
+            print(f"DEBUG: no batch scores for job description {k}")
+            return False
+        for line, score in zip(self.all_lines(), self.batch_scores[k]):
+            line.score = float(score)
+        return self._make_sections()
+
+    def optimize_batch(self, shuffle_times=2, build: bool = False) -> list:
+        """
+        Run optimize() (and build() if asked) once per job description of
+        make_batch()
+        Returns a list of K dicts:
+        - requirements: requirement sentences of the job description
+        - optimization_result: see optimize(), None if it failed
+        - pdf: bytes of build() (only with build=True)
+        """
+        results = []
+        for k, requirements in enumerate(self.batch_requirements):
+            result = {"requirements": requirements, "optimization_result": None}
+            if self.use_batch_scores(k) and self.optimize(shuffle_times):
+                result["optimization_result"] = self.optimization_result
+                if build:
+                    result["pdf"] = self.build()
+            results.append(result)
+        return results
+
     def optimize(self, shuffle_times=2) -> bool:
         """
         Optimize the resume using the AI decision generated in make()
@@ -0,0 +1,161 @@
+"""
+AsyncAIBot / SyncAIBot against the local fake OpenAI server
+Checks, with the response cache bypassed unless noted:
+- a sync wrapper call parses the reply
+- a repeated call is answered by the cache (sqlite tier), whose I/O runs
+  off the event loop thread
+- no more than AI_MAX_CONCURRENCY calls reach the server at once
+- a slow completion ends at the timeout
+- should_cancel stops waiting right away
+- Resume.make works with SyncAIBot (AI_CLIENT=async path)
+
+Usage (from repo root):
+python -m backend.src.segment_tests.async_bot_test
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from .fake_openai_server import FakeOpenAIServer
+
+server = FakeOpenAIServer().start()
+os.environ["OPENAI_BASE_URL"] = server.base_url
+os.environ["OPENAI_KEY"] = "fake-key"
+os.environ["AI_MAX_CONCURRENCY"] = "4"
+os.environ["AI_MAX_RETRIES"] = "0"
+os.environ.setdefault("EMBED_BACKEND", "hash")
+os.environ["LLM_CACHE_STORE"] = "sqlite"
+os.environ["LLM_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite3")
+
+# pylint: disable=wrong-import-position
+from ..general_helper.async_bot import SyncAIBot
+from ..resume_objects.resume import Resume
+from ..resume_objects.latex_templates import LTemplate
+from .resume_fixture import test_resume_dict
+
+INSTRUCTION = "your response must be strictly a python list of strings"
+
+
+def check(condition: bool, message: str) -> None:
+    """
+    Print the check, stop at the first failure
+    """
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        server.stop()
+        raise SystemExit(1)
+
+
+def test_basic(bot: SyncAIBot) -> None:
+    """
+    One call through the sync wrapper
+    """
+    success, parsed = bot.pythoned_response_instruction(
+        "basic", INSTRUCTION, list, no_cache=True
+    )
+    check(success and len(parsed) == 3, f"sync call parsed {parsed}")
+    check(bot.total_tokens == 20, f"tokens counted ({bot.total_tokens})")
+
+
+def test_cache(bot: SyncAIBot) -> None:
+    """
+    Second identical call comes from the cache, lookups never run on the loop
+    """
+    cache = bot.async_bot.cache
+    lookup_threads = []
+    original_get = cache.get
+
+    def recording_get(key: str) -> str:
+        lookup_threads.append(threading.current_thread().name)
+        return original_get(key)
+
+    cache.get = recording_get
+    server.reset_counters()
+    first = bot.pythoned_response_instruction("cached prompt", INSTRUCTION, list)
+    second = bot.pythoned_response_instruction("cached prompt", INSTRUCTION, list)
+    cache.get = original_get
+    check(first == second and first[0], "cached reply parsed like the first one")
+    check(server.requests == 1, f"one request for two identical calls ({server.requests})")
+    check(
+        lookup_threads and "ai-loop" not in lookup_threads,
+        f"cache lookups off the event loop ({lookup_threads})",
+    )
+
+
+def test_concurrency(bot: SyncAIBot, calls: int = 16, delay_s: float = 0.2) -> None:
+    """
+    Many threads at once, the semaphore keeps the server at <= 4 in flight
+    """
+    server.delay_s = delay_s
+    server.reset_counters()
+    results = []
+
+    def call(idx: int) -> None:
+        results.append(
+            bot.pythoned_response_instruction(f"prompt {idx}", INSTRUCTION, list, no_cache=True)
+        )
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=call, args=(idx,)) for idx in range(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    check(all(success for success, _ in results), f"{calls} concurrent calls succeeded")
+    check(server.max_in_flight <= 4, f"at most 4 in flight (saw {server.max_in_flight})")
+    check(
+        elapsed >= calls / 4 * delay_s * 0.9,
+        f"{calls} calls of {delay_s}s took {elapsed:.2f}s (limit 4 at once)",
+    )
+
+
+def test_timeout(bot: SyncAIBot) -> None:
+    """
+    Completion slower than timeout_s
+    """
+    server.delay_s = 2.0
+    t0 = time.perf_counter()
+    success, _ = bot.pythoned_response_instruction(
+        "slow", INSTRUCTION, list, no_cache=True, timeout_s=0.3
+    )
+    elapsed = time.perf_counter() - t0
+    check(not success and elapsed < 1.0, f"timed out after {elapsed:.2f}s")
+
+
+def test_cancel() -> None:
+    """
+    should_cancel turns True 0.3s into a 2s completion
+    """
+    server.delay_s = 2.0
+    deadline = time.perf_counter() + 0.3
+    bot = SyncAIBot(should_cancel=lambda: time.perf_counter() > deadline)
+    t0 = time.perf_counter()
+    success, _ = bot.pythoned_response_instruction("cancel", INSTRUCTION, list, no_cache=True)
+    elapsed = time.perf_counter() - t0
+    check(not success and elapsed < 1.0, f"cancelled after {elapsed:.2f}s")
+
+
+def test_resume_make() -> None:
+    """
+    Requirement parse of Resume.make through SyncAIBot
+    """
+    server.delay_s = 0.0
+    resume = Resume(LTemplate(), test_resume_dict)
+    resume.bot = SyncAIBot()
+    check(resume.make("Backend engineer, Python and REST", no_cache=True), "Resume.make with SyncAIBot")
+
+
+if __name__ == "__main__":
+    shared = SyncAIBot()
+    test_basic(shared)
+    test_cache(shared)
+    test_concurrency(shared)
+    test_timeout(shared)
+    test_cancel()
+    test_resume_make()
+    time.sleep(0.1)
+    server.stop()
+    print("all async bot checks passed")
@@ -0,0 +1,127 @@
+"""
+Benchmark the embedding backends on resume sized inputs
+For each backend (own subprocess, so RSS is not shared): load time, per-line
+encode latency for 40/80/150 line resumes, RSS after loading and after encoding.
+Then checks that onnx cosine scores match torch within tolerance.
+
+Usage (from repo root):
+python -m backend.src.segment_tests.backend_bench [backend ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from .resume_fixture import test_resume_dict
+from ..embed_helper.embed_backends import BACKENDS
+
+RESUME_SIZES = [40, 80, 150]
+REPEATS = 3
+TOLERANCE = 1e-3
+REQUIREMENTS = [
+    "Strong Python backend development.",
+    "Experience building REST APIs.",
+    "Familiarity with AWS deployments.",
+    "Experience with relational databases such as PostgreSQL.",
+]
+
+
+def fixture_lines(count: int) -> list[str]:
+    """
+    count lines taken from the fixture resume, repeated with a suffix when needed
+    """
+    base = [
+        line["content_str"]
+        for sect in test_resume_dict["sections"]
+        for item in sect["items"]
+        for line in item["lines"]
+    ]
+    return [
+        base[i % len(base)] + ("" if i < len(base) else f" ({i // len(base)})")
+        for i in range(count)
+    ]
+
+
+def rss_mb() -> float:
+    """
+    Resident set size of this process in MB (linux)
+    """
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for row in f:
+            if row.startswith("VmRSS:"):
+                return int(row.split()[1]) / 1024.0
+    return 0.0
+
+
+def run_one(name: str) -> dict:
+    """
+    Measure a single backend in this process
+    """
+    result = {"backend": name, "rss_start_mb": rss_mb()}
+    backend = BACKENDS[name]()
+    t0 = time.perf_counter()
+    backend.encode(["load"])
+    result["load_s"] = time.perf_counter() - t0
+    result["rss_loaded_mb"] = rss_mb()
+    for size in RESUME_SIZES:
+        texts = fixture_lines(size)
+        timings = []
+        for _ in range(REPEATS):
+            t0 = time.perf_counter()
+            backend.encode(texts)
+            timings.append(time.perf_counter() - t0)
+        result[f"ms_per_line_{size}"] = min(timings) / size * 1000.0
+    result["rss_peak_mb"] = rss_mb()
+    return result
+
+
+def compare_scores(names: list[str]) -> None:
+    """
+    Max difference of line x requirement cosine scores against the first backend
+    """
+    texts = fixture_lines(RESUME_SIZES[-1])
+    scores = {}
+    for name in names:
+        backend = BACKENDS[name]()
+        scores[name] = backend.encode(texts) @ backend.encode(REQUIREMENTS).T
+    reference = names[0]
+    for name in names[1:]:
+        max_diff = float(np.abs(scores[name] - scores[reference]).max())
+        status = "OK" if max_diff <= TOLERANCE else "OVER TOLERANCE"
+        print(f"{name} vs {reference}: max cosine diff {max_diff:.2e} ({status})")
+        if max_diff > TOLERANCE:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--single":
+        print(json.dumps(run_one(sys.argv[2])))
+        sys.exit(0)
+    backend_names = sys.argv[1:] or ["torch", "onnx"]
+    for backend_name in backend_names:
+        proc = subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--single", backend_name],
+            capture_output=True,
+            text=True,
+            check=False,
+            env=os.environ.copy(),
+        )
+        if proc.returncode != 0:
+            print(f"{backend_name}: FAILED\n{proc.stderr[-2000:]}")
+            continue
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{backend_name}: load {report['load_s']:.2f}s, "
+            + ", ".join(
+                f"{size} lines {report[f'ms_per_line_{size}']:.2f} ms/line"
+                for size in RESUME_SIZES
+            )
+            + f", RSS {report['rss_loaded_mb']:.0f} MB loaded"
+            + f" / {report['rss_peak_mb']:.0f} MB after encoding"
+        )
+    if len(backend_names) > 1:
+        compare_scores(backend_names)
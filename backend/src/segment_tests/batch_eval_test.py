@@ -0,0 +1,82 @@
+"""
+Batch scoring of one resume against several job descriptions
+Checks that Resume.make_batch + optimize_batch pick the same item versions
+as one make -> optimize run per job description, and compares the time of
+both. Runs offline with the hash embedding backend, like offline_pipeline.
+
+Usage (from repo root):
+python -m backend.src.segment_tests.batch_eval_test [copies]
+copies: how many times the job descriptions are repeated (K = 3 * copies)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Must be set before the encoder picks its backend
+os.environ["EMBED_BACKEND"] = "hash"
+
+# pylint: disable=wrong-import-position
+from .resume_fixture import test_resume_dict
+from .quant_test import JOB_REQUIREMENTS
+from ..resume_objects.resume import Resume
+from ..resume_objects.latex_templates import LTemplate
+
+
+def sequential(template: LTemplate, requirement_lists: list) -> tuple[list, list, float]:
+    """
+    One make -> optimize per job description, each on a fresh Resume
+    Returns (optimization results, line scores, seconds)
+    """
+    results, scores = [], []
+    t0 = time.perf_counter()
+    for requirements in requirement_lists:
+        resume = Resume(template, test_resume_dict)
+        if not resume.make("", no_cache=True, requirements=requirements):
+            raise RuntimeError("make failed")
+        if not resume.optimize():
+            raise RuntimeError("optimize failed")
+        results.append(resume.optimization_result)
+        scores.append([line.score for line in resume.all_lines()])
+    return results, scores, time.perf_counter() - t0
+
+
+def batched(template: LTemplate, requirement_lists: list) -> tuple[list, np.ndarray, float]:
+    """
+    make_batch + optimize_batch on one Resume
+    Returns (optimization results, line scores, seconds)
+    """
+    t0 = time.perf_counter()
+    resume = Resume(template, test_resume_dict)
+    if not resume.make_batch([], no_cache=True, requirements_lists=requirement_lists):
+        raise RuntimeError("make_batch failed")
+    results = resume.optimize_batch()
+    seconds = time.perf_counter() - t0
+    return [result["optimization_result"] for result in results], resume.batch_scores, seconds
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    req_lists = list(JOB_REQUIREMENTS.values()) * copies
+    ltemplate = LTemplate()
+    seq_results, seq_scores, seq_s = sequential(ltemplate, req_lists)
+    batch_results, batch_scores, batch_s = batched(ltemplate, req_lists)
+
+    max_diff = float(np.abs(np.array(seq_scores) - batch_scores).max())
+    same = sum(1 for a, b in zip(seq_results, batch_results) if a == b)
+    print(f"K = {len(req_lists)} job descriptions")
+    print(f"max line score difference: {max_diff:.2e}")
+    print(f"identical optimization results: {same} of {len(req_lists)}")
+    print(f"sequential: {seq_s * 1000:.1f} ms, batch: {batch_s * 1000:.1f} ms")
+    if max_diff > 1e-4 or same != len(req_lists):
+        raise SystemExit("ERROR: batch scoring differs from sequential scoring")
+
+    # Builds of different job descriptions share item version builds
+    template_resume = Resume(ltemplate, test_resume_dict)
+    template_resume.make_batch([], no_cache=True, requirements_lists=req_lists[:2])
+    pdfs = [result["pdf"] for result in template_resume.optimize_batch(build=True)]
+    if not all(pdf.startswith(b"%PDF") for pdf in pdfs):
+        raise SystemExit("ERROR: batch build did not produce PDFs")
+    print(f"batch builds: {[len(pdf) for pdf in pdfs]} bytes")
@@ -0,0 +1,76 @@
+"""
+Tune ENCODE_BUCKETS on resume shaped input
+Encodes the fixture resume lines plus a few long job description paragraphs
+with each bucket spec, prints per bucket timing and the total, and checks the
+vectors (and their order) match the plain backend encode.
+
+Usage (from repo root, OPT_MODEL_PATH set):
+python -m backend.src.segment_tests.bucket_bench ["32:128,64:64,128:32" ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from .backend_bench import fixture_lines
+from ..embed_helper.embed_backends import get_backend
+from ..embed_helper.length_buckets import LengthBucketer, parse_buckets
+
+REPEATS = 3
+TOLERANCE = 1e-3
+DEFAULT_SPECS = ["512:32", "32:128,64:64,128:32,512:16", "16:256,32:128,64:64,512:8"]
+JOB_DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and operate the "
+    "services behind our product. You will own REST APIs written in Python, "
+    "work with PostgreSQL and Redis, deploy on AWS with Docker and Terraform, "
+    "and collaborate with frontend, data and product teams. "
+)
+
+
+def workload() -> list[str]:
+    """
+    Fixture lines, short skill lists and a few very long JD paragraphs, mixed
+    """
+    texts = fixture_lines(120)
+    texts += ["Python, SQL, Docker", "React", "AWS, GCP"] * 5
+    texts += [JOB_DESCRIPTION * repeat for repeat in (2, 4, 8)]
+    return texts
+
+
+def run_spec(backend, spec: str, texts: list[str], reference: np.ndarray) -> None:
+    """
+    Time one bucket spec and check it against the reference vectors
+    """
+    bucketer = LengthBucketer(backend.token_lengths, backend.encode_batch, parse_buckets(spec))
+    timings = []
+    vecs = None
+    for _ in range(REPEATS):
+        bucketer.reset_stats()
+        t0 = time.perf_counter()
+        vecs = bucketer.encode(texts)
+        timings.append(time.perf_counter() - t0)
+    max_diff = float(np.abs(vecs - reference).max())
+    status = "OK" if max_diff <= TOLERANCE else "MISMATCH"
+    print(f"\n{spec}: best {min(timings) * 1000:.1f} ms, max diff {max_diff:.2e} ({status})")
+    for label, bucket in bucketer.stats().items():
+        print(
+            f"  {label:>6}: batch {bucket['batch_size']:>4}, {bucket['texts']:>4} texts, "
+            f"{bucket['batches']:>3} batches, {bucket['avg_tokens']:6.1f} avg tokens, "
+            f"{bucket['ms_per_text']:.2f} ms/text"
+        )
+    if max_diff > TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    embed_backend = get_backend()
+    all_texts = workload()
+    t_start = time.perf_counter()
+    reference_vecs = embed_backend.encode(all_texts)
+    print(
+        f"{embed_backend.name} backend, {len(all_texts)} texts, "
+        f"unbucketed {(time.perf_counter() - t_start) * 1000:.1f} ms"
+    )
+    for bucket_spec in sys.argv[1:] or DEFAULT_SPECS:
+        run_spec(embed_backend, bucket_spec, all_texts, reference_vecs)
@@ -0,0 +1,61 @@
+"""
+Cold start of the scoring model, with and without the mmap snapshot
+Each mode runs in a fresh process: import, weight load / map and first encode
+times (model_registry.startup_timings), total time to first vector and RSS.
+
+Usage (from repo root, OPT_MODEL_PATH and OPT_MODEL_SNAPSHOT set, snapshot
+prepared with python -m backend.src.embed_helper.model_snapshot prepare):
+python -m backend.src.segment_tests.cold_start_bench
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = {"plain": {"OPT_MODEL_SNAPSHOT": ""}, "snapshot": {}}
+
+
+def run_single() -> dict:
+    """
+    Load + first encode in this process
+    """
+    t0 = time.perf_counter()
+    # pylint: disable=import-outside-toplevel
+    from ..embed_helper.model_registry import model_registry
+    from .backend_bench import rss_mb
+
+    model_registry.warm_up([model_registry.default_model_path()])
+    report = dict(model_registry.startup_timings[model_registry.default_model_path()])
+    report["total_s"] = time.perf_counter() - t0
+    report["rss_mb"] = rss_mb()
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--single":
+        print(json.dumps(run_single()))
+        sys.exit(0)
+    if not os.getenv("OPT_MODEL_SNAPSHOT"):
+        raise SystemExit("Set OPT_MODEL_SNAPSHOT to a prepared snapshot")
+    for mode, env in MODES.items():
+        proc = subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--single"],
+            capture_output=True,
+            text=True,
+            check=False,
+            env={**os.environ, **env},
+        )
+        if proc.returncode != 0:
+            print(f"{mode}: FAILED\n{proc.stderr[-2000:]}")
+            sys.exit(1)
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        weights_s = timings.get("weight_map_s", timings.get("load_s", 0.0))
+        print(
+            f"{mode:>8}: import {timings['import_s']:.2f}s, "
+            f"skeleton {timings.get('skeleton_s', 0.0):.3f}s, "
+            f"weights {weights_s:.3f}s, first encode {timings['first_encode_s']:.3f}s, "
+            f"total {timings['total_s']:.2f}s, RSS {timings['rss_mb']:.0f} MB "
+            f"({timings['source']})"
+        )
@@ -0,0 +1,94 @@
+"""
+Time of Resume(templ, dict) construction and OpenAI clients it creates
+Builds the fixture resume and a synthetic resume with [lines] lines (default
+100) [runs] times each, no AI call is made. Also reports the first AI-path
+access (resume.bot) so the cost that moved there stays visible.
+
+Usage (from repo root):
+python -m backend.src.segment_tests.construct_bench [runs] [lines]
+"""
+
+import copy
+import os
+import sys
+import time
+
+import openai
+
+# The bots want a key, nothing is ever sent
+os.environ.setdefault("OPENAI_KEY", "bench-not-used")
+
+# pylint: disable=wrong-import-position
+from .resume_fixture import test_resume_dict
+from ..resume_objects.resume import Resume
+from ..resume_objects.latex_templates import LTemplate
+
+_clients = {"created": 0}
+_original_init = openai.OpenAI.__init__
+
+
+def _counting_init(self, *args, **kwargs):
+    _clients["created"] += 1
+    _original_init(self, *args, **kwargs)
+
+
+openai.OpenAI.__init__ = _counting_init
+
+
+def synthetic_resume(line_count: int) -> dict:
+    """
+    The fixture resume with its first item's lines repeated to line_count lines
+    """
+    resume_dict = copy.deepcopy(test_resume_dict)
+    item = resume_dict["sections"][0]["items"][0]
+    template_lines = item["lines"]
+    item["lines"] = [
+        copy.deepcopy(template_lines[idx % len(template_lines)]) for idx in range(line_count)
+    ]
+    for section in resume_dict["sections"]:
+        for other in section["items"]:
+            if other is not item:
+                other["lines"] = []
+    return resume_dict
+
+
+def bench(template: LTemplate, resume_dict: dict, runs: int) -> dict:
+    """
+    Average construction ms and OpenAI clients per construction
+    """
+    line_count = sum(
+        len(item["lines"]) for section in resume_dict["sections"] for item in section["items"]
+    )
+    _clients["created"] = 0
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        Resume(template, resume_dict)
+    construct_ms = (time.perf_counter() - t0) * 1000 / runs
+    clients = _clients["created"] / runs
+    resume = Resume(template, resume_dict)
+    t0 = time.perf_counter()
+    _ = resume.bot  # first AI use
+    first_bot_ms = (time.perf_counter() - t0) * 1000
+    return {
+        "lines": line_count,
+        "construct_ms": construct_ms,
+        "clients": clients,
+        "first_bot_ms": first_bot_ms,
+    }
+
+
+if __name__ == "__main__":
+    bench_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bench_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    ltemplate = LTemplate()
+    Resume(ltemplate, test_resume_dict)  # imports and first load_dotenv out of the way
+    for label, source in (
+        ("fixture", test_resume_dict),
+        (f"{bench_lines} lines", synthetic_resume(bench_lines)),
+    ):
+        report = bench(ltemplate, source, bench_runs)
+        print(
+            f"{label} ({report['lines']} lines): construct {report['construct_ms']:.2f} ms, "
+            f"{report['clients']:.0f} OpenAI clients per resume, "
+            f"first resume.bot {report['first_bot_ms']:.2f} ms"
+        )
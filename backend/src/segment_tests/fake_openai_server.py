@@ -0,0 +1,140 @@
+"""
+Local OpenAI compatible stand-in for AI tests, no key or network needed
+Answers POST /v1/chat/completions after delay_s with a python list of
+requirement sentences (what Resume.parse_requirements asks for), and counts
+requests, the most requests in flight at once and dropped connections.
+
+Standalone (then set OPENAI_BASE_URL=http://127.0.0.1:<port>/v1):
+python -m backend.src.segment_tests.fake_openai_server [port] [delay_s]
+
+In a test:
+server = FakeOpenAIServer(delay_s=0.2).start()
+os.environ["OPENAI_BASE_URL"] = server.base_url
+...
+server.stop()
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = repr(
+    [
+        "Strong Python backend development.",
+        "Experience building REST APIs.",
+        "Clear written communication.",
+    ]
+)
+
+
+class FakeOpenAIServer:
+    """
+    Threaded HTTP server in a background thread
+    delay_s can be changed while it runs
+    """
+
+    def __init__(self, port: int = 0, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.disconnects = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        Value for OPENAI_BASE_URL
+        """
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """
+        Serve in a daemon thread
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counters(self) -> None:
+        """
+        Zero every counter
+        """
+        with self.lock:
+            self.requests = self.max_in_flight = self.disconnects = 0
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            /v1/chat/completions only
+            """
+
+            def log_message(self, *args) -> None:  # pylint: disable=arguments-differ
+                pass
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                """
+                Chat completion after the configured delay
+                """
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server.lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay_s)
+                    payload = json.dumps(
+                        {
+                            "id": f"chatcmpl-fake-{server.requests}",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": body.get("model", "fake"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "finish_reason": "stop",
+                                    "message": {"role": "assistant", "content": REPLY},
+                                }
+                            ],
+                            "usage": {
+                                "prompt_tokens": 10,
+                                "completion_tokens": 10,
+                                "total_tokens": 20,
+                            },
+                        }
+                    ).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    with server.lock:
+                        server.disconnects += 1
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+        return Handler
+
+
+if __name__ == "__main__":
+    port_arg = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    delay_arg = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    fake = FakeOpenAIServer(port_arg, delay_arg)
+    print(f"Fake OpenAI API at {fake.base_url}, {delay_arg}s per completion")
+    fake.httpd.serve_forever()
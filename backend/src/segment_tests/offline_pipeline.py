@@ -0,0 +1,61 @@
+"""
+Full Resume.make -> optimize -> build run without any network or model files
+Uses the hash embedding backend and ready requirement sentences instead of
+the AI parse, so it runs in CI and load tests. Prints the time of each step,
+fails if any step fails or the PDF is empty.
+
+Usage (from repo root):
+python -m backend.src.segment_tests.offline_pipeline [runs]
+"""
+
+import os
+import sys
+import time
+
+# Must be set before the encoder picks its backend
+os.environ["EMBED_BACKEND"] = "hash"
+
+# pylint: disable=wrong-import-position
+from .resume_fixture import test_resume_dict
+from .backend_bench import REQUIREMENTS
+from ..resume_objects.resume import Resume
+from ..resume_objects.latex_templates import LTemplate
+from ..embed_helper import encoder
+
+
+def run_once(template: LTemplate) -> dict:
+    """
+    One pipeline run on the fixture resume, returns step timings (ms)
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    resume = Resume(template, test_resume_dict)
+    timings["construct_ms"] = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    if not resume.make("", no_cache=True, requirements=REQUIREMENTS):
+        raise RuntimeError("make failed")
+    timings["make_ms"] = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    if not resume.optimize():
+        raise RuntimeError("optimize failed")
+    timings["optimize_ms"] = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    pdf_bytes = resume.build()
+    timings["build_ms"] = (time.perf_counter() - t0) * 1000
+    if not pdf_bytes.startswith(b"%PDF"):
+        raise RuntimeError("build did not produce a PDF")
+    timings["pdf_bytes"] = len(pdf_bytes)
+    return timings
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"Backend {encoder.model_id()}, {runs} runs")
+    ltemplate = LTemplate()
+    for run in range(runs):
+        report = run_once(ltemplate)
+        print(
+            f"run {run}: construct {report['construct_ms']:.1f} ms, "
+            f"make {report['make_ms']:.1f} ms, optimize {report['optimize_ms']:.1f} ms, "
+            f"build {report['build_ms']:.1f} ms, {report['pdf_bytes']} byte PDF"
+        )
@@ -0,0 +1,84 @@
+"""
+Lexical prefilter against full dense scoring on a line library
+(the fixture resume lines, or one line per row of lines.txt)
+For top N of 25/50/75% of the library: candidate count, recall@k of the best dense lines, and
+line_eval time with and without the prefilter (no vector cache, so every
+candidate is really encoded). Then checks that lines with a cached vector
+are always scored densely, whatever the prefilter keeps.
+
+Usage (from repo root, OPT_MODEL_PATH set, or EMBED_BACKEND=hash):
+python -m backend.src.segment_tests.prefilter_test [lines.txt]
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+
+from .backend_bench import fixture_lines
+from .quant_test import JOB_REQUIREMENTS
+from ..resume_objects.line_eval import line_eval, encode_requirements
+from ..resume_objects import lexical_prefilter
+from ..embed_helper import encoder
+
+TOP_N_SHARES = [0.25, 0.5, 0.75]
+RECALL_KS = [5, 10]
+MIN_RECALL_AT_10 = 0.5
+
+
+def make_lines(texts: list[str]) -> list:
+    """
+    Minimal line objects for line_eval
+    """
+    return [SimpleNamespace(content_str=text, aux_info={}, score=None) for text in texts]
+
+
+if __name__ == "__main__":
+    # Unique lines only, repeated copies would make the dense top k arbitrary
+    texts = list(dict.fromkeys(fixture_lines(60)))
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            texts = list(dict.fromkeys(row.strip() for row in f if row.strip()))
+    print(f"{len(texts)} lines, {encoder.model_id()}")
+    passed = True
+    for name, requirements in JOB_REQUIREMENTS.items():
+        req_vecs = encode_requirements(requirements)
+        dense_scores = (encoder.encode_texts(texts) @ req_vecs.T).max(axis=1)
+        t0 = time.perf_counter()
+        line_eval(requirements, make_lines(texts), no_cache=True, req_vecs=req_vecs,
+                  prefilter_top_n=0)
+        full_ms = (time.perf_counter() - t0) * 1000
+        print(f"\n{name}: full dense line_eval {full_ms:.1f} ms")
+        for share in TOP_N_SHARES:
+            top_n = int(len(texts) * share)
+            candidates = lexical_prefilter.select_candidates(requirements, texts, top_n)
+            report = {}
+            t0 = time.perf_counter()
+            line_eval(requirements, make_lines(texts), no_cache=True, req_vecs=req_vecs,
+                      prefilter_top_n=top_n, prefilter_report=report)
+            prefiltered_ms = (time.perf_counter() - t0) * 1000
+            recalls = {
+                k: lexical_prefilter.recall_at_k(dense_scores, candidates, k)
+                for k in RECALL_KS
+            }
+            print(
+                f"  top {top_n:>4}: {report['candidates']} candidates, "
+                + ", ".join(f"recall@{k} {recall:.0%}" for k, recall in recalls.items())
+                + f", line_eval {prefiltered_ms:.1f} ms"
+            )
+            if share >= 0.5 and recalls[10] < MIN_RECALL_AT_10:
+                passed = False
+
+    # Cached lines are never floored: after a full pass every vector is cached
+    requirements = next(iter(JOB_REQUIREMENTS.values()))
+    cached_lines = make_lines(texts)
+    line_eval(requirements, cached_lines, prefilter_top_n=0)
+    full_scores = [ln.score for ln in cached_lines]
+    report = {}
+    line_eval(requirements, cached_lines, prefilter_top_n=max(1, len(texts) // 4),
+              prefilter_report=report)
+    same = all(abs(a - ln.score) < 1e-6 for a, ln in zip(full_scores, cached_lines))
+    print(f"\ncached lines: {report['candidates']} of {report['lines']} scored densely, "
+          f"scores {'unchanged' if same else 'CHANGED'}")
+    passed = passed and same and report["candidates"] == report["lines"]
+    if not passed:
+        sys.exit(1)
@@ -0,0 +1,64 @@
+"""
+Ranking fidelity of the PCA projection on the fixture resume
+For several dimensions: fits on 80% of the fixture lines + requirements plus
+every skill bank sentence (the fixture alone has fewer rows than the model
+has dims), and reports on the held-out rest how line_eval rankings change
+against full vectors (see projection.fidelity). Dims the corpus cannot fit
+are capped and reported. Then checks the encoder end to end with the
+projection switched on: vector size and model id.
+
+Usage (from repo root, OPT_MODEL_PATH set):
+python -m backend.src.segment_tests.projection_test [dim ...]
+"""
+
+import os
+import sys
+import tempfile
+
+from .backend_bench import fixture_lines
+from .quant_test import JOB_REQUIREMENTS
+from ..embed_helper import encoder
+from ..embed_helper import projection
+from ..embed_helper.skill_taxonomy import bank_entries
+
+MIN_SPEARMAN = 0.8
+
+
+if __name__ == "__main__":
+    lines = fixture_lines(60)
+    requirements = [req for reqs in JOB_REQUIREMENTS.values() for req in reqs]
+    full_dim = encoder.encode_texts(lines[:1]).shape[1]
+    dims = [int(arg) for arg in sys.argv[1:]] or [full_dim // 8, full_dim // 4, full_dim // 2]
+    extra = [entry["text"] for entry in bank_entries()]
+    max_dim = projection.max_fit_dim(len(lines), len(requirements), len(extra), full_dim)
+    capped = sorted({min(dim, max_dim) for dim in dims if dim > 0})
+    for dim in dims:
+        if dim > max_dim:
+            print(f"dim {dim} is above the largest dim this corpus fits, capped at {max_dim}")
+    fitted, report = None, None
+    for dim in capped:
+        fitted, report = projection.fit_and_report(lines, requirements, dim, extra)
+        print(
+            f"dim {dim:>4} ({report['bytes_per_vec'][1]} of {report['bytes_per_vec'][0]} "
+            f"bytes): line spearman {report['line_spearman']:.3f}, "
+            f"per req {report['per_req_spearman']:.3f}, "
+            f"top-10 kept {report['top_k_overlap']:.0%}, "
+            f"max diff {report['max_score_diff']:.3f}"
+        )
+    if fitted is None:
+        print("ERROR: no dimension to fit")
+        sys.exit(1)
+    passed = report["line_spearman"] >= MIN_SPEARMAN
+
+    # End to end through the encoder, with the last (largest) projection
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "projection.npz")
+        fitted.save(path)
+        os.environ["EMBED_PROJECTION_PATH"] = path
+        vecs = encoder.encode_texts(lines[:5])
+        print(f"encoder with projection: shape {vecs.shape}, model id {encoder.model_id()}")
+        passed = passed and vecs.shape == (5, fitted.dim) and fitted.tag() in encoder.model_id()
+        os.environ["EMBED_PROJECTION_PATH"] = ""
+        print(f"encoder without projection: shape {encoder.encode_texts(lines[:5]).shape}")
+    if not passed:
+        sys.exit(1)
@@ -0,0 +1,142 @@
+"""
+Validate the dynamic int8 model (OPT_MODEL_QUANTIZE=int8) against fp32
+On the fixture resume lines, for a few job requirement sets:
+- rank agreement of the line scores (spearman and top-k overlap)
+- encode latency per line
+- model memory (parameters + buffers + packed int8 weights) and RSS growth
+
+Usage (from repo root, OPT_MODEL_PATH set):
+python -m backend.src.segment_tests.quant_test [top_k]
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from .backend_bench import fixture_lines, rss_mb
+from ..embed_helper.model_registry import model_registry
+
+REPEATS = 3
+MIN_SPEARMAN = 0.95
+JOB_REQUIREMENTS = {
+    "backend": [
+        "Strong Python backend development.",
+        "Experience building REST APIs.",
+        "Familiarity with AWS deployments.",
+        "Experience with relational databases such as PostgreSQL.",
+    ],
+    "ml": [
+        "Experience training machine learning models.",
+        "Knowledge of PyTorch or TensorFlow.",
+        "Comfortable with data analysis in pandas.",
+    ],
+    "frontend": [
+        "Building responsive user interfaces in React.",
+        "Experience with TypeScript.",
+        "Collaborating with designers on UX.",
+    ],
+}
+
+
+def _tensor_bytes(value) -> int:
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in value)
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return value.element_size() * value.nelement()
+    return 0
+
+
+def model_size_mb(model) -> float:
+    """
+    Size of the state dict tensors, counts packed int8 weights too
+    """
+    total = sum(_tensor_bytes(value) for value in model.state_dict().values())
+    return total / (1024.0 * 1024.0)
+
+
+def line_scores(model, lines: list[str], requirements: list[str]) -> np.ndarray:
+    """
+    Same scoring as line_eval: best cosine over the requirements, per line
+    """
+    line_vecs = model.encode(lines, normalize_embeddings=True, show_progress_bar=False)
+    req_vecs = model.encode(
+        requirements, normalize_embeddings=True, show_progress_bar=False
+    )
+    return (line_vecs @ req_vecs.T).max(axis=1)
+
+
+def encode_ms_per_line(model, lines: list[str]) -> float:
+    """
+    Best of REPEATS, in ms per line
+    """
+    timings = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        model.encode(lines, normalize_embeddings=True, show_progress_bar=False)
+        timings.append(time.perf_counter() - t0)
+    return min(timings) / len(lines) * 1000.0
+
+
+def top_k_overlap(reference: np.ndarray, other: np.ndarray, top_k: int) -> float:
+    """
+    Share of the reference top k lines that are also in the other top k
+    """
+    ref_top = set(np.argsort(-reference)[:top_k])
+    other_top = set(np.argsort(-other)[:top_k])
+    return len(ref_top & other_top) / float(top_k)
+
+
+def run(top_k: int = 10) -> bool:
+    """
+    Compare fp32 and int8, returns False if rankings drift too far
+    """
+    # pylint: disable=import-outside-toplevel
+    from sentence_transformers import SentenceTransformer
+
+    model_path = model_registry.default_model_path()
+    lines = fixture_lines(80)
+    rss_start = rss_mb()
+    fp32 = SentenceTransformer(model_path, device="cpu")
+    fp32.eval()
+    rss_fp32 = rss_mb()
+    int8 = model_registry.quantize_model(SentenceTransformer(model_path, device="cpu"))
+    rss_int8 = rss_mb()
+
+    print(f"Model {model_path}, {len(lines)} lines")
+    print(
+        f"Model size: fp32 {model_size_mb(fp32):.1f} MB, "
+        f"int8 {model_size_mb(int8):.1f} MB"
+    )
+    print(
+        f"RSS growth: fp32 {rss_fp32 - rss_start:.0f} MB, "
+        f"int8 {rss_int8 - rss_fp32:.0f} MB"
+    )
+    fp32_ms = encode_ms_per_line(fp32, lines)
+    int8_ms = encode_ms_per_line(int8, lines)
+    print(
+        f"Encode latency: fp32 {fp32_ms:.2f} ms/line, int8 {int8_ms:.2f} ms/line "
+        f"(x{fp32_ms / int8_ms:.2f})"
+    )
+
+    passed = True
+    for name, requirements in JOB_REQUIREMENTS.items():
+        reference = line_scores(fp32, lines, requirements)
+        quantized = line_scores(int8, lines, requirements)
+        rho = spearmanr(reference, quantized).correlation
+        overlap = top_k_overlap(reference, quantized, top_k)
+        max_diff = float(np.abs(reference - quantized).max())
+        status = "OK" if rho >= MIN_SPEARMAN else "DRIFT"
+        print(
+            f"{name}: spearman {rho:.4f}, top-{top_k} overlap {overlap:.0%}, "
+            f"max score diff {max_diff:.4f} ({status})"
+        )
+        passed = passed and rho >= MIN_SPEARMAN
+    return passed
+
+
+if __name__ == "__main__":
+    arg_top_k = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not run(arg_top_k):
+        sys.exit(1)
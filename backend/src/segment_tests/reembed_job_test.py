@@ -0,0 +1,176 @@
+"""
+Checkpoint / resume behaviour of the re-embedding job, against a stub database
+(no Postgres needed, hash embedding backend). Checks that:
+- a run stopped by a failed write keeps the checkpoint before the failed
+  batch, and the rerun starts right after it
+- a run stopped by max_seconds resumes the same way
+- across the stopped run and its rerun every user is written exactly once
+- max_lines_per_s holds the write rate
+
+Usage (from repo root):
+python -m backend.src.segment_tests.reembed_job_test
+"""
+
+import os
+import tempfile
+import time
+
+# Must be set before the encoder picks its backend
+os.environ["EMBED_BACKEND"] = "hash"
+
+# pylint: disable=wrong-import-position
+from ..embed_helper import reembed_job
+from ..embed_helper.reembed_job import ReembedJob, load_checkpoint
+from ..embed_helper import encoder
+
+USERS = 24
+LINES_PER_USER = 5
+
+
+def make_resumeinfo(user_idx: int) -> dict:
+    """
+    One section, one item, LINES_PER_USER lines (one shared by every user)
+    """
+    lines = [{"content_str": "Python, Java, SQL"}]
+    lines += [
+        {"content_str": f"user {user_idx} built feature {line_idx}"}
+        for line_idx in range(1, LINES_PER_USER)
+    ]
+    return {"sections": [{"items": [{"lines": lines}]}]}
+
+
+class StubDatabase:
+    """
+    The DBConn calls ReembedJob makes, on plain dicts
+    fail_writes_after: upsert_line_vecs_many fails once this many writes went through
+    """
+
+    def __init__(self) -> None:
+        self.data = {f"user{idx:03d}": make_resumeinfo(idx) for idx in range(USERS)}
+        self.line_vecs = {}  # uid -> {line_hash: bytes}
+        self.writes = {}  # uid -> number of writes that included the user
+        self.streamed = []  # uids in the order the last stream_sql gave them
+        self.fail_writes_after = None
+        self.write_count = 0
+
+    def table_exists(self, table_name: str) -> bool:  # pylint: disable=unused-argument
+        return False  # no global_vecs, every text is encoded
+
+    def stream_sql(self, sql_query: str, params=None, itersize: int = 500):
+        # pylint: disable=unused-argument
+        self.streamed = []
+        for uid in sorted(self.data):
+            if uid > params[0]:
+                self.streamed.append(uid)
+                yield {"uid": uid, "resumeinfo": self.data[uid]}
+
+    def fetch_line_vec_hashes_many(self, uids: list, model_id: str) -> dict:
+        # pylint: disable=unused-argument
+        return {uid: set(self.line_vecs[uid]) for uid in uids if uid in self.line_vecs}
+
+    def upsert_line_vecs_many(self, model_id: str, vecs_by_uid: dict, encoding: str) -> bool:
+        # pylint: disable=unused-argument
+        if self.fail_writes_after is not None and self.write_count >= self.fail_writes_after:
+            return False
+        self.write_count += 1
+        for uid, vecs in vecs_by_uid.items():
+            self.line_vecs.setdefault(uid, {}).update(vecs)
+            self.writes[uid] = self.writes.get(uid, 0) + 1
+        return True
+
+
+def check(condition: bool, message: str) -> None:
+    """
+    Print the check, stop at the first failure
+    """
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+
+def check_complete(database: StubDatabase) -> None:
+    """
+    Every user written exactly once, with every line
+    """
+    check(
+        sorted(database.writes) == sorted(database.data)
+        and set(database.writes.values()) == {1},
+        f"every user written exactly once ({len(database.writes)} of {USERS})",
+    )
+    check(
+        all(len(vecs) == LINES_PER_USER for vecs in database.line_vecs.values()),
+        "every line of every user has a vector",
+    )
+
+
+def test_failed_write(checkpoint_path: str) -> None:
+    """
+    Second batch fails: checkpoint stays after the first, rerun continues there
+    """
+    database = StubDatabase()
+    database.fail_writes_after = 1
+    report = ReembedJob(database, batch_lines=20, checkpoint_path=checkpoint_path).run()
+    saved = load_checkpoint(checkpoint_path, encoder.model_id())
+    check(not report["done"], "run stopped on the failed write")
+    first_batch = sorted(database.writes)
+    check(
+        saved["last_uid"] == first_batch[-1] and saved["users"] == len(first_batch),
+        f"checkpoint after the last written user ({saved['last_uid']})",
+    )
+    database.fail_writes_after = None
+    report = ReembedJob(database, batch_lines=20, checkpoint_path=checkpoint_path).run()
+    check(report["done"], "rerun finished")
+    check(
+        database.streamed[0] > first_batch[-1]
+        and database.streamed[0] == sorted(database.data)[len(first_batch)],
+        f"rerun started right after the checkpoint ({database.streamed[0]})",
+    )
+    check_complete(database)
+
+
+def test_max_seconds(checkpoint_path: str) -> None:
+    """
+    Time budget ends the first run early, the rerun finishes the rest
+    """
+    database = StubDatabase()
+    report = ReembedJob(
+        database, batch_lines=20, max_lines_per_s=200, checkpoint_path=checkpoint_path
+    ).run(max_seconds=0.2)
+    check(
+        not report["done"] and 0 < len(database.writes) < USERS,
+        f"time budget stopped the run after {len(database.writes)} users",
+    )
+    report = ReembedJob(database, batch_lines=20, checkpoint_path=checkpoint_path).run()
+    check(report["done"], "rerun finished")
+    check_complete(database)
+
+
+def test_rate_limit(checkpoint_path: str, max_lines_per_s: float = 300.0) -> None:
+    """
+    The whole job at max_lines_per_s
+    """
+    database = StubDatabase()
+    t0 = time.monotonic()
+    report = ReembedJob(
+        database, batch_lines=20, max_lines_per_s=max_lines_per_s,
+        checkpoint_path=checkpoint_path,
+    ).run()
+    elapsed = time.monotonic() - t0
+    lines = USERS * LINES_PER_USER
+    check(report["done"] and report["lines_written"] == lines, f"{lines} lines written")
+    check(
+        elapsed >= lines / max_lines_per_s * 0.9 and report["lines_per_s"] <= max_lines_per_s * 1.1,
+        f"{report['lines_per_s']:.0f} lines/s with a limit of {max_lines_per_s:.0f} "
+        f"({elapsed:.2f}s)",
+    )
+    check_complete(database)
+
+
+if __name__ == "__main__":
+    # Small user groups so batches are written while the stream is walked
+    reembed_job.USER_GROUP = 4
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_failed_write(os.path.join(tmp_dir, "failed_write.json"))
+        test_max_seconds(os.path.join(tmp_dir, "max_seconds.json"))
+        test_rate_limit(os.path.join(tmp_dir, "rate_limit.json"))
+    print("all re-embedding job checks passed")
@@ -0,0 +1,92 @@
+"""
+Requirement extraction with the local skill bank vs the AI
+Builds a bank in a temporary folder, extracts requirements from the sample
+job descriptions and prints them with the latency of each path, then runs a
+full Resume.make in bank mode (no AI call at all).
+
+Runs offline with the hash embedding backend unless a model is configured.
+The AI path is only timed with "ai" (needs OPENAI_KEY and network).
+
+Usage (from repo root):
+python -m backend.src.segment_tests.skill_bank_test [ai]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+if "ai" not in sys.argv[1:]:
+    # Must be set before the encoder picks its backend
+    os.environ.setdefault("EMBED_BACKEND", "hash")
+
+# pylint: disable=wrong-import-position
+from .resume_fixture import test_resume_dict
+from ..embed_helper import encoder
+from ..embed_helper import skill_bank
+from ..resume_objects.resume import Resume
+from ..resume_objects.latex_templates import LTemplate
+
+JOB_DESCRIPTIONS = {
+    "backend": """We are looking for a backend engineer to join our payments team.
+- 3+ years building REST APIs with Python and Django
+- Experience with PostgreSQL, Redis and Docker
+- Familiar with AWS (EC2, S3, Lambda)
+- Excellent written communication; you will work closely with product.""",
+    "ml": """Machine Learning Intern
+You will train and evaluate deep learning models in PyTorch, build data
+pipelines with Pandas and Spark, and present results to the research team.
+Coursework in statistics or Computer Science required.""",
+    "frontend": """Frontend Developer: build responsive single page applications in
+React and TypeScript. Write unit tests with Jest, care about web accessibility,
+and collaborate with designers in Figma. Strong attention to detail.""",
+}
+
+
+def time_bank(bank: skill_bank.SkillBank) -> None:
+    """
+    Requirements and latency of the bank path for every job description
+    """
+    for name, job_req in JOB_DESCRIPTIONS.items():
+        t0 = time.perf_counter()
+        requirements, req_vecs = bank.match(job_req)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"[bank] {name}: {len(requirements)} requirements in {elapsed:.1f} ms")
+        for requirement in requirements:
+            print(f"    {requirement}")
+        if req_vecs.shape != (len(requirements), bank.manifest["dim"]):
+            raise SystemExit("ERROR: requirement vectors do not match requirements")
+
+
+def time_ai(template: LTemplate) -> None:
+    """
+    Latency of the AI path (no req_cache) for every job description
+    """
+    resume = Resume(template, test_resume_dict)
+    for name, job_req in JOB_DESCRIPTIONS.items():
+        success, requirements, _ = resume.parse_requirements(job_req, req_mode="ai")
+        if not success:
+            raise SystemExit("ERROR: AI requirement parse failed")
+        print(f"[ai] {name}: {len(requirements)} requirements in {resume.req_timing['ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    ltemplate = LTemplate()
+    with tempfile.TemporaryDirectory() as bank_dir:
+        t_build = time.perf_counter()
+        manifest = skill_bank.build(bank_dir)
+        print(
+            f"Built bank of {manifest['entries']} sentences for {encoder.model_id()} "
+            f"in {time.perf_counter() - t_build:.1f} s"
+        )
+        os.environ["SKILL_BANK_PATH"] = bank_dir
+        time_bank(skill_bank.get_bank())
+
+        resume = Resume(ltemplate, test_resume_dict)
+        if not resume.make(JOB_DESCRIPTIONS["backend"], no_cache=True, req_mode="bank"):
+            raise SystemExit("ERROR: make in bank mode failed")
+        if resume.req_timing["mode"] != "bank":
+            raise SystemExit("ERROR: make did not use the skill bank")
+        print(f"make in bank mode: requirements took {resume.req_timing['ms']:.1f} ms")
+        if "ai" in sys.argv[1:]:
+            time_ai(ltemplate)
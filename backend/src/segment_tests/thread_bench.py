@@ -0,0 +1,126 @@
+"""
+Benchmark line_eval throughput with several workers on one host
+Every setting starts W worker processes (like gunicorn workers). Each worker
+applies the thread governor, warms up, waits for the others, then runs C concurrent line_eval
+threads for a fixed time with the vector cache off. Reports total calls/s
+and p50/p99 latency per setting.
+
+Settings compared by default:
+- ungoverned: EMBED_THREAD_GOVERNOR=0 (torch picks one thread per core)
+- governed: cores // workers threads per worker
+- governed+pin: same, each worker pinned to its own cores
+
+Usage (from repo root, OPT_MODEL_PATH set):
+python -m backend.src.segment_tests.thread_bench [workers] [concurrency] [seconds]
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from .backend_bench import fixture_lines, REQUIREMENTS
+
+SETTINGS = {
+    "ungoverned": {"EMBED_THREAD_GOVERNOR": "0"},
+    "governed": {"EMBED_THREAD_GOVERNOR": "1", "EMBED_CPU_PIN": "0"},
+    "governed+pin": {"EMBED_THREAD_GOVERNOR": "1", "EMBED_CPU_PIN": "1"},
+}
+LINES_PER_CALL = 40
+
+
+def worker_main(worker_index, workers, concurrency, seconds, go, results):
+    """
+    One simulated API worker, puts its latencies (s) in results
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..embed_helper import thread_governor
+
+    thread_governor.apply(workers=workers, worker_index=worker_index)
+    from ..embed_helper import encoder
+    from ..resume_objects.line_eval import line_eval, encode_requirements
+
+    encoder.warm_up()
+    req_vecs = encode_requirements(REQUIREMENTS)
+    texts = fixture_lines(LINES_PER_CALL)
+    latencies = []
+    lock = threading.Lock()
+    # Only start the clock once every worker has loaded the model
+    results.put(json.dumps({"worker": worker_index, "ready": True}))
+    go.wait()
+    stop_at = time.perf_counter() + seconds
+
+    def loop():
+        while time.perf_counter() < stop_at:
+            lines = [SimpleNamespace(content_str=t, aux_info={}, score=None) for t in texts]
+            t0 = time.perf_counter()
+            line_eval(REQUIREMENTS, lines, no_cache=True, req_vecs=req_vecs)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=loop) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(json.dumps({"worker": worker_index, "latencies": latencies}))
+
+
+def run_setting(name: str, workers: int, concurrency: int, seconds: float) -> dict:
+    """
+    All workers of one setting, returns throughput and latency percentiles
+    """
+    os.environ.update(SETTINGS[name])
+    ctx = multiprocessing.get_context("spawn")  # fresh torch per worker
+    results = ctx.Queue()
+    go = ctx.Event()
+    procs = [
+        ctx.Process(
+            target=worker_main,
+            args=(index, workers, concurrency, seconds, go, results),
+        )
+        for index in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        results.get()  # ready
+    go.set()
+    latencies = []
+    for _ in procs:
+        latencies.extend(json.loads(results.get())["latencies"])
+    for proc in procs:
+        proc.join()
+    latencies = np.array(latencies) * 1000.0
+    return {
+        "setting": name,
+        "calls": len(latencies),
+        "calls_per_s": len(latencies) / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+        "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    arg_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    arg_concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    arg_seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    os.environ["EMBED_WORKERS"] = str(arg_workers)
+    os.environ["OPT_MODEL_WARMUP"] = "1"
+    print(
+        f"{arg_workers} workers x {arg_concurrency} concurrent line_eval calls "
+        f"({LINES_PER_CALL} lines each), {arg_seconds:.0f}s per setting, "
+        f"{os.cpu_count()} cores"
+    )
+    for setting in SETTINGS:
+        report = run_setting(setting, arg_workers, arg_concurrency, arg_seconds)
+        print(
+            f"{setting:>13}: {report['calls_per_s']:7.1f} calls/s, "
+            f"p50 {report['p50_ms']:7.1f} ms, p99 {report['p99_ms']:7.1f} ms "
+            f"({report['calls']} calls)"
+        )
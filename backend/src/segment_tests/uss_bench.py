@@ -0,0 +1,121 @@
+"""
+Per-worker memory with and without loading the model before fork
+USS (unique set size: Private_Clean + Private_Dirty) is what each extra worker
+really costs, PSS splits the shared pages between the processes.
+
+Modes:
+- simulate [workers] (default): forks workers like gunicorn does, once with
+  the model loaded + frozen in the parent first (preload), once with every
+  worker loading its own model. Each worker encodes the fixture resume a few
+  times (what serving does) before it is measured.
+- pid <master_pid>: measure the workers of a running gunicorn master, e.g.
+  started with EMBED_PRELOAD=1 and then without
+
+Usage (from repo root, OPT_MODEL_PATH set):
+python -m backend.src.segment_tests.uss_bench [simulate [workers] | pid <master_pid>]
+"""
+
+import os
+import sys
+
+from .backend_bench import fixture_lines
+
+ENCODE_ROUNDS = 5
+
+
+def memory_kb(pid: int) -> dict:
+    """
+    rss, pss and uss of a process in kB, from /proc/<pid>/smaps_rollup
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as f:
+        for row in f:
+            parts = row.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def child_pids(pid: int) -> list[int]:
+    """
+    Direct children of a process (gunicorn workers of a master)
+    """
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children", encoding="utf-8") as f:
+            children.extend(int(child) for child in f.read().split())
+    return children
+
+
+def print_report(label: str, pids: list[int], parent: int = None) -> None:
+    """
+    Per worker and average USS / PSS / RSS in MB
+    """
+    reports = [memory_kb(pid) for pid in pids]
+    for pid, report in zip(pids, reports):
+        print(
+            f"  worker {pid}: USS {report['uss'] / 1024:6.1f} MB, "
+            f"PSS {report['pss'] / 1024:6.1f} MB, RSS {report['rss'] / 1024:6.1f} MB"
+        )
+    if parent is not None:
+        report = memory_kb(parent)
+        print(f"  parent {parent}: USS {report['uss'] / 1024:6.1f} MB")
+    average_uss = sum(report["uss"] for report in reports) / len(reports) / 1024
+    total_pss = sum(report["pss"] for report in reports) / 1024
+    print(f"{label}: average worker USS {average_uss:.1f} MB, workers PSS total {total_pss:.1f} MB")
+
+
+def simulate(workers: int, preload: bool) -> None:
+    """
+    Fork workers from this process and measure them once they have served
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..embed_helper.model_registry import model_registry
+
+    if preload:
+        model_registry.warm_up([model_registry.default_model_path()])
+        model_registry.freeze_for_fork()
+    lines = fixture_lines(80)
+    pids = []
+    ready_r, ready_w = os.pipe()
+    release_r, release_w = os.pipe()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            os.close(release_w)
+            model = model_registry.get_model()
+            for _ in range(ENCODE_ROUNDS):
+                model.encode(lines, normalize_embeddings=True, show_progress_bar=False)
+            os.write(ready_w, b"1")
+            os.read(release_r, 1)  # stay alive until measured
+            os._exit(0)  # pylint: disable=protected-access
+        pids.append(pid)
+    for _ in range(workers):
+        os.read(ready_r, 1)
+    print_report("preload" if preload else "no preload", pids, os.getpid())
+    os.write(release_w, b"1" * workers)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "simulate"
+    if mode == "pid":
+        master = int(sys.argv[2])
+        print_report(f"gunicorn master {master}", child_pids(master), master)
+    elif mode == "simulate":
+        worker_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+        # Separate processes so the no-preload parent never holds the model
+        for preload_mode in ("0", "1"):
+            child = os.fork()
+            if child == 0:
+                simulate(worker_count, preload_mode == "1")
+                os._exit(0)  # pylint: disable=protected-access
+            os.waitpid(child, 0)
+    else:
+        raise SystemExit(f"Unknown mode {mode}, use simulate or pid")
@@ -0,0 +1,135 @@
+"""
+Save-time vector fill against a stub database (no Postgres needed, hash
+embedding backend). Checks that:
+- only lines without a stored vector are encoded, duplicates once
+- a used up budget leaves every missing line for the background fill,
+  no budget encodes them all
+- SAVE_EMBED_BUDGET_MS sets the save budget
+- a repeated login inside LOGIN_WARMUP_INTERVAL_S schedules nothing, and
+  the debounce map drops users past the interval
+
+Usage (from repo root):
+python -m backend.src.segment_tests.vec_fill_test
+"""
+
+import os
+import time
+
+# Must be set before the encoder picks its backend
+os.environ["EMBED_BACKEND"] = "hash"
+
+# pylint: disable=wrong-import-position
+from ..embed_helper import vec_fill
+from ..embed_helper import vec_cache
+
+UID = "user001"
+
+
+class StubDatabase:
+    """
+    The DBConn calls fill_missing_vecs makes, on a plain dict
+    """
+
+    def __init__(self) -> None:
+        self.line_vecs = {}  # line_hash -> bytes, one user
+        self.upserts = 0
+
+    def table_exists(self, table_name: str) -> bool:
+        return table_name == "line_vecs"  # no global_vecs, every text is encoded
+
+    def fetch_line_vec_hashes(self, uid: str, model_id: str) -> set:
+        # pylint: disable=unused-argument
+        return set(self.line_vecs)
+
+    def upsert_line_vecs(self, uid: str, model_id: str, vecs: dict, encoding: str) -> bool:
+        # pylint: disable=unused-argument
+        self.upserts += 1
+        self.line_vecs.update(vecs)
+        return True
+
+
+def check(condition: bool, message: str) -> None:
+    """
+    Print the check, stop at the first failure
+    """
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+
+def test_budget_split() -> None:
+    """
+    Budget 0 defers everything, no budget encodes everything, stored lines are skipped
+    """
+    texts = [f"built feature {idx}" for idx in range(40)]
+    database = StubDatabase()
+    report = vec_fill.fill_missing_vecs(database, UID, texts + texts[:5], budget_s=0)
+    check(
+        report["missing"] == 40 and report["encoded"] == 0 and report["remaining"] == texts,
+        f"budget 0: {len(report['remaining'])} of 40 lines left for the background",
+    )
+    check(database.upserts == 0, "budget 0: nothing written")
+    report = vec_fill.fill_missing_vecs(database, UID, texts[:10], budget_s=None, chunk_size=4)
+    check(
+        report["encoded"] == 10 and not report["remaining"] and database.upserts == 3,
+        f"no budget: 10 lines encoded in {database.upserts} chunks",
+    )
+    report = vec_fill.fill_missing_vecs(database, UID, texts, budget_s=None)
+    check(
+        report["missing"] == 30 and report["encoded"] == 30 and not report["remaining"],
+        f"stored lines skipped: {report['missing']} missing of 40",
+    )
+    check(
+        set(database.line_vecs) == {vec_cache.content_hash(text) for text in texts},
+        "every line has a stored vector",
+    )
+    report = vec_fill.fill_missing_vecs(database, UID, texts, budget_s=0)
+    check(report["missing"] == 0 and not report["remaining"], "nothing missing afterwards")
+
+
+def test_save_budget() -> None:
+    """
+    SAVE_EMBED_BUDGET_MS in milliseconds, 0 sends everything to the background
+    """
+    os.environ["SAVE_EMBED_BUDGET_MS"] = "250"
+    check(vec_fill.save_budget_s() == 0.25, "SAVE_EMBED_BUDGET_MS=250 is 0.25s")
+    os.environ["SAVE_EMBED_BUDGET_MS"] = "0"
+    check(vec_fill.save_budget_s() == 0.0, "SAVE_EMBED_BUDGET_MS=0 is no sync budget")
+
+
+def test_login_debounce() -> None:
+    """
+    One warm-up per user per interval, schedule_fill replaced by a recorder
+    """
+    scheduled = []
+    vec_fill.schedule_fill = lambda uid, texts: scheduled.append((uid, list(texts))) or uid
+    os.environ["LOGIN_VEC_WARMUP"] = "1"
+    os.environ["LOGIN_WARMUP_INTERVAL_S"] = "0.2"
+    resume = {"sections": [{"items": [{"lines": [{"content_str": "built feature"}]}]}]}
+    vec_fill.schedule_login_warm_up(UID, resume)
+    vec_fill.schedule_login_warm_up(UID, resume)
+    vec_fill.schedule_login_warm_up(UID, '{"sections": []}')
+    check(
+        scheduled == [(UID, ["built feature"])],
+        f"repeated logins inside the interval: {len(scheduled)} warm-up scheduled",
+    )
+    vec_fill.schedule_login_warm_up("user002", resume)
+    check(len(scheduled) == 2, "another user is not held back")
+    time.sleep(0.25)
+    vec_fill.schedule_login_warm_up("user003", resume)
+    check(
+        list(vec_fill._last_warm_up) == ["user003"],  # pylint: disable=protected-access
+        "users past the interval evicted from the debounce map",
+    )
+    vec_fill.schedule_login_warm_up(UID, resume)
+    check(len(scheduled) == 4, "login after the interval schedules again")
+    os.environ["LOGIN_VEC_WARMUP"] = "0"
+    vec_fill.schedule_login_warm_up("user004", resume)
+    check(len(scheduled) == 4, "LOGIN_VEC_WARMUP=0 schedules nothing")
+
+
+if __name__ == "__main__":
+    test_budget_split()
+    test_save_budget()
+    test_login_debounce()
+    print("all vec fill checks passed")